@@ -0,0 +1,236 @@
+"""
+Benchmark suite for UNSURE
+
+Times the per-proposition combination rules, every *_multisource
+function, the belief/plausibility queries and the CUE update over a
+sweep of frame sizes, focal-element counts and numbers of sources.
+
+Usage:
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --baseline results.json
+
+Results are written as JSON. With --baseline, every case is compared to
+the same case in an earlier run and slower cases are reported (the exit
+status is 1 when one is slower than --threshold times the baseline).
+
+pcr6_multisource enumerates every tuple of focal elements (focal^sources
+of them), so points above --max-tuples are skipped for it.
+"""
+
+import argparse
+import functools
+import itertools
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import timeit
+
+import numpy as np
+
+from unsure import __version__
+from unsure.boe import BOE
+
+RULES = ["conjunctive_form", "dcr", "yager", "dubois_prade", "pcr5"]
+MULTISOURCE = [
+    "conjunctive_multisource",
+    "disjunctive_multisource",
+    "dcr_multisource",
+    "yager_multisource",
+    "dubois_prade_multisource",
+    "pcr5_multisource",
+    "pcr6_multisource",
+]
+QUERIES = ["belief", "plausibility"]
+# Functions enumerating every tuple of focal elements of the sources
+EXPONENTIAL = ["pcr6_multisource"]
+
+
+def random_boe(rng, singletons, focal):
+    """
+    Returns a BOE with focal random focal elements (theta included)
+    """
+    boe = BOE(singletons)
+    theta = 2 ** len(singletons) - 1
+    keys = rng.sample(range(1, theta), min(focal - 1, theta - 1))
+    for key in keys + [theta]:
+        boe.dsvector = (key, rng.random())
+    return boe
+
+
+def cases(size, focal, sources, seed, max_tuples=None):
+    """
+    Yields (name, callable, setup) for one point of the sweep
+
+    setup: None, or a callable run before each repeat (not timed)
+    """
+    rng = random.Random(seed)
+    singletons = [f"s{i}" for i in range(size)]
+    boes = [random_boe(rng, singletons, focal) for _ in range(sources)]
+    boe1, boe2 = boes[0], boes[1]
+    proposition = singletons[:1]
+
+    for rule in RULES:
+        yield rule, functools.partial(getattr(boe1, rule), boe2, proposition), None
+    for function in MULTISOURCE:
+        if function in EXPONENTIAL and max_tuples and focal**sources > max_tuples:
+            continue
+        yield function, functools.partial(getattr(boe1, function), boes[1:]), None
+    for query in QUERIES:
+        yield query, functools.partial(getattr(boe1, query), proposition), None
+    yield "get_uncertainties", boe1.get_uncertainties, None
+
+    # the updated BOE is built out of the timed calls
+    state = {}
+
+    def setup():
+        state["boe"] = random_boe(random.Random(seed), singletons, focal)
+
+    def update():
+        state["boe"].update(boe2, 0.5)
+
+    def update_stream():
+        state["boe"].update_stream(boes, 0.5, callback=lambda idx, boe: None)
+
+    yield "update", update, setup
+    yield "update_stream", update_stream, setup
+
+
+def measure(function, repeat, min_time, setup=None):
+    """
+    Returns (best, median) seconds per call and the calls per repeat
+
+    setup: callable run (untimed) before each repeat
+    """
+    timer = timeit.Timer(function, setup or "pass")
+    # calibrate so that one repeat lasts about min_time
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time / 10:
+            break
+        number *= 10
+    number = max(1, int(number * min_time / elapsed))
+    times = [elapsed / number for elapsed in timer.repeat(repeat, number)]
+    return min(times), statistics.median(times), number
+
+
+def run(args):
+    """
+    Returns the results of the sweep as a JSON-serializable dict
+    """
+    results = []
+    sweep = itertools.product(args.sizes, args.focal, args.sources)
+    for size, focal, sources in sweep:
+        if sources < 2:
+            continue
+        points = cases(size, focal, sources, args.seed, args.max_tuples)
+        for name, function, setup in points:
+            if args.filter and args.filter not in name:
+                continue
+            best, median, number = measure(function, args.repeat, args.min_time, setup)
+            results.append(
+                {
+                    "name": name,
+                    "singletons": size,
+                    "focal": focal,
+                    "sources": sources,
+                    "best": best,
+                    "median": median,
+                    "number": number,
+                    "repeat": args.repeat,
+                }
+            )
+            if not args.quiet:
+                print(
+                    f"{name:28s} n={size:<3d} focal={focal:<4d} "
+                    f"sources={sources:<3d} {best * 1e6:12.2f} us",
+                    file=sys.stderr,
+                )
+    return {
+        "meta": {
+            "unsure": __version__,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold):
+    """
+    Prints the ratio to the baseline of every common case and returns
+    the cases slower than threshold times the baseline
+    """
+    reference = {
+        (r["name"], r["singletons"], r["focal"], r["sources"]): r["best"]
+        for r in baseline["results"]
+    }
+    regressions = []
+    for result in report["results"]:
+        key = (result["name"], result["singletons"], result["focal"], result["sources"])
+        if key not in reference:
+            continue
+        ratio = result["best"] / reference[key]
+        flag = "  SLOWER" if ratio > threshold else ""
+        print(
+            f"{key[0]:28s} n={key[1]:<3d} focal={key[2]:<4d} "
+            f"sources={key[3]:<3d} x{ratio:6.2f}{flag}"
+        )
+        if ratio > threshold:
+            regressions.append(result)
+    return regressions
+
+
+def _integers(text):
+    return [int(value) for value in text.split(",")]
+
+
+def main(argv=None):
+    """
+    Command line entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=_integers, default=[2, 4, 6, 8])
+    parser.add_argument("--focal", type=_integers, default=[2, 4, 8])
+    parser.add_argument("--sources", type=_integers, default=[2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--min-time", type=float, default=0.05, help="seconds per repeat"
+    )
+    parser.add_argument(
+        "--max-tuples",
+        type=int,
+        default=10**5,
+        help="skip pcr6_multisource above this many focal-element tuples (0: never)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--filter", help="only run cases whose name contains this")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with an earlier JSON file")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+    elif not args.baseline:
+        json.dump(report, sys.stdout, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline:
+            regressions = compare(report, json.load(baseline), args.threshold)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
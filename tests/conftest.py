@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from unsure.boe import BOE
+
+
+def make_random_boes(
+    seed,
+    count,
+    singletons,
+    focal,
+    keys=None,
+    theta=None,
+    sort_keys=False,
+    storage="auto",
+    dtype="float64",
+):
+    """
+    Returns count BOEs over singletons, each with focal random masses
+    on keys drawn from keys (default: every non-empty proposition) and,
+    when given, mass theta on the whole frame
+
+    seed: a seed, or a random.Random to share between calls
+    sort_keys: insert the keys in increasing order, the order of
+    per-row evidence in BOEBatch.update
+    """
+    # pylint: disable=too-many-arguments
+    rng = seed if isinstance(seed, random.Random) else random.Random(seed)
+    if keys is None:
+        keys = range(1, 2 ** len(singletons))
+    boes = []
+    for _ in range(count):
+        boe = BOE(singletons, dtype=dtype, storage=storage)
+        sample = rng.sample(keys, focal)
+        for key in sorted(sample) if sort_keys else sample:
+            boe.dsvector = (key, rng.random())
+        if theta is not None:
+            boe.set_mass_theta(theta)
+        boes.append(boe)
+    return boes
+
+
+@pytest.fixture(name="random_boes")
+def fixture_random_boes():
+    """
+    Factory of random BOEs (see make_random_boes)
+    """
+    return make_random_boes
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from unsure import approximation
+from unsure.boe import BOE
+
+SINGLETONS = ["a", "b", "c", "d"]
+
+
+def _focal_count(boe):
+    return np.count_nonzero(boe.get_vector())
+
+
+def test_summarize(random_boes):
+    boe = random_boes(0, 1, SINGLETONS, 8)[0]
+    approx = approximation.summarize(boe, 3)
+    assert _focal_count(approx) <= 3
+    assert np.isclose(approx.get_vector().sum(), 1)
+    # the summarized masses move to a superset: beliefs can only drop
+    assert np.all(approx.get_vector("belief") <= boe.get_vector("belief") + 1e-12)
+    with pytest.raises(ValueError):
+        approximation.summarize(boe, 0)
+
+
+def test_klx(random_boes):
+    boe = random_boes(1, 1, SINGLETONS, 8)[0]
+    approx = approximation.klx(boe, 2, 5, tolerance=0.3)
+    assert 2 <= _focal_count(approx) <= 5
+    left_out = 1 - sum(
+        mass
+        for key, mass in boe.get_normalized_dsvector().items()
+        if key in approx.dsvector
+    )
+    assert left_out <= 0.3 or _focal_count(approx) == 5
+
+
+def test_bayesian_and_pignistic():
+    boe = BOE(["a", "b"])
+    boe.set_mass(["a"], 0.5)
+    boe.set_mass(["a", "b"], 0.5)
+    assert approximation.bayesian(boe).get_normalized_mass(["a"]) == pytest.approx(
+        2 / 3
+    )
+    assert approximation.pignistic(boe).get_normalized_mass(["a"]) == pytest.approx(
+        0.75
+    )
+
+
+def test_consonant(random_boes):
+    boe = random_boes(2, 1, SINGLETONS, 8)[0]
+    for function in [approximation.outer_consonant, approximation.inner_consonant]:
+        approx = function(boe)
+        focal = sorted(
+            np.flatnonzero(approx.get_vector()), key=lambda k: bin(k).count("1")
+        )
+        assert len(focal) <= len(SINGLETONS)
+        for smaller, larger in zip(focal, focal[1:]):
+            assert (smaller & ~larger) == 0
+    outer = approximation.outer_consonant(boe)
+    assert np.all(outer.get_vector("belief") <= boe.get_vector("belief") + 1e-12)
+
+
+def test_budget_multisource(random_boes):
+    boes = [random_boes(seed, 1, SINGLETONS, 8)[0] for seed in range(3, 8)]
+    fused = boes[0].pcr5_multisource(boes[1:], budget=4)
+    assert _focal_count(fused) <= 4
+    assert np.isclose(fused.get_vector().sum(), 1)
+    assert approximation.approximate(boes[0], 100) is boes[0]
@@ -0,0 +1,55 @@
+import numpy as np
+
+from unsure.batch import BOEBatch
+
+SINGLETONS = ["a", "b", "c", "d"]
+
+
+def test_round_trip(random_boes):
+    boes = random_boes(0, 5, SINGLETONS, 4, sort_keys=True)
+    batch = BOEBatch.from_boes(boes)
+    assert batch.masses.shape == (5, 16)
+    for boe, rebuilt in zip(boes, batch.to_boes()):
+        assert boe.dsvector == rebuilt.dsvector
+
+
+def test_batch_combination_matches_boes(random_boes):
+    boes1 = random_boes(1, 6, SINGLETONS, 4, sort_keys=True)
+    boes2 = random_boes(2, 6, SINGLETONS, 4, sort_keys=True)
+    batch1 = BOEBatch.from_boes(boes1)
+    for rule in ["conjunctive", "disjunctive", "dcr", "yager", "dubois_prade", "pcr5"]:
+        fused = batch1.combine(BOEBatch.from_boes(boes2), rule)
+        single = batch1.combine(boes2[0], rule)
+        for row, (boe1, boe2) in enumerate(zip(boes1, boes2)):
+            expected = boe1.combine(boe2, rule).get_vector()
+            assert np.allclose(fused.get_vector()[row], expected)
+            expected = boe1.combine(boes2[0], rule).get_vector()
+            assert np.allclose(single.get_vector()[row], expected)
+
+
+def test_batch_uncertainty(random_boes):
+    boes = random_boes(3, 6, SINGLETONS, 4, sort_keys=True)
+    intervals = BOEBatch.from_boes(boes).uncertainty(["a", "c"])
+    assert intervals.shape == (6, 2)
+    for row, boe in enumerate(boes):
+        assert np.allclose(intervals[row], boe.uncertainty(["a", "c"]))
+
+
+def test_batch_update_matches_boes(random_boes):
+    boes = random_boes(4, 6, SINGLETONS, 4, sort_keys=True)
+    evidence = random_boes(5, 6, SINGLETONS, 4, sort_keys=True)
+    batch = BOEBatch.from_boes(boes)
+    batch.update(evidence[0], 0.3)
+    batch.update(BOEBatch.from_boes(evidence), 0.6)
+    for row, boe in enumerate(boes):
+        boe.update(evidence[0], 0.3)
+        boe.update(evidence[row], 0.6)
+        expected = transforms_dense(boe)
+        assert np.allclose(batch.masses[row], expected)
+
+
+def transforms_dense(boe):
+    vector = np.zeros(2 ** len(boe.frame))
+    for key, mass in boe.dsvector.items():
+        vector[key] = mass
+    return vector
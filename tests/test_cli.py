@@ -0,0 +1,134 @@
+import io
+import json
+import multiprocessing
+import os
+import random
+
+import click
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from unsure import cli, serialization
+from unsure.boe import BOE
+from unsure.cli import main
+
+SINGLETONS = ["a", "b", "c"]
+
+
+def _evidence(seed, count, entities):
+    rng = random.Random(seed)
+    records = []
+    for _ in range(count):
+        boe = BOE(SINGLETONS)
+        for key in rng.sample(range(1, 7), 2):
+            boe.dsvector = (key, rng.random())
+        boe.set_mass_theta(rng.random())
+        records.append((rng.choice(entities), boe))
+    return records
+
+
+def _jsonl(records):
+    return "".join(
+        json.dumps({"entity": entity, **serialization.to_json(boe)}) + "\n"
+        for entity, boe in records
+    )
+
+
+def _expected(records, rule=None, alpha=None):
+    fused = {}
+    for entity, boe in records:
+        if alpha is not None:
+            if entity not in fused:
+                fused[entity] = BOE(SINGLETONS)
+                fused[entity].set_mass_theta(1.0)
+            fused[entity].update(boe, alpha)
+        elif entity in fused:
+            fused[entity] = fused[entity].combine(boe, rule)
+        else:
+            fused[entity] = boe
+    return fused
+
+
+def _results(output):
+    return {
+        record["entity"]: serialization.from_json(record)
+        for record in map(json.loads, output.splitlines())
+    }
+
+
+@pytest.mark.parametrize("workers", ["0", "2"])
+def test_fuse_jsonl(workers):
+    records = _evidence(0, 40, ["x", "y", "z"])
+    runner = CliRunner()
+    for options, expected in [
+        (["--rule", "pcr5"], _expected(records, rule="pcr5")),
+        (["--alpha", "0.5"], _expected(records, alpha=0.5)),
+    ]:
+        result = runner.invoke(
+            main, ["fuse", "--workers", workers] + options, input=_jsonl(records)
+        )
+        assert result.exit_code == 0, result.output
+        fused = _results(result.output)
+        assert sorted(fused) == ["x", "y", "z"]
+        for entity, boe in expected.items():
+            assert np.allclose(fused[entity].get_vector(), boe.get_vector())
+
+
+def test_fuse_grouped_binary():
+    records = sorted(_evidence(1, 20, ["x", "y"]), key=lambda record: record[0])
+    stream = io.BytesIO()
+    for entity, boe in records:
+        name = entity.encode()
+        stream.write(len(name).to_bytes(4, "little") + name)
+        stream.write(serialization.to_bytes(boe))
+    result = CliRunner().invoke(
+        main,
+        ["fuse", "--grouped", "--workers", "2", "--input-format", "binary"],
+        input=stream.getvalue(),
+    )
+    assert result.exit_code == 0, result.output
+    fused = _results(result.output)
+    for entity, boe in _expected(records, rule="dcr").items():
+        assert np.allclose(fused[entity].get_vector(), boe.get_vector())
+
+
+def test_fuse_bad_input():
+    result = CliRunner().invoke(main, ["fuse", "--workers", "0"], input="{}\n")
+    assert result.exit_code != 0
+    assert "Line 1" in result.output
+
+
+class _FailingOutput(io.StringIO):
+    def write(self, text):
+        raise OSError("No space left on device")
+
+
+def _options():
+    return {
+        "rule": "dcr",
+        "alpha": None,
+        "budget": None,
+        "input_format": "jsonl",
+        "output_format": "jsonl",
+        "uncertainties": False,
+    }
+
+
+def _records(count):
+    for entity, boe in _evidence(2, count, [f"e{i}" for i in range(count)]):
+        yield entity, serialization.to_json(boe)
+
+
+def test_fuse_pool_stops_when_output_fails():
+    with pytest.raises(click.ClickException, match="No space left"):
+        cli._run_pool(_records(5000), _FailingOutput(), _options(), True, 2)
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork", reason="patches the workers"
+)
+def test_fuse_pool_stops_when_a_worker_dies(monkeypatch):
+    monkeypatch.setattr(cli, "_parse", lambda record, input_format: os._exit(3))
+    with pytest.raises(click.ClickException, match="exited with code 3"):
+        cli._run_pool(_records(5000), io.StringIO(), _options(), False, 2)
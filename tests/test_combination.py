@@ -0,0 +1,98 @@
+from unsure.boe import BOE
+
+THRESHOLD = 1e-9
+
+
+def _example_boes():
+    """
+    Two overlapping BOEs on a 3-singleton frame
+    """
+    boe1 = BOE(["a", "b", "c"])
+    boe1.set_mass(["a"], 0.5)
+    boe1.set_mass(["b", "c"], 0.2)
+    boe1.set_mass(["a", "b", "c"], 0.3)
+
+    boe2 = BOE(["a", "b", "c"])
+    boe2.set_mass(["b"], 0.4)
+    boe2.set_mass(["a", "c"], 0.4)
+    boe2.set_mass(["c"], 0.2)
+    return boe1, boe2
+
+
+def test_combine_matches_per_proposition_api():
+    boe1, boe2 = _example_boes()
+    per_proposition = {
+        "conjunctive": boe1.conjunctive_form,
+        "disjunctive": boe1.disjunctive_form,
+        "dcr": boe1.dcr,
+        "yager": boe1.yager,
+        "dubois_prade": boe1.dubois_prade,
+    }
+    for rule, method in per_proposition.items():
+        fused = boe1.combine(boe2, rule)
+        for proposition in BOE._powerset(boe1.frame):
+            proposition = list(proposition)
+            if not proposition and rule != "conjunctive":
+                continue
+            expected = method(boe2, proposition)
+            assert abs(fused.get_mass(proposition) - expected) < THRESHOLD
+
+
+def test_dcr_multisource_total_conflict():
+    boe1 = BOE(["a", "b"])
+    boe1.set_mass(["a"], 1.0)
+
+    boe2 = BOE(["a", "b"])
+    boe2.set_mass(["b"], 1.0)
+
+    assert boe1.dcr_multisource([boe2]) is None
+
+
+def test_dcr_multisource():
+    boe1, boe2 = _example_boes()
+    boe3 = BOE(["a", "b", "c"])
+    boe3.set_mass(["a", "b"], 0.7)
+    boe3.set_mass(["c"], 0.3)
+
+    fused = boe1.dcr_multisource([boe2, boe3])
+    assert abs(fused.normalizing_constant - 1) < THRESHOLD
+
+    boe12 = BOE(["a", "b", "c"])
+    for proposition in BOE._powerset(boe1.frame):
+        if proposition:
+            boe12.set_mass(list(proposition), boe1.dcr(boe2, list(proposition)))
+    for proposition in BOE._powerset(boe1.frame):
+        if proposition:
+            expected = boe12.dcr(boe3, list(proposition))
+            assert abs(fused.get_mass(list(proposition)) - expected) < THRESHOLD
+
+
+def test_pcr5_combine_matches_per_proposition_api():
+    boe1, boe2 = _example_boes()
+    fused = boe1.combine(boe2, "pcr5")
+    for proposition in BOE._powerset(boe1.frame):
+        if proposition:
+            expected = boe1.pcr5(boe2, list(proposition))
+            assert abs(fused.get_mass(list(proposition)) - expected) < THRESHOLD
+    assert abs(fused.normalizing_constant - 1) < THRESHOLD
+
+
+def test_pcr6_two_sources_is_pcr5():
+    boe1, boe2 = _example_boes()
+    pcr5 = boe1.combine(boe2, "pcr5")
+    pcr6 = boe1.pcr6_multisource([boe2])
+    for key, mass in pcr5.dsvector.items():
+        assert abs(pcr6.dsvector[key] - mass) < THRESHOLD
+
+
+def test_pcr6_is_order_independent():
+    boe1, boe2 = _example_boes()
+    boe3 = BOE(["a", "b", "c"])
+    boe3.set_mass(["a"], 0.6)
+    boe3.set_mass(["b", "c"], 0.4)
+
+    fused123 = boe1.pcr6_multisource([boe2, boe3])
+    fused312 = boe3.pcr6_multisource([boe1, boe2])
+    assert abs(fused123.normalizing_constant - 1) < THRESHOLD
+    for key, mass in fused123.dsvector.items():
+        assert abs(fused312.dsvector[key] - mass) < THRESHOLD
@@ -0,0 +1,94 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from unsure.boe import BOE
+from unsure.compact import CompactBOE
+
+SINGLETONS = ["a", "b", "c"]
+RULES = ["conjunctive", "disjunctive", "dcr", "yager", "dubois_prade", "pcr5"]
+
+
+def test_compact_is_slotted():
+    compact = CompactBOE(SINGLETONS)
+    compact.set_mass(["a"], 0.5)
+    compact.set_mass_theta(0.5)
+    assert not hasattr(compact, "__dict__")
+    assert compact.frame is CompactBOE(["A", "B", "C"]).frame
+    assert pickle.loads(pickle.dumps(compact)).dsvector == compact.dsvector
+
+
+def test_compact_queries_match_boe(random_boes):
+    boe = random_boes(0, 1, SINGLETONS, 3)[0]
+    compact = CompactBOE.from_boe(boe)
+    assert compact.dsvector == dict(boe.dsvector)
+    assert compact.get_uncertainties() == pytest.approx(boe.get_uncertainties())
+    assert np.allclose(compact.get_vector("commonality"), boe.get_vector("commonality"))
+    assert compact.to_boe().dsvector == boe.dsvector
+
+
+def test_compact_combination_matches_boe(random_boes):
+    boe1, boe2, boe3 = random_boes(1, 3, SINGLETONS, 3)
+    compact1, compact2 = CompactBOE.from_boe(boe1), CompactBOE.from_boe(boe2)
+    methods = ["conjunctive_form", "disjunctive_form", "dcr", "yager"]
+    methods += ["dubois_prade", "pcr5"]
+    for proposition in boe1.frame.powerset()[1:]:
+        for method in methods:
+            expected = getattr(boe1, method)(boe2, proposition)
+            actual = getattr(compact1, method)(compact2, proposition)
+            assert actual == pytest.approx(expected)
+    assert compact1.conflict(compact2) == pytest.approx(boe1.conflict(boe2))
+    for rule in RULES:
+        fused = compact1.combine_multisource([boe2, boe3], rule)
+        assert np.allclose(
+            fused.get_vector(),
+            boe1.combine_multisource([boe2, boe3], rule).get_vector(),
+        )
+    assert np.allclose(
+        compact1.pcr6_multisource([compact2]).get_vector(),
+        boe1.pcr6_multisource([boe2]).get_vector(),
+    )
+
+
+def test_compact_update(random_boes):
+    boe, evidence = random_boes(2, 2, SINGLETONS, 3)
+    compact = CompactBOE.from_boe(boe)
+    compact.update(evidence, 0.4)
+    boe.update(evidence, 0.4)
+    assert np.allclose(compact.get_vector(), boe.get_vector())
+
+
+def test_compact_combination_on_compatible_frames(random_boes):
+    boe1, boe2 = random_boes(4, 2, SINGLETONS, 3)
+    reordered = CompactBOE.from_boe(
+        boe2.to_frame(boe2.frame.reordering(["c", "a", "b"]))
+    )
+    fused = CompactBOE.from_boe(boe1).combine(reordered, "pcr5")
+    assert fused.frame is boe1.frame
+    assert fused.dsvector == pytest.approx(dict(boe1.combine(boe2, "pcr5").dsvector))
+    small = CompactBOE(["a", "b"], [1, 3], [0.5, 0.5])
+    assert CompactBOE.from_boe(boe1).pcr6_multisource([small]).frame is boe1.frame
+
+
+def test_mixed_boe_and_compact_operands(random_boes):
+    boe1, boe2, boe3 = random_boes(5, 3, SINGLETONS, 3)
+    compact2 = CompactBOE.from_boe(boe2)
+
+    expected = BOE.from_dsvector(SINGLETONS, dict(boe1.dsvector))
+    expected.update(boe2, 0.4)
+    updated = BOE.from_dsvector(SINGLETONS, dict(boe1.dsvector))
+    updated.update(compact2, 0.4)
+    assert np.allclose(updated.get_vector(), expected.get_vector())
+    compact1 = CompactBOE.from_boe(boe1)
+    compact1.update(compact2, 0.4)
+    assert np.allclose(compact1.get_vector(), expected.get_vector())
+
+    for rule in RULES:
+        expected = boe1.combine(boe2, rule).dsvector
+        assert boe1.combine(compact2, rule).dsvector == pytest.approx(dict(expected))
+    assert boe1.pcr6_multisource([compact2, boe3]).dsvector == pytest.approx(
+        dict(boe1.pcr6_multisource([boe2, boe3]).dsvector)
+    )
+    assert boe1.pcr5(compact2, ["a"]) == pytest.approx(boe1.pcr5(boe2, ["a"]))
+    assert boe1.conflict(compact2) == pytest.approx(boe1.conflict(boe2))
@@ -0,0 +1,80 @@
+import random
+
+import numpy as np
+
+from unsure.batch import BOEBatch
+from unsure.boe import BOE
+from unsure.cue import conditioned_masses
+
+SINGLETONS = ["a", "b", "c", "d"]
+
+
+def _reference_update(boe, new_frame, alpha):
+    """
+    The proposition-by-proposition CUE update
+    """
+    for prop_idx_b in new_frame.get_normalized_dsvector():
+        total = 0
+        prop_b = new_frame.get_prop_from_dsvector(prop_idx_b)
+        for prop_idx_a, mass_a in new_frame.get_normalized_dsvector().items():
+            prop_a = new_frame.get_prop_from_dsvector(prop_idx_a)
+            if set(prop_a).issubset(set(prop_b)):
+                total += new_frame.conditional_mass(prop_b, prop_a) * mass_a
+        current_mass = boe.get_normalized_mass(prop_b)
+        term1 = 0.0 if current_mass == 0 else alpha * current_mass
+        boe.set_mass(prop_b, term1 + (1 - alpha) * total)
+
+
+def test_conditioned_masses():
+    keys = np.array([1, 2, 3])
+    evidence = np.array([[0.5, 0.0, 0.5]])
+    plausibility = np.array([[1.0, 0.5, 1.0]])
+    conditioned = conditioned_masses(keys, evidence, plausibility)
+    # b = {a}: 0.5 * 0.5 / (0.5 + 1); b = {a, b}: adds a = {a, b}
+    expected = [0.5 * 0.5 / 1.5, 0.0, 0.5 * 0.5 / 1.5 + 0.5 * 0.5 / 1.5]
+    assert np.allclose(conditioned, [expected])
+
+
+def test_update_matches_reference(random_boes):
+    rng = random.Random(0)
+    for storage in ["sparse", "dense"]:
+        for _ in range(5):
+            boe = random_boes(rng, 1, SINGLETONS, 5, storage="sparse")[0]
+            evidence = random_boes(rng, 1, SINGLETONS, 5, storage=storage)[0]
+            evidence.dsvector[rng.randrange(1, 16)]  # explicit zero key
+            expected = BOE.from_dsvector(SINGLETONS, dict(boe.dsvector))
+
+            boe.update(evidence, 0.3)
+            _reference_update(expected, evidence, 0.3)
+            assert np.allclose(boe.get_vector(), expected.get_vector())
+
+
+def test_batch_update_matches_boe_update(random_boes):
+    rng = random.Random(1)
+    boes = random_boes(rng, 4, SINGLETONS, 5, storage="sparse")
+    evidence = random_boes(rng, 1, SINGLETONS, 5, storage="sparse")[0]
+    batch = BOEBatch.from_boes(boes)
+    batch.update(evidence, 0.6)
+    for row, boe in enumerate(boes):
+        boe.update(evidence, 0.6)
+        assert np.allclose(batch.get_normalized_masses()[row], boe.get_vector())
+
+
+def test_update_follows_evidence_insertion_order():
+    prior = {1: 0.2, 3: 0.3, 7: 0.5}
+    evidence = BOE.from_dsvector(SINGLETONS[:3], {7: 0.3, 1: 0.7})
+    boe = BOE.from_dsvector(SINGLETONS[:3], prior)
+    boe.update(evidence, 0.5)
+    assert abs(boe.get_normalized_mass(["a"]) - 0.2807) < 1e-4
+    assert abs(boe.get_normalized_mass(["a", "b"]) - 0.3243) < 1e-4
+
+    batch = BOEBatch.from_boes([BOE.from_dsvector(SINGLETONS[:3], prior)])
+    batch.update(evidence, 0.5)
+    assert np.allclose(batch.get_normalized_masses()[0], boe.get_vector())
+
+    # per-row evidence has no insertion order: keys go in increasing order
+    batch = BOEBatch.from_boes([BOE.from_dsvector(SINGLETONS[:3], prior)])
+    batch.update(BOEBatch.from_boes([evidence]), 0.5)
+    expected = BOE.from_dsvector(SINGLETONS[:3], prior)
+    expected.update(BOE.from_dsvector(SINGLETONS[:3], {1: 0.7, 7: 0.3}), 0.5)
+    assert np.allclose(batch.get_normalized_masses()[0], expected.get_vector())
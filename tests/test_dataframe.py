@@ -0,0 +1,90 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import unsure.dataframe  # noqa: F401 pylint: disable=unused-import
+from unsure.boe import BOE
+
+SINGLETONS = ["a", "b", "c"]
+
+
+def _evidence(seed, entities=4):
+    rng = random.Random(seed)
+    rows = []
+    for entity in range(entities):
+        for source in range(rng.randint(1, 4)):
+            for key in rng.sample(range(1, 8), 2) + [7]:
+                proposition = ",".join(
+                    s for s, bit in zip(SINGLETONS, (1, 2, 4)) if key & bit
+                )
+                rows.append((f"e{entity}", source, proposition, rng.random()))
+    return pd.DataFrame(rows, columns=["entity", "source", "proposition", "mass"])
+
+
+def _boes(df, entity):
+    boes = []
+    for _, group in df[df.entity == entity].groupby("source", sort=False):
+        boe = BOE(SINGLETONS)
+        for proposition, mass in zip(group.proposition, group.mass):
+            key = boe.frame.key(proposition.split(","))
+            boe.dsvector = (key, boe.dsvector.get(key, 0) + mass)
+        boes.append(boe)
+    return boes
+
+
+def test_series_keys():
+    series = pd.Series(["a", "a,c", ["b", "c"], "A, B, C"])
+    assert series.unsure.keys(SINGLETONS).tolist() == [1, 5, 6, 7]
+
+
+@pytest.mark.parametrize(
+    "rule", ["conjunctive", "dcr", "yager", "dubois_prade", "pcr5"]
+)
+def test_fuse_matches_boe(rule):
+    df = _evidence(0)
+    fused = df.unsure.fuse(SINGLETONS, rule=rule)
+    assert list(fused.index) == list(df.entity.unique())
+    for entity in fused.index:
+        boes = _boes(df, entity)
+        expected = boes[0].combine_multisource(boes[1:], rule)
+        assert np.allclose(fused.loc[entity].to_numpy(), expected.get_vector())
+
+
+def test_fuse_total_conflict_and_rules():
+    df = pd.DataFrame(
+        {
+            "entity": ["x", "x"],
+            "source": [0, 1],
+            "proposition": ["a", "b"],
+            "mass": [1.0, 1.0],
+        }
+    )
+    assert df.unsure.fuse(SINGLETONS, rule="dcr").isna().all(axis=None)
+    with pytest.raises(ValueError):
+        df.unsure.fuse(SINGLETONS, rule="disjunctive")
+
+
+def test_summarize_matches_boe():
+    df = _evidence(1).rename(columns={"entity": "track", "mass": "weight"})
+    summary = df.unsure.summarize(
+        SINGLETONS,
+        rule="pcr5",
+        propositions=[["a"], "b,c"],
+        by="track",
+        mass="weight",
+    )
+    assert summary.index.names == ["track", "proposition"]
+    for track in df.track.unique():
+        boes = _boes(df.rename(columns={"track": "entity", "weight": "mass"}), track)
+        expected = boes[0].pcr5_multisource(boes[1:])
+        for proposition, label in [(["a"], "a"), (["b", "c"], "b,c")]:
+            row = summary.loc[(track, label)]
+            assert row.belief == pytest.approx(expected.belief(proposition))
+            assert row.plausibility == pytest.approx(expected.plausibility(proposition))
+        masses = expected.get_normalized_dsvector()
+        betp = sum(
+            mass / bin(key).count("1") for key, mass in masses.items() if key & 1
+        )
+        assert summary.loc[(track, "a")].pignistic == pytest.approx(betp)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from unsure import decision
+from unsure.batch import BOEBatch
+from unsure.boe import BOE
+from unsure.compact import CompactBOE
+
+SINGLETONS = ["a", "b", "c", "d"]
+
+
+def _betp(boe):
+    masses = boe.get_normalized_dsvector()
+    conflict = masses.get(0, 0)
+    return [
+        sum(mass / bin(key).count("1") for key, mass in masses.items() if key & bit)
+        / (1 - conflict)
+        for bit in boe.frame.power
+    ]
+
+
+def test_transforms_match_sparse_queries(random_boes):
+    for boe in random_boes(0, 5, SINGLETONS, 4, keys=range(16)):
+        assert decision.pignistic(boe) == pytest.approx(_betp(boe))
+        assert decision.pignistic(CompactBOE.from_boe(boe)) == pytest.approx(_betp(boe))
+        beliefs, plausibilities = decision.singleton_intervals(boe)
+        for index, singleton in enumerate(SINGLETONS):
+            belief, plausibility = boe.uncertainty([singleton])
+            assert beliefs[index] == pytest.approx(belief)
+            assert plausibilities[index] == pytest.approx(plausibility)
+        transform = decision.plausibility_transform(boe)
+        assert transform == pytest.approx(plausibilities / plausibilities.sum())
+
+
+def test_batched_transforms(random_boes):
+    boes = random_boes(1, 6, SINGLETONS, 4, keys=range(16))
+    batch = BOEBatch.from_boes(boes)
+    expected = np.array([decision.pignistic(boe) for boe in boes])
+    assert np.allclose(decision.pignistic(batch), expected)
+    assert np.allclose(decision.pignistic(boes), expected)
+    assert np.allclose(decision.pignistic(batch.masses), expected)
+    for criterion in decision.CRITERIA:
+        assert decision.scores(batch, criterion).shape == (6, len(SINGLETONS))
+
+
+def test_decisions(random_boes):
+    boe = BOE(["a", "b", "c"])
+    boe.set_mass(["a"], 0.5)
+    boe.set_mass(["b", "c"], 0.3)
+    boe.set_mass(["c"], 0.2)
+    assert decision.argmax(boe) == 0
+    assert decision.top_k(boe, 2).tolist() == [0, 2]
+    assert decision.argmax(boe, "upper") == 0
+    # Pl({b}) = 0.3 < Bel({a}) = 0.5 <= Pl({c})
+    assert decision.interval_dominance(boe).tolist() == [True, False, True]
+
+    boes = random_boes(2, 8, SINGLETONS, 4, keys=range(16))
+    best = decision.top_k(boes, 3)
+    assert best.shape == (8, 3)
+    assert (best[:, 0] == decision.argmax(boes)).all()
+    mask = decision.interval_dominance(boes)
+    assert mask[np.arange(8), decision.argmax(boes, "belief")].all()
+    with pytest.raises(ValueError):
+        decision.scores(boe, "unknown")
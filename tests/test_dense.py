@@ -0,0 +1,61 @@
+import numpy as np
+
+THRESHOLD = 1e-9
+SINGLETONS = [f"s{i}" for i in range(9)]
+
+
+def test_automatic_switching(random_boes):
+    boe = random_boes(0, 1, SINGLETONS, 64)[0]
+    assert boe.is_dense
+    assert len(boe.dsvector) == 64
+
+    for key in list(boe.dsvector)[:60]:
+        boe.dsvector = (key, 0)
+    assert not boe.is_dense
+    assert len([mass for mass in boe.dsvector.values() if mass]) == 4
+
+    assert not random_boes(0, 1, SINGLETONS, 10)[0].is_dense
+    assert not random_boes(0, 1, SINGLETONS, 64, storage="sparse")[0].is_dense
+
+
+def test_dense_combination_matches_sparse(random_boes):
+    for rule in ["conjunctive", "disjunctive", "dcr", "yager", "dubois_prade", "pcr5"]:
+        fused_dense = random_boes(1, 1, SINGLETONS, 40)[0].combine(
+            random_boes(2, 1, SINGLETONS, 50)[0], rule
+        )
+        fused_sparse = random_boes(1, 1, SINGLETONS, 40, storage="sparse")[0].combine(
+            random_boes(2, 1, SINGLETONS, 50, storage="sparse")[0], rule
+        )
+        assert fused_dense.is_dense
+        assert np.allclose(fused_dense.get_vector(), fused_sparse.get_vector())
+
+
+def test_dense_queries_match_sparse(random_boes):
+    boe_dense = random_boes(3, 1, SINGLETONS, 80)[0]
+    boe_sparse = random_boes(3, 1, SINGLETONS, 80, storage="sparse")[0]
+    other = random_boes(4, 1, SINGLETONS, 80)[0]
+    assert boe_dense.is_dense
+    for proposition in [["s0"], ["s1", "s4"], SINGLETONS[:5], SINGLETONS]:
+        assert (
+            abs(boe_dense.belief(proposition) - boe_sparse.belief(proposition))
+            < THRESHOLD
+        )
+        assert (
+            abs(
+                boe_dense.plausibility(proposition)
+                - boe_sparse.plausibility(proposition)
+            )
+            < THRESHOLD
+        )
+        assert (
+            abs(boe_dense.dcr(other, proposition) - boe_sparse.dcr(other, proposition))
+            < THRESHOLD
+        )
+
+
+def test_float32_mode(random_boes):
+    boe = random_boes(5, 1, SINGLETONS, 64, dtype="float32")[0]
+    assert boe.dsvector.vector.dtype == np.float32
+    fused = boe.combine(random_boes(6, 1, SINGLETONS, 64, dtype="float32")[0], "dcr")
+    assert fused.dsvector.vector.dtype == np.float32
+    assert abs(fused.normalizing_constant - 1) < 1e-5
@@ -0,0 +1,97 @@
+import math
+
+import numpy as np
+import pytest
+
+from unsure import decision, distance
+from unsure.batch import BOEBatch
+from unsure.boe import BOE
+
+SINGLETONS = ["a", "b", "c"]
+
+
+def _jousselme(boe1, boe2):
+    masses1 = boe1.get_normalized_dsvector()
+    masses2 = boe2.get_normalized_dsvector()
+    keys = range(2 ** len(SINGLETONS))
+    difference = [masses1.get(key, 0) - masses2.get(key, 0) for key in keys]
+    total = 0
+    for key1 in keys:
+        for key2 in keys:
+            union = bin(key1 | key2).count("1")
+            jaccard = bin(key1 & key2).count("1") / union if union else 1
+            total += difference[key1] * jaccard * difference[key2]
+    return math.sqrt(max(total / 2, 0))
+
+
+def test_jousselme(random_boes):
+    boe1, boe2 = random_boes(0, 2, SINGLETONS, 3)
+    assert distance.jousselme(boe1, boe2) == pytest.approx(_jousselme(boe1, boe2))
+    assert distance.jousselme(boe1, boe1) == pytest.approx(0)
+
+    certain_a, certain_b = BOE(SINGLETONS), BOE(SINGLETONS)
+    certain_a.set_mass(["a"], 1)
+    certain_b.set_mass(["b"], 1)
+    assert distance.jousselme(certain_a, certain_b) == pytest.approx(1)
+
+
+def test_conflict_and_pignistic(random_boes):
+    boe1, boe2 = random_boes(1, 2, SINGLETONS, 3)
+    assert distance.conflict(boe1, boe2) == pytest.approx(boe1.conflict(boe2))
+    betp = decision.pignistic([boe1, boe2])
+    assert distance.pignistic(boe1, boe2) == pytest.approx(
+        0.5 * np.abs(betp[0] - betp[1]).sum()
+    )
+
+
+@pytest.mark.parametrize("metric", ["jousselme", "conflict", "pignistic"])
+def test_distance_matrix(metric, random_boes):
+    boes = random_boes(2, 6, SINGLETONS, 2)
+    matrix = distance.distance_matrix(boes, metric)
+    assert matrix.shape == (6, 6)
+    assert np.allclose(matrix, matrix.T)
+    # The sparse path (union of focal elements) matches the cached
+    # power-set matrices
+    batch = BOEBatch.from_boes(boes)
+    assert np.allclose(matrix, distance.distance_matrix(batch, metric))
+    assert np.allclose(matrix, distance.distance_matrix(batch.masses, metric))
+    for i, j in [(0, 1), (2, 5)]:
+        assert matrix[i, j] == pytest.approx(
+            distance.distance(boes[i], boes[j], metric)
+        )
+
+
+def test_cached_matrices_and_credibility(random_boes):
+    assert distance.jaccard_matrix(3) is distance.jaccard_matrix(3)
+    assert not distance.jaccard_matrix(3).flags.writeable
+    assert distance.jaccard_matrix(3)[0b011, 0b110] == pytest.approx(1 / 3)
+
+    boes = random_boes(3, 4, SINGLETONS, 3)
+    outlier = BOE(SINGLETONS)
+    outlier.set_mass(["c"], 1)
+    weights = distance.credibility(boes + [outlier])
+    assert weights.sum() == pytest.approx(1)
+    assert weights.argmin() == 4
+
+    with pytest.raises(ValueError):
+        distance.distance_matrix(boes, "unknown")
+    with pytest.raises(ValueError):
+        distance.distance_matrix([boes[0], BOE(["x", "y"])])
+
+
+def test_batches_on_large_frames_use_focal_columns():
+    singletons = [f"s{i}" for i in range(12)]
+    boes = []
+    for key in [1, 6, 1000]:
+        boe = BOE(singletons)
+        boe.dsvector = (key, 1.0)
+        boes.append(boe)
+    batch = BOEBatch.from_boes(boes)
+    keys, masses, size = distance._stack(batch)
+    assert keys.tolist() == [1, 6, 1000] and masses.shape == (3, 3) and size == 12
+    cached = distance.jaccard_matrix.cache_info().currsize
+    for metric in distance.METRICS:
+        expected = distance.distance_matrix(boes, metric)
+        assert np.allclose(distance.distance_matrix(batch, metric), expected)
+        assert np.allclose(distance.distance_matrix(batch.masses, metric), expected)
+    assert distance.jaccard_matrix.cache_info().currsize == cached
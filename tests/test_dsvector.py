@@ -0,0 +1,50 @@
+import copy
+import pickle
+
+from unsure.boe import BOE
+from unsure.dsvector import SparseDSVector
+
+THRESHOLD = 1e-12
+
+
+def test_total_is_maintained():
+    dsvector = SparseDSVector(BOE._default_mass)
+    dsvector[1] = 0.5
+    dsvector[2] = 0.25
+    dsvector[1] = 0.125
+    dsvector.update({3: 0.5})
+    assert abs(dsvector.total() - 0.875) < THRESHOLD
+    del dsvector[3]
+    assert abs(dsvector.total() - 0.375) < THRESHOLD
+    assert dsvector.pop(2) == 0.25
+    assert abs(dsvector.total() - 0.125) < THRESHOLD
+
+
+def test_normalized_view_is_cached_until_write():
+    boe = BOE(["a", "b"])
+    boe.set_mass(["a"], 2)
+    boe.set_mass(["b"], 6)
+    normalized = boe.get_normalized_dsvector()
+    assert normalized is not None
+    assert boe.get_normalized_dsvector() == {1: 0.25, 2: 0.75}
+    version = boe.dsvector.version
+
+    boe.get_mass(["a", "b"])
+    assert boe.dsvector.version == version
+    assert boe.get_normalized_dsvector() == {1: 0.25, 2: 0.75, 3: 0.0}
+
+    boe.set_mass(["a", "b"], 8)
+    assert boe.dsvector.version == version + 1
+    assert boe.get_normalized_dsvector() == {1: 0.125, 2: 0.375, 3: 0.5}
+    assert normalized == {1: 0.25, 2: 0.75}
+
+
+def test_copy_and_pickle_keep_total():
+    boe = BOE(["a", "b"])
+    boe.set_mass(["a"], 0.5)
+    boe.set_mass(["b"], 0.25)
+    for dsvector in [copy.copy(boe.dsvector), pickle.loads(pickle.dumps(boe.dsvector))]:
+        assert dsvector == boe.dsvector
+        assert abs(dsvector.total() - 0.75) < THRESHOLD
+        dsvector[1] = 1.0
+        assert abs(dsvector.total() - 1.25) < THRESHOLD
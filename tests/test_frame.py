@@ -0,0 +1,119 @@
+import pickle
+
+import pytest
+
+from unsure.boe import BOE
+from unsure.frame import Frame
+
+
+def test_frames_are_interned():
+    frame = Frame(["A", "b", "c"])
+    assert Frame(["a", "B", "c"]) is frame
+    assert Frame(frame) is frame
+    assert BOE(["a", "b", "c"]).frame is BOE(["A", "B", "C"]).frame
+    assert Frame(["b", "a", "c"]) is not frame
+    assert pickle.loads(pickle.dumps(frame)) is frame
+
+
+def test_frame_behaves_like_a_list():
+    frame = Frame(["a", "b", "c"])
+    assert frame == ["a", "b", "c"]
+    assert len(frame) == 3
+    assert frame[1] == "b"
+    assert frame.index("c") == 2
+    assert list(frame) == ["a", "b", "c"]
+    assert "b" in frame
+    assert frame != Frame(["a", "b"])
+
+
+def test_keys_and_propositions():
+    frame = Frame(["a", "b", "c"])
+    assert frame.key(["A", "c"]) == 5
+    assert frame.key([]) == 0
+    assert frame.theta == 7
+    assert frame.proposition(6) == ["b", "c"]
+    assert frame.powerset()[3] == ["a", "b"]
+    assert list(frame.cardinalities) == [0, 1, 1, 2, 1, 2, 2, 3]
+
+
+def test_unknown_singleton():
+    with pytest.raises(ValueError):
+        Frame(["a", "b"]).key(["z"])
+    with pytest.raises(ValueError):
+        Frame(["a", "b"]).index("z")
+
+
+def _boe(singletons, masses):
+    boe = BOE(singletons)
+    for proposition, mass in masses:
+        boe.set_mass(proposition, mass)
+    return boe
+
+
+def test_frame_maps():
+    small, large = Frame(["a", "b"]), Frame(["b", "c", "a"])
+    assert small.common(large) is large
+    assert large.common(small) is large
+    assert small.compatible(large)
+    assert not small.compatible(Frame(["a", "z"]))
+
+    extension = small.extension(large)
+    assert extension is small.extension(large)
+    # {a} -> {a, c}, {a, b} -> theta, the empty set stays empty
+    assert extension.key(1) == large.key(["a", "c"])
+    assert list(extension.keys([0, 1, 3])) == [0, 6, 7]
+    assert list(Frame(["a", "c", "b"]).reordering(large).keys([1, 2, 4])) == [4, 2, 1]
+    with pytest.raises(ValueError):
+        large.extension(small)
+
+    coarse, fine = Frame(["x", "y"]), Frame(["a", "b", "c"])
+    mapping = {"x": ["a", "b"], "y": ["c"]}
+    assert list(coarse.refinement(fine, mapping).keys([1, 2, 3])) == [3, 4, 7]
+    # outer reduction: {b} -> {x}, {b, c} -> {x, y}
+    assert list(fine.coarsening(coarse, mapping).keys([2, 6])) == [1, 3]
+    with pytest.raises(ValueError):
+        coarse.refinement(fine, {"x": ["a"], "y": ["c"]})
+    with pytest.raises(ValueError):
+        coarse.refinement(fine, {"x": ["a", "b"], "y": ["b", "c"]})
+
+
+def test_to_frame():
+    boe = _boe(["x", "y"], [(["x"], 0.6), (["x", "y"], 0.4)])
+    refined = boe.to_frame(
+        boe.frame.refinement(["a", "b", "c"], {"x": ["a", "b"], "y": ["c"]})
+    )
+    assert refined.get_normalized_mass(["a", "b"]) == pytest.approx(0.6)
+    assert refined.get_normalized_mass(["a", "b", "c"]) == pytest.approx(0.4)
+    coarsened = refined.to_frame(
+        refined.frame.coarsening(["x", "y"], {"x": ["a", "b"], "y": ["c"]})
+    )
+    assert coarsened.dsvector == boe.dsvector
+
+    dense = BOE.from_vector(["a", "b"], [0.1, 0.2, 0.3, 0.4], storage="dense")
+    extended = dense.to_frame(["a", "b", "c"])
+    assert extended.get_normalized_mass([]) == pytest.approx(0.1)
+    assert extended.get_normalized_mass(["a", "c"]) == pytest.approx(0.2)
+    assert extended.get_normalized_mass(["a", "b", "c"]) == pytest.approx(0.4)
+    assert dense.to_frame(dense.frame) is dense
+
+
+def test_combination_on_compatible_frames():
+    boe1 = _boe(["a", "b", "c"], [(["a"], 0.5), (["a", "b"], 0.3), (["c"], 0.2)])
+    reordered = _boe(["c", "b", "a"], [(["a"], 0.4), (["b", "c"], 0.6)])
+    same = _boe(["a", "b", "c"], [(["a"], 0.4), (["b", "c"], 0.6)])
+    for rule in ["conjunctive", "dcr", "yager", "dubois_prade", "pcr5"]:
+        fused = boe1.combine(reordered, rule)
+        assert fused.frame is boe1.frame
+        assert fused.dsvector == pytest.approx(boe1.combine(same, rule).dsvector)
+    assert boe1.pcr5(reordered, ["a"]) == pytest.approx(boe1.pcr5(same, ["a"]))
+    assert boe1.conflict(reordered) == pytest.approx(boe1.conflict(same))
+
+    # a sensor on a smaller frame is vacuously extended
+    small = _boe(["a", "b"], [(["a"], 0.7), (["a", "b"], 0.3)])
+    extended = _boe(["a", "b", "c"], [(["a", "c"], 0.7), (["a", "b", "c"], 0.3)])
+    assert small.combine(boe1).frame is boe1.frame
+    assert small.dcr(boe1, ["a"]) == pytest.approx(extended.dcr(boe1, ["a"]))
+    assert boe1.pcr6_multisource([small, reordered]).dsvector == pytest.approx(
+        boe1.pcr6_multisource([extended, same]).dsvector
+    )
+    assert boe1.combine(BOE(["a", "z"])) is None
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from unsure.boe import BOE
+from unsure.fusion import CommonalityFusion, DecayFusion, WindowedFusion
+
+SINGLETONS = ["a", "b", "c", "d"]
+
+
+def test_commonality_fusion_matches_pairwise(random_boes):
+    boes = random_boes(0, 8, SINGLETONS, 3, theta=0.5)
+    for rule in ["conjunctive", "dcr", "disjunctive"]:
+        expected = boes[0].combine_multisource(boes[1:], rule).get_vector()
+        for log in [False, True]:
+            fusion = CommonalityFusion(SINGLETONS, rule, log=log)
+            for boe in boes:
+                fusion.add(boe)
+            assert fusion.count == 8
+            assert np.allclose(fusion.get_vector(), expected)
+
+        fused = boes[0].combine_multisource(boes[1:], rule, domain="commonality")
+        assert np.allclose(fused.get_vector(), expected)
+
+
+def test_log_commonality_survives_many_sources(random_boes):
+    boes = random_boes(1, 4, SINGLETONS, 3, theta=0.5) * 200
+    fusion = CommonalityFusion(SINGLETONS, "dcr", log=True)
+    fusion.add_many(boes)
+    fused = fusion.to_boe()
+    assert abs(fused.normalizing_constant - 1) < 1e-9
+
+
+def test_total_conflict():
+    boe1 = BOE(["a", "b"])
+    boe1.set_mass(["a"], 1.0)
+    boe2 = BOE(["a", "b"])
+    boe2.set_mass(["b"], 1.0)
+    for log in [False, True]:
+        fusion = CommonalityFusion(["a", "b"], "dcr", log=log)
+        fusion.add_many([boe1, boe2])
+        assert fusion.to_boe() is None
+
+
+def test_windowed_fusion_matches_refusion(random_boes):
+    boes = random_boes(2, 10, SINGLETONS, 3, theta=0.5)
+    for rule in ["conjunctive", "dcr", "disjunctive"]:
+        fusion = WindowedFusion(SINGLETONS, rule, size=3)
+        for end, boe in enumerate(boes, 1):
+            fusion.add(boe)
+            window = boes[max(end - 3, 0) : end]
+            expected = window[0].combine_multisource(window[1:], rule).get_vector()
+            assert fusion.window == window
+            assert np.allclose(fusion.get_vector(), expected)
+        fusion.rebuild()
+        assert np.allclose(fusion.get_vector(), expected)
+
+
+def test_windowed_fusion_expiry():
+    boe1 = BOE(["a", "b"])
+    boe1.set_mass(["a"], 1.0)
+    boe2 = BOE(["a", "b"])
+    boe2.set_mass(["b"], 1.0)
+    fusion = WindowedFusion(["a", "b"], "dcr", duration=10)
+    fusion.add(boe1, timestamp=0)
+    fusion.add(boe2, timestamp=5)
+    assert fusion.to_boe() is None
+    fusion.add(boe2, timestamp=12)
+    assert fusion.count == 2
+    assert fusion.get_vector().tolist() == [0, 0, 1, 0]
+    assert fusion.expire(boe2) is boe2
+    assert fusion.expire() is boe2
+    with pytest.raises(ValueError):
+        fusion.expire()
+
+
+def test_decay_fusion(random_boes):
+    boes = random_boes(3, 3, SINGLETONS, 3, theta=0.5)
+    fusion = DecayFusion(SINGLETONS, "pcr5", decay=0.2)
+    for boe in boes:
+        fusion.add(boe)
+    expected = boes[0].discount(0.8).combine(boes[1], "pcr5")
+    expected = expected.discount(0.8).combine(boes[2], "pcr5")
+    assert np.allclose(fusion.to_boe().get_vector(), expected.get_vector())
+
+    fusion = DecayFusion(SINGLETONS, "yager", half_life=2)
+    fusion.add(boes[0], timestamp=0)
+    faded = fusion.to_boe(timestamp=4)
+    assert np.isclose(
+        faded.get_mass(SINGLETONS),
+        0.75 + 0.25 * boes[0].get_normalized_mass(SINGLETONS),
+    )
@@ -0,0 +1,65 @@
+import pytest
+
+from unsure import instrumentation
+from unsure.boe import BOE
+from unsure.compact import CompactBOE
+
+
+def _boes():
+    boe1 = BOE(["a", "b"])
+    boe1.set_mass(["a"], 0.6)
+    boe1.set_mass_theta(0.4)
+    boe2 = BOE(["a", "b"])
+    boe2.set_mass(["b"], 0.5)
+    boe2.set_mass_theta(0.5)
+    return boe1, boe2
+
+
+def test_disabled_by_default():
+    assert not instrumentation.is_enabled()
+    assert isinstance(instrumentation.get_sink(), instrumentation.NullSink)
+
+
+def test_recording():
+    boe1, boe2 = _boes()
+    with instrumentation.recording() as sink:
+        assert instrumentation.is_enabled()
+        boe1.combine(boe2, "pcr5")
+        boe1.dcr_multisource([boe2, boe2])
+        boe1.update(boe2, 0.5)
+    assert not instrumentation.is_enabled()
+
+    assert sink.counter("combine.calls", rule="pcr5") == 1
+    assert sink.counter("combine.calls", rule="dcr") == 2
+    assert sink.counter("combine.calls") == 3
+    assert sink.counter("combine_multisource.calls") == 1
+    assert sink.counter("update.calls") == 1
+    assert len(sink.values("combine.seconds")) == 3
+    assert sink.values("combine.focal_before", rule="pcr5") == [2, 2]
+    assert sink.values("combine.conflict", rule="pcr5") == [pytest.approx(0.3)]
+    counts, _ = sink.histogram("combine.conflict", bins=2, value_range=(0, 1))
+    assert counts.sum() == 3
+    assert "update.focal_after" in sink.names()
+
+    boe1.combine(boe2)
+    assert sink.counter("combine.calls") == 3
+
+
+def test_conflict_on_every_storage(random_boes, monkeypatch):
+    monkeypatch.setattr(instrumentation, "_CONFLICT_CHUNK", 30)
+    singletons = ["a", "b", "c", "d", "e"]
+    boe1, boe2 = random_boes(0, 2, singletons, 12, keys=range(32), storage="sparse")
+    expected = sum(
+        mass1 * mass2
+        for key1, mass1 in boe1.get_normalized_dsvector().items()
+        for key2, mass2 in boe2.get_normalized_dsvector().items()
+        if not key1 & key2
+    )
+    dense1, dense2 = random_boes(0, 2, singletons, 12, keys=range(32), storage="dense")
+    for operands in [
+        (boe1, boe2),
+        (dense1, dense2),
+        (boe1, dense2),
+        (dense1, CompactBOE.from_boe(boe2)),
+    ]:
+        assert instrumentation._conflict(*operands) == pytest.approx(expected)
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from unsure.parallel import parallel_multisource
+
+SINGLETONS = ["a", "b", "c"]
+
+
+def test_parallel_matches_sequential(random_boes):
+    boes = random_boes(0, 11, SINGLETONS, 2, theta=0.3)
+    for rule in ["conjunctive", "disjunctive", "dcr"]:
+        expected = boes[0].combine_multisource(boes[1:], rule)
+        fused = parallel_multisource(boes, rule, workers=2, chunk_size=3)
+        assert np.allclose(fused.get_vector(), expected.get_vector())
+
+
+def test_non_associative_rule_warns(random_boes):
+    boes = random_boes(1, 4, SINGLETONS, 2, theta=0.3)
+    with pytest.warns(UserWarning):
+        fused = parallel_multisource(boes, "pcr5", workers=2)
+    expected = boes[0].pcr5_multisource(boes[1:])
+    assert np.allclose(fused.get_vector(), expected.get_vector())
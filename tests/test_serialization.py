@@ -0,0 +1,61 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+from unsure import serialization
+from unsure.boe import BOE
+
+SINGLETONS = ["a", "b", "c", "d"]
+
+
+def _assert_same(boe, rebuilt):
+    assert rebuilt.frame is boe.frame
+    assert dict(rebuilt.dsvector) == dict(boe.dsvector)
+
+
+def test_arrays_round_trip(random_boes):
+    for storage in ["sparse", "dense"]:
+        boe = random_boes(0, 1, SINGLETONS, 4, storage=storage)[0]
+        keys, masses = boe.to_arrays()
+        _assert_same(boe, BOE.from_arrays(SINGLETONS, keys, masses, storage=storage))
+    with pytest.raises(ValueError):
+        BOE.from_arrays(SINGLETONS, [16], [1.0])
+
+
+def test_json_round_trip(random_boes):
+    boes = random_boes(1, 5, SINGLETONS, 4)
+    for boe in boes:
+        _assert_same(
+            boe, serialization.from_json(json.dumps(serialization.to_json(boe)))
+        )
+    fp = io.StringIO()
+    serialization.dump_jsonl(boes, fp)
+    fp.seek(0)
+    for boe, rebuilt in zip(boes, serialization.load_jsonl(fp)):
+        _assert_same(boe, rebuilt)
+
+
+def test_bytes_round_trip(random_boes):
+    boes = random_boes(2, 5, SINGLETONS, 4) + random_boes(
+        3, 1, SINGLETONS, 4, storage="dense"
+    )
+    buffer = b"".join(serialization.to_bytes(boe) for boe in boes)
+    _assert_same(boes[0], serialization.from_bytes(buffer))
+    for boe, rebuilt in zip(boes, serialization.iter_bytes(buffer)):
+        _assert_same(boe, rebuilt)
+    with pytest.raises(ValueError):
+        serialization.from_bytes(b"\0" * 16)
+
+
+def test_npz_round_trip(random_boes):
+    boes = random_boes(4, 10, SINGLETONS, 4)
+    fp = io.BytesIO()
+    serialization.save(fp, boes)
+    fp.seek(0)
+    loaded = serialization.load(fp)
+    assert len(loaded) == 10
+    for boe, rebuilt in zip(boes, loaded):
+        _assert_same(boe, rebuilt)
+        assert np.array_equal(boe.get_vector(), rebuilt.get_vector())
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from unsure.boe import BOE
+from unsure.service import FusionService, _fuse
+
+SINGLETONS = ["a", "b"]
+
+
+def _evidence(singleton, mass=0.8):
+    boe = BOE(SINGLETONS)
+    boe.set_mass([singleton], mass)
+    boe.set_mass_theta(1 - mass)
+    return boe
+
+
+def test_combination_matches_multisource():
+    evidence = [_evidence(s) for s in ["a", "a", "b", "a"]]
+    expected = evidence[0].dcr_multisource(evidence[1:])
+
+    async def run():
+        async with FusionService(SINGLETONS, rule="dcr", max_batch=2) as service:
+            for boe in evidence:
+                await service.submit("x", boe)
+            return await service.uncertainty("x", ["a"])
+
+    assert asyncio.run(run()) == pytest.approx(expected.uncertainty(["a"]))
+
+
+def test_cue_update_and_consume():
+    evidence = [("x", _evidence("a", 1)), ("y", _evidence("b", 1))] * 3
+    expected = BOE(SINGLETONS)
+    expected.set_mass_theta(1.0)
+    for _, boe in evidence[::2]:
+        expected.update(boe, 0.5)
+
+    async def source():
+        for item in evidence:
+            yield item
+
+    async def run():
+        service = FusionService(SINGLETONS, alpha=0.5, max_queue=1)
+        await service.consume(source())
+        await service.close()
+        with pytest.raises(RuntimeError):
+            await service.submit("x", evidence[0][1])
+        return await service.snapshot("x"), await service.snapshot("z")
+
+    snapshot, missing = asyncio.run(run())
+    assert snapshot.get_uncertainties() == pytest.approx(expected.get_uncertainties())
+    assert missing is None
+
+
+def test_backpressure():
+    async def run():
+        async with FusionService(SINGLETONS, max_queue=2) as service:
+            queue = asyncio.Queue()
+            for _ in range(10):
+                queue.put_nowait(("x", _evidence("a")))
+            queue.put_nowait(None)
+            consumer = asyncio.create_task(service.consume(queue))
+            await asyncio.sleep(0)
+            assert service.pending("x") <= 2
+            await consumer
+            return await service.snapshot("x")
+
+    assert asyncio.run(run()).get_mass(["a"]) > 0.99
+
+
+def test_total_conflict_is_final():
+    async def run():
+        async with FusionService(SINGLETONS, max_batch=1) as service:
+            for singleton in ["a", "b", "a"]:
+                await service.submit("x", _evidence(singleton, 1))
+            return await service.snapshot("x")
+
+    assert asyncio.run(run()) is None
+
+
+def test_cue_fusion_does_not_modify_published_state():
+    state = BOE(SINGLETONS)
+    state.set_mass_theta(1.0)
+    before = dict(state.dsvector)
+    fused = _fuse(state, [_evidence("a")], "dcr", 0.5)
+    assert fused is not state
+    assert dict(state.dsvector) == before
+    assert fused.get_normalized_mass(["a"]) > 0
+
+
+def test_combination_does_not_keep_submitted_evidence():
+    evidence = _evidence("a")
+    fused = _fuse(None, [evidence], "dcr", None)
+    assert fused is not evidence
+    evidence.set_mass(["b"], 0.8)
+    assert fused.get_normalized_mass(["b"]) == 0
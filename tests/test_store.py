@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from unsure.boe import BOE
+from unsure.store import BOEStore
+
+SINGLETONS = ["a", "b", "c"]
+
+
+@pytest.mark.parametrize("layout", ["dense", "sparse"])
+def test_store_round_trip(tmp_path, layout, random_boes):
+    boes = random_boes(0, 5, SINGLETONS, 3)
+    boes = {f"entity-{i}": boe for i, boe in enumerate(boes)}
+    with BOEStore.create(
+        tmp_path, SINGLETONS, layout, max_focal=4, capacity=2
+    ) as store:
+        for entity, boe in boes.items():
+            store[entity] = boe
+        assert store.capacity >= 5
+        with pytest.raises(FileExistsError):
+            BOEStore.create(tmp_path, SINGLETONS)
+
+    store = BOEStore(tmp_path, mode="r")
+    assert store.ids == list(boes)
+    for entity, boe in boes.items():
+        assert np.allclose(store[entity].get_vector(), boe.get_vector())
+    rows = 0
+    for ids, batch in store.scan(batch_size=2):
+        for row, entity in enumerate(ids):
+            assert np.allclose(
+                batch.get_normalized_masses()[row], boes[entity].get_vector()
+            )
+        rows += len(ids)
+    assert rows == 5
+    with pytest.raises(KeyError):
+        store.get("missing")
+
+
+@pytest.mark.parametrize("layout", ["dense", "sparse"])
+def test_store_update_in_place(tmp_path, layout, random_boes):
+    boe, evidence = random_boes(1, 2, SINGLETONS, 3)
+    with BOEStore.create(tmp_path, SINGLETONS, layout, max_focal=8) as store:
+        store.put("x", boe)
+        store.update("x", evidence, 0.5)
+    boe.update(evidence, 0.5)
+    assert np.allclose(BOEStore(tmp_path)["x"].get_vector(), boe.get_vector())
+
+
+def test_dense_store_views(tmp_path, random_boes):
+    with BOEStore.create(tmp_path, SINGLETONS) as store:
+        store.put("x", random_boes(2, 1, SINGLETONS, 3)[0])
+        view = store.get("x")
+        view.set_mass(["a"], 5.0)
+    assert BOEStore(tmp_path)["x"].get_mass(["a"]) == 5.0
+
+
+def test_dense_store_views_see_later_writes(tmp_path):
+    with BOEStore.create(tmp_path, SINGLETONS) as store:
+        store.put("x", BOE.from_dsvector(SINGLETONS, {1: 0.6, 7: 0.4}))
+        view = store.get("x")
+        assert view.belief(["a"]) == pytest.approx(0.6)
+        assert view.get_normalized_dsvector()[1] == pytest.approx(0.6)
+        store.put("x", BOE.from_dsvector(SINGLETONS, {2: 1.0}))
+        assert view.belief(["a"]) == 0
+        assert view.plausibility(["a"]) == 0
+        assert dict(view.get_normalized_dsvector()) == {2: 1.0}
+        store.update("x", BOE.from_dsvector(SINGLETONS, {1: 1.0}), 0.5)
+        assert np.allclose(view.get_vector(), store.get("x").get_vector())
+        assert view.belief(["a"]) > 0
+
+
+def test_sparse_store_budget(tmp_path, random_boes):
+    store = BOEStore.create(tmp_path, SINGLETONS, "sparse", max_focal=2)
+    with pytest.raises(ValueError):
+        store.put("x", random_boes(3, 1, SINGLETONS, 3)[0])
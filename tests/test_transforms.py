@@ -0,0 +1,60 @@
+import numpy as np
+
+from unsure import transforms
+from unsure.boe import BOE
+
+THRESHOLD = 1e-9
+
+
+def _example_boe():
+    boe = BOE(["a", "b", "c"])
+    boe.set_mass(["a"], 0.5)
+    boe.set_mass(["b", "c"], 0.2)
+    boe.set_mass(["a", "c"], 0.1)
+    boe.set_mass(["a", "b", "c"], 0.2)
+    return boe
+
+
+def test_vectors_match_queries():
+    boe = _example_boe()
+    belief = boe.get_vector("belief")
+    plausibility = boe.get_vector("plausibility")
+    commonality = boe.get_vector("commonality")
+    for proposition in BOE._powerset(boe.frame):
+        proposition = list(proposition)
+        key = boe._get_index_from_dsvector(proposition)
+        assert abs(belief[key] - boe.belief(proposition)) < THRESHOLD
+        assert abs(plausibility[key] - boe.plausibility(proposition)) < THRESHOLD
+        expected = sum(
+            mass
+            for index, mass in boe.get_normalized_dsvector().items()
+            if index & key == key
+        )
+        assert abs(commonality[key] - expected) < THRESHOLD
+
+
+def test_round_trips():
+    mass = _example_boe().get_vector()
+    for kind in ["belief", "plausibility", "commonality", "implicability"]:
+        vector = transforms.convert(mass, "mass", kind)
+        assert np.allclose(transforms.convert(vector, kind, "mass"), mass)
+        assert np.allclose(
+            transforms.convert(vector, kind, "commonality"),
+            transforms.mass_to_commonality(mass),
+        )
+
+
+def test_stacked_vectors():
+    mass = _example_boe().get_vector()
+    stacked = np.stack([mass, mass[::-1]])
+    belief = transforms.mass_to_belief(stacked)
+    assert np.allclose(belief[0], transforms.mass_to_belief(mass))
+    assert np.allclose(belief[1], transforms.mass_to_belief(mass[::-1]))
+
+
+def test_from_vector():
+    boe = _example_boe()
+    rebuilt = BOE.from_vector(boe.frame, boe.get_vector("plausibility"), "plausibility")
+    for key, mass in boe.dsvector.items():
+        assert abs(rebuilt.dsvector[key] - mass) < THRESHOLD
+    assert len(rebuilt.dsvector) == len(boe.dsvector)
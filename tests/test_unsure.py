@@ -1,3 +1,5 @@
+import pytest
+
 from unsure import __version__
 from unsure.boe import BOE
 
@@ -344,3 +346,65 @@ def test_update_example1():
 
     stream = [s1, s2, s3]
     boe.update_stream(stream, alpha)
+
+
+def test_update_iter():
+    """
+    Streaming CUE update: snapshots at a cadence, no printing
+    """
+    alpha = 0.5
+
+    def evidence():
+        for singleton in ["a", "a", "b", "a", "b"]:
+            s = BOE(["a", "b"])
+            s.set_mass([singleton], 1)
+            yield s
+
+    boe = BOE(["a", "b"])
+    boe.set_mass_theta(1.0)
+    expected = BOE(["a", "b"])
+    expected.set_mass_theta(1.0)
+
+    snapshots = list(boe.update_iter(evidence(), alpha, every=2))
+    assert [idx for idx, _ in snapshots] == [1, 3, 4]
+
+    for s in evidence():
+        expected.update(s, alpha)
+    assert snapshots[-1][1] == expected.get_uncertainties()
+
+    calls = []
+    boe.update_stream(
+        evidence(), alpha, every=5, callback=lambda idx, b: calls.append(idx)
+    )
+    assert calls == [4]
+
+
+def test_bulk_queries_and_cache():
+    """
+    belief_many/plausibility_many match single queries, and the
+    query cache is dropped by writes
+    """
+    boe = BOE(["a", "b", "c"])
+    boe.set_mass(["a"], 0.2)
+    boe.set_mass(["a", "b"], 0.3)
+    boe.set_mass_theta(0.5)
+    propositions = boe.frame.powerset()[1:]
+
+    intervals = boe.uncertainty_many(propositions)
+    for expected, proposition in zip(intervals, propositions):
+        assert boe.uncertainty(proposition) == pytest.approx(expected)
+    dense = BOE.from_dsvector(["a", "b", "c"], boe.dsvector, storage="dense")
+    for expected, interval in zip(intervals, dense.uncertainty_many(propositions)):
+        assert interval == pytest.approx(expected)
+
+    assert boe.belief(["a", "b"]) == pytest.approx(0.5)
+    boe.set_mass(["b"], 1.0)
+    assert boe.belief(["a", "b"]) == pytest.approx(0.75)
+    boe.update(dense, 0.5)
+    assert boe.belief(["a", "b"]) == pytest.approx(boe.belief_many([["a", "b"]])[0])
+
+    boe.QUERY_CACHE_SIZE = 2
+    expected = boe.plausibility_many(propositions)
+    assert [boe.plausibility(p) for p in propositions * 2] == pytest.approx(
+        expected * 2
+    )
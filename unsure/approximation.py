@@ -0,0 +1,177 @@
+"""
+Approximations bounding the number of focal elements of a BOE
+
+Repeated combination makes the number of focal elements grow quickly,
+and every later combination is quadratic in it. These operators return
+a BOE on the same frame with few focal elements:
+
+- summarize: Lowrance's summarization, at most k focal elements
+- klx: Tessem's k-l-x approximation, at most l focal elements
+- bayesian: Voorbraak's Bayesian approximation (singletons only)
+- pignistic: pignistic probabilities (singletons only)
+- outer_consonant / inner_consonant: nested focal elements (at most n)
+
+approximate(boe, budget, method) applies one of them only when the BOE
+has more than budget focal elements.
+"""
+
+from unsure import decision
+from unsure.boe import BOE
+
+
+def _focal_elements(boe):
+    """
+    Returns (key, normalized mass) of the focal elements, largest mass
+    first (smallest key first on ties)
+    """
+    items = [(key, mass) for key, mass in boe.get_normalized_dsvector().items() if mass]
+    return sorted(items, key=lambda item: (-item[1], item[0]))
+
+
+def summarize(boe, k):
+    """
+    Keeps the k - 1 largest focal elements and moves the rest of the
+    mass to the union of the other focal elements (at most k focal
+    elements, and Bel' <= Bel)
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    focal = _focal_elements(boe)
+    if len(focal) <= k:
+        return boe
+    dsvector = dict(focal[: k - 1])
+    union = 0
+    removed = 0.0
+    for key, mass in focal[k - 1 :]:
+        union |= key
+        removed += mass
+    dsvector[union] = dsvector.get(union, 0) + removed
+    return BOE.from_dsvector(boe.frame, dsvector)
+
+
+def klx(boe, k, limit=None, tolerance=0.0):
+    """
+    Tessem's k-l-x approximation: keeps the largest focal elements, at
+    least k and at most limit (l) of them, stopping as soon as the mass
+    left out is at most tolerance (x); the kept masses are then
+    renormalized
+
+    limit: defaults to k
+    """
+    if limit is None:
+        limit = k
+    if not 1 <= k <= limit:
+        raise ValueError("Expected 1 <= k <= limit")
+    focal = _focal_elements(boe)
+    removed = sum(mass for _, mass in focal)
+    dsvector = {}
+    for key, mass in focal[:limit]:
+        if len(dsvector) >= k and removed <= tolerance:
+            break
+        dsvector[key] = mass
+        removed -= mass
+    return BOE.from_dsvector(boe.frame, dsvector)
+
+
+def bayesian(boe):
+    """
+    Voorbraak's Bayesian approximation: each singleton gets the
+    normalized sum of the masses of the focal elements containing it
+    """
+    probabilities = decision.plausibility_transform(boe)
+    return BOE.from_dsvector(boe.frame, dict(zip(boe.frame.power, probabilities)))
+
+
+def pignistic(boe):
+    """
+    Pignistic approximation: the mass of each focal element is shared
+    equally among its singletons (the mass of the empty set is dropped)
+    """
+    probabilities = decision.pignistic(boe)
+    return BOE.from_dsvector(boe.frame, dict(zip(boe.frame.power, probabilities)))
+
+
+def _contour(boe):
+    """
+    Returns the singleton keys by decreasing plausibility, with their
+    plausibilities
+    """
+    dsvector = boe.get_normalized_dsvector()
+    contour = [
+        (bit, sum(mass for key, mass in dsvector.items() if key & bit))
+        for bit in boe.frame.power
+    ]
+    return sorted(contour, key=lambda item: (-item[1], item[0]))
+
+
+def outer_consonant(boe):
+    """
+    Outer consonant approximation (Dubois and Prade): with singletons
+    ordered by decreasing plausibility, each focal element moves to
+    the smallest set of the chain {x1} < {x1, x2} < ... containing it
+    (Bel' <= Bel, at most n focal elements)
+    """
+    chain = []
+    key = 0
+    for bit, _ in _contour(boe):
+        key |= bit
+        chain.append(key)
+    dsvector = {}
+    for focal, mass in boe.get_normalized_dsvector().items():
+        if not mass:
+            continue
+        nested = 0
+        if focal:
+            nested = next(key for key in chain if (focal & ~key) == 0)
+        dsvector[nested] = dsvector.get(nested, 0) + mass
+    return BOE.from_dsvector(boe.frame, dsvector)
+
+
+def inner_consonant(boe):
+    """
+    Inner consonant approximation from the contour function: the
+    consonant BOE whose singleton plausibilities are proportional to
+    those of boe (Pl' <= Pl when the largest is 1, at most n focal
+    elements)
+    """
+    contour = _contour(boe)
+    top = contour[0][1]
+    if top == 0:
+        return BOE.from_dsvector(boe.frame, {boe.frame.theta: 1.0})
+    dsvector = {}
+    key = 0
+    for position, (bit, plausibility) in enumerate(contour):
+        key |= bit
+        following = contour[position + 1][1] if position + 1 < len(contour) else 0
+        if plausibility > following:
+            dsvector[key] = (plausibility - following) / top
+    return BOE.from_dsvector(boe.frame, dsvector)
+
+
+# name: (function, takes the budget)
+APPROXIMATIONS = {
+    "summarize": (summarize, True),
+    "klx": (klx, True),
+    "bayesian": (bayesian, False),
+    "pignistic": (pignistic, False),
+    "outer_consonant": (outer_consonant, False),
+    "inner_consonant": (inner_consonant, False),
+}
+
+
+def approximate(boe, budget, method="summarize"):
+    """
+    Returns boe approximated with method if it has more than budget
+    focal elements, boe itself otherwise
+
+    "bayesian", "pignistic" and the consonant methods do not take the
+    budget: they always give at most n focal elements.
+    """
+    if method not in APPROXIMATIONS:
+        raise ValueError(f"Unknown approximation: {method}")
+    if len(_focal_elements(boe)) <= budget:
+        return boe
+    function, takes_budget = APPROXIMATIONS[method]
+    if takes_budget:
+        return function(boe, budget)
+    return function(boe)
@@ -0,0 +1,201 @@
+"""
+Batches of BOEs sharing one frame
+
+A BOEBatch stores N mass functions as an (N, 2^n) array indexed by
+DSVector keys so that combination, queries and the CUE update run as
+NumPy operations over every BOE at once.
+"""
+
+import numpy as np
+
+from unsure import combination, dense, transforms
+from unsure.boe import BOE
+from unsure.cue import cue_update
+from unsure.frame import Frame
+
+
+class BOEBatch:
+    """
+    N Bodies of Evidence over the same frame
+    """
+
+    def __init__(self, singletons, masses):
+        """
+        Constructor
+
+        masses: UNNORMALIZED masses, array of shape (N, 2^n)
+        """
+        self._frame = Frame(singletons)
+        masses = np.array(masses, dtype=np.result_type(masses, np.float32), ndmin=2)
+        if masses.shape[-1] != 2 ** len(self._frame):
+            raise ValueError("Masses must have 2^n columns for a frame of n singletons")
+        self._masses = masses
+
+    @classmethod
+    def from_boes(cls, list_boes, dtype="float64"):
+        """
+        Returns a batch holding the (unnormalized) masses of BOEs on one frame
+        """
+        frame = list_boes[0].frame
+        masses = np.zeros((len(list_boes), 2 ** len(frame)), dtype=dtype)
+        for row, boe in enumerate(list_boes):
+            if boe.frame != frame:
+                raise ValueError("All BOEs in a batch must share the same frame")
+            for key, mass in boe.dsvector.items():
+                masses[row, key] = mass
+        return cls(frame, masses)
+
+    def to_boes(self):
+        """
+        Returns the batch as a list of BOEs
+        """
+        return [self[row] for row in range(len(self))]
+
+    def __len__(self):
+        return len(self._masses)
+
+    def __getitem__(self, row):
+        return BOE.from_dsvector(
+            self.frame, transforms.to_dsvector(self._masses[row]), self._masses.dtype
+        )
+
+    # -------------------------------------
+    # Properties
+
+    @property
+    def frame(self):
+        """
+        Get singletons or FoD or frame
+        """
+        return self._frame
+
+    @property
+    def masses(self):
+        """
+        Get the UNNORMALIZED (N, 2^n) mass array
+        """
+        return self._masses
+
+    @property
+    def normalizing_constants(self):
+        """
+        Returns the sum of masses of each BOE, shape (N,)
+        """
+        return self._masses.sum(axis=1)
+
+    def get_normalized_masses(self):
+        """
+        Returns the NORMALIZED (N, 2^n) mass array
+        """
+        totals = self.normalizing_constants[:, np.newaxis]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(totals != 0, self._masses / totals, self._masses)
+
+    def get_vector(self, kind="mass"):
+        """
+        Returns NORMALIZED (N, 2^n) mass, belief, plausibility,
+        commonality or implicability vectors
+        """
+        return transforms.convert(self.get_normalized_masses(), "mass", kind)
+
+    # -------------------------------------
+    # Queries
+
+    def belief(self, proposition):
+        """
+        Returns the belief of a proposition for every BOE, shape (N,)
+        """
+        key = self._frame.key(proposition)
+        keys = self._frame.keys
+        return (
+            self._masses[:, (keys & ~key) == 0].sum(axis=1) / self.normalizing_constants
+        )
+
+    def plausibility(self, proposition):
+        """
+        Returns the plausibility of a proposition for every BOE, shape (N,)
+        """
+        key = self._frame.key(proposition)
+        keys = self._frame.keys
+        return (
+            self._masses[:, (keys & key) != 0].sum(axis=1) / self.normalizing_constants
+        )
+
+    def uncertainty(self, proposition):
+        """
+        Returns the uncertainty intervals [belief, plausibility], shape (N, 2)
+        """
+        return np.stack(
+            [self.belief(proposition), self.plausibility(proposition)], axis=1
+        )
+
+    # -------------------------------------
+    # Combination and update
+
+    def _get_other_masses(self, other):
+        """
+        Returns NORMALIZED masses of a BOE (shape (2^n,)) or of
+        a batch (shape (N, 2^n)) to combine with
+        """
+        if isinstance(other, BOE):
+            return transforms.to_dense(
+                other.get_normalized_dsvector(), len(self.frame), self._masses.dtype
+            )
+        if len(other) != len(self):
+            raise ValueError("Batches must have the same number of BOEs")
+        return other.get_normalized_masses()
+
+    def combine(self, other, rule="dcr"):
+        """
+        Returns a fused BOEBatch, combining row by row with another
+        batch of the same size, or every row with a single BOE.
+
+        rule: one of "conjunctive", "disjunctive", "dcr", "yager",
+        "dubois_prade", "pcr5"
+
+        For "dcr", rows in total conflict come out as NaN.
+        """
+        if self.frame != other.frame:
+            print("Cannot handle non-identical BOEs")
+            return None
+
+        if rule not in combination.RULES:
+            raise ValueError(f"Unknown combination rule: {rule}")
+
+        fused = dense.RULES[rule](
+            self.get_normalized_masses(), self._get_other_masses(other)
+        )
+        return BOEBatch(self.frame, fused)
+
+    def combine_multisource(self, list_others, rule="dcr"):
+        """
+        Returns a fused BOEBatch by repeatedly calling combine()
+        """
+        fused = self
+        for other in list_others:
+            fused = fused.combine(other, rule)
+        return fused
+
+    def update(self, new_frame, alpha):
+        """
+        CUE Algorithm, applied to every BOE in place
+
+        new_frame: a BOE (the same evidence for every row)
+        or a BOEBatch (one piece of evidence per row)
+        alpha: amount of weight on existing knowledge
+        """
+        if self.frame != new_frame.frame:
+            print("Cannot handle non-identical BOEs")
+            return
+
+        if isinstance(new_frame, BOE):
+            evidence = transforms.to_dense(
+                new_frame.dsvector, len(self.frame), self._masses.dtype
+            )
+            order = list(new_frame.dsvector)
+        else:
+            if len(new_frame) != len(self):
+                raise ValueError("Batches must have the same number of BOEs")
+            evidence = new_frame.masses
+            order = None
+        cue_update(self._masses, evidence, alpha, order)
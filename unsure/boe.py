@@ -1,7 +1,6 @@
 # UPDATED DS
 #  v0.2
 # pylint: disable=no-member
-# pylint: disable=eval-used
 # singleton: string
 # proposition: list of strings
 
@@ -17,31 +16,191 @@ belief: total support for a proposition without any ambiguity (sum of masses of
 plausibility: Extent to which a proposition is plausible (sum of masses of overlapping sets)
 """
 
-from collections import defaultdict
+import ast
 import copy
+from collections import OrderedDict
+import functools
 from itertools import chain, combinations
 
+import numpy as np
+
+from unsure import combination, cue, dense, transforms
+from unsure.dsvector import DenseDSVector, SparseDSVector
+from unsure.frame import Frame, FrameMap
+from unsure.instrumentation import instrumented
+
+
+def _as_boe(boe):
+    """
+    Returns a BOE for a BOE or any BOE-like object with to_boe()
+    (e.g. a CompactBOE)
+    """
+    return boe if isinstance(boe, BOE) else boe.to_boe()
+
+
+def _aligned(method):
+    """
+    Decorator running a combination method on the common frame of the
+    two BOEs when their frames differ but are compatible (see
+    Frame.common), e.g. reordered or with fewer singletons
+
+    The other operand may be any BOE-like object with to_boe().
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, another_boe, *args, **kwargs):
+        another_boe = _as_boe(another_boe)
+        if self.frame is not another_boe.frame:
+            aligned = self.align(another_boe)
+            if aligned is not None:
+                return method(*aligned, *args, **kwargs)
+        return method(self, another_boe, *args, **kwargs)
+
+    return wrapper
+
 
 class BOE:
     """
     A class to represent a DS-Theoretic Body of Evidence
     """
 
-    def __init__(self, singletons):
+    # With storage="auto", the DSVector moves to a dense vector of length 2^n
+    # once at least DENSE_DENSITY of the power set has mass (for frames of
+    # MIN_DENSE_SINGLETONS to MAX_DENSE_SINGLETONS singletons) and moves
+    # back to a dict when fewer than SPARSE_DENSITY have mass.
+    MIN_DENSE_SINGLETONS = 8
+    MAX_DENSE_SINGLETONS = 24
+    DENSE_DENSITY = 1 / 16
+    SPARSE_DENSITY = 1 / 64
+
+    # Most belief/plausibility results memoized per BOE
+    QUERY_CACHE_SIZE = 256
+
+    def __init__(self, singletons, dtype="float64", storage="auto"):
         """
         Constructor
+
+        dtype: "float64" or "float32", used by the dense storage
+        storage: "auto", "sparse" or "dense"
         """
-        # List of lowercased singletons of size n. The index of these singletons is important.
-        self._frame = [x.lower() for x in singletons]
+        # Frame of lowercased singletons of size n. The index of these singletons is important.
+        # Frames are interned, so all BOEs on the same singletons share one.
+        self._frame = Frame(singletons)
+
+        if storage not in ("auto", "sparse", "dense"):
+            raise ValueError(f"Unknown storage: {storage}")
+        self._storage = storage
+        self._dtype = np.dtype(dtype)
 
         # dict containing masses
         # this is also the masses DSVector
         # initialized to zero
         # UNNORMALIZED
-        self._dsvector = defaultdict(self._default_mass)
+        if storage == "dense":
+            self._dsvector = DenseDSVector(len(self._frame), self._dtype)
+        else:
+            self._dsvector = SparseDSVector(self._default_mass)
+
+        # LRU cache of belief/plausibility queries (see _cached_query)
+        self._query_cache = OrderedDict()
+        self._query_dsvector = None
+        self._query_version = None
+
+    @classmethod
+    def from_dsvector(cls, singletons, dsvector, dtype="float64", storage="auto"):
+        """
+        Returns a new BOE over singletons with masses
+        taken from a DSVector (dict of key: mass)
+        """
+        boe = cls(singletons, dtype, storage)
+        boe._dsvector.update(dsvector)
+        boe._check_storage()
+        return boe
+
+    @classmethod
+    def from_vector(
+        cls, singletons, vector, kind="mass", dtype="float64", storage="auto", copy=True
+    ):
+        """
+        Returns a new BOE from a dense vector of length 2^n indexed by
+        DSVector keys.
+
+        kind: "mass", "belief", "plausibility", "commonality" or "implicability"
+        copy: with copy=False, kind="mass" and storage="dense", the BOE
+        keeps vector itself (of the given dtype) as its storage, so
+        writes to the BOE go to vector (e.g. a memory-mapped row) and
+        writes to vector by others are seen by the BOE
+        """
+        # pylint: disable=too-many-arguments
+        if not copy and kind == "mass" and storage == "dense":
+            if vector.dtype != np.dtype(dtype):
+                raise ValueError("vector does not have the requested dtype")
+            boe = cls(singletons, dtype, storage)
+            boe._dsvector = DenseDSVector(len(boe.frame), vector=vector, shared=True)
+            return boe
+
+        mass = transforms.convert(vector, kind, "mass").astype(dtype)
+        if kind != "mass":
+            mass[np.abs(mass) <= transforms.TOLERANCE] = 0
+        boe = cls(singletons, dtype, storage)
+        if storage == "sparse":
+            boe._dsvector.update(transforms.to_dsvector(mass))
+        else:
+            boe._dsvector = DenseDSVector(len(boe.frame), vector=mass)
+            boe._check_storage()
+        return boe
+
+    @classmethod
+    def from_arrays(cls, singletons, keys, masses, dtype="float64", storage="auto"):
+        """
+        Returns a new BOE from parallel arrays of DSVector keys and
+        UNNORMALIZED masses, without any per-proposition parsing
+        """
+        # pylint: disable=too-many-arguments
+        keys = np.asarray(keys, dtype=np.int64)
+        masses = np.asarray(masses)
+        if keys.shape != masses.shape or keys.ndim != 1:
+            raise ValueError("keys and masses must be 1-D arrays of the same length")
+        boe = cls(singletons, dtype, storage)
+        if len(keys) and (keys.min() < 0 or keys.max() > boe.frame.theta):
+            raise ValueError("DSVector key out of the frame")
+        if storage == "dense":
+            vector = np.zeros(2 ** len(boe.frame), dtype=boe._dtype)
+            vector[keys] = masses
+            boe._dsvector = DenseDSVector(len(boe.frame), vector=vector)
+        else:
+            boe._dsvector = SparseDSVector(
+                boe._default_mass, zip(keys.tolist(), masses.tolist())
+            )
+            boe._check_storage()
+        return boe
+
+    def to_arrays(self):
+        """
+        Returns the DSVector as parallel arrays of keys and UNNORMALIZED
+        masses (the inverse of from_arrays)
+        """
+        if self.is_dense:
+            vector = self._dsvector.vector
+            keys = np.flatnonzero(vector).astype(np.int64)
+            return keys, vector[keys]
+        size = len(self._dsvector)
+        keys = np.fromiter(self._dsvector.keys(), dtype=np.int64, count=size)
+        masses = np.fromiter(self._dsvector.values(), dtype=np.float64, count=size)
+        return keys, masses
 
-        # Lookup table containing keys of singletons in the masses_dsvector
-        self._power = self._initialize_power()
+    def _new(self, dsvector):
+        """
+        Returns a new BOE on the same frame, dtype and storage policy
+        from a DSVector dict or a dense mass vector
+        """
+        if isinstance(dsvector, np.ndarray):
+            return BOE.from_vector(
+                self.frame, dsvector, dtype=self._dtype, storage=self._storage
+            )
+        return BOE.from_dsvector(
+            self.frame, dsvector, dtype=self._dtype, storage=self._storage
+        )
 
     @staticmethod
     def _default_mass():
@@ -57,7 +216,7 @@ class BOE:
     def frame(self):
         """
         Get singletons or FoD or frame
-        List of lowercased singletons of size n.
+        Frame (list-like) of lowercased singletons of size n.
         """
         return self._frame
 
@@ -67,7 +226,21 @@ class BOE:
         Get power:
         Lookup table containing keys of singletons in the masses_dsvector
         """
-        return self._power
+        return self._frame.power
+
+    @property
+    def is_dense(self):
+        """
+        True if the DSVector is currently stored as a dense vector
+        """
+        return isinstance(self._dsvector, DenseDSVector)
+
+    @property
+    def dtype(self):
+        """
+        Get the NumPy dtype of the dense storage
+        """
+        return self._dtype
 
     @property
     def dsvector(self):
@@ -88,6 +261,7 @@ class BOE:
         """
         index, mass = value
         self._dsvector.update({index: mass})
+        self._check_storage()
 
     @property
     def normalizing_constant(self):
@@ -95,8 +269,10 @@ class BOE:
         Returns the sum of masses in the DS-Vector.
         The Masses DSVector is unnormalized and so will
         need to be divided by this normalizing constant.
+
+        Maintained incrementally as masses are set.
         """
-        return sum(self.dsvector.values())
+        return self._dsvector.total()
 
     # ----------------------------------
     # Key DS-Theoretic Operations
@@ -108,7 +284,6 @@ class BOE:
         Just updates the mass in the DSVector.
         Does NOT normalize anything
         """
-        proposition = [x.lower() for x in proposition]
         index = self._get_index_from_dsvector(proposition)
         self.dsvector = (index, mass)
 
@@ -116,22 +291,23 @@ class BOE:
         """
         Sets masses for several propositions
         from a json entry
+
+        Keys are parsed as Python literals (see get_masses). For bulk
+        loading, use from_arrays or unsure.serialization instead.
         """
         for key, value in dsvector_as_dict.items():
-            self.set_mass(eval(key), value)
+            self.set_mass(ast.literal_eval(key), value)
 
     def set_mass_theta(self, mass):
         """
         Sets mass for the frame
         """
-        index = self._get_index_from_dsvector(self.frame)
-        self.dsvector = (index, mass)
+        self.dsvector = (self._frame.theta, mass)
 
     def get_mass(self, proposition):
         """
         Get UNNORMALIZED mass for a proposition or a singleton
         """
-        proposition = [x.lower() for x in proposition]
         index = self._get_index_from_dsvector(proposition)
         return self.dsvector[index]
 
@@ -139,7 +315,6 @@ class BOE:
         """
         Get normalized mass for a proposition
         """
-        proposition = [x.lower() for x in proposition]
         return self.get_mass(proposition) / self.normalizing_constant
 
     def get_masses(self):
@@ -167,15 +342,10 @@ class BOE:
     def get_normalized_dsvector(self):
         """
         Returns a dsvector with all the masses normalized
+
+        The result is a read-only view cached until the next write.
         """
-        normalized_dsvector = {}
-        for key, value in self.dsvector.items():
-            if self.normalizing_constant != 0:
-                normalized_mass = value / self.normalizing_constant
-            else:
-                normalized_mass = value
-            normalized_dsvector.update({key: normalized_mass})
-        return normalized_dsvector
+        return self._dsvector.normalized()
 
     def get_core(self):
         """
@@ -195,13 +365,24 @@ class BOE:
 
         Adds masses of subset and then divides by normalizing const.
 
+        Results are kept in a bounded LRU cache until the next write.
         """
-        proposition = [x.lower() for x in proposition]
-        non_zero_subsets = self._get_subsets_from_dsvector(proposition)
+        key = self._get_index_from_dsvector(proposition)
+        return self._cached_query("belief", key, self._belief)
+
+    def _belief(self, key):
+        """
+        Returns belief of a DSVector key (uncached)
+        """
+        if self.is_dense:
+            keys = self._frame.keys
+            vector = self._dsvector.vector
+            return float(vector[(keys & ~key) == 0].sum()) / self.normalizing_constant
+
         belief = 0
-        for subset in non_zero_subsets:
-            mass = self.get_mass(subset)
-            belief += mass
+        for index, mass in self.dsvector.items():
+            if index & ~key == 0:
+                belief += mass
         return belief / self.normalizing_constant
 
     def plausibility(self, proposition):
@@ -209,13 +390,25 @@ class BOE:
         Returns plausibility of a proposition
 
         Adds masses of overlapping sets and divides by normalizing const
+
+        Results are kept in a bounded LRU cache until the next write.
         """
-        proposition = [x.lower() for x in proposition]
-        non_zero_overlaps = self._get_intersections_from_dsvector(proposition)
+        key = self._get_index_from_dsvector(proposition)
+        return self._cached_query("plausibility", key, self._plausibility)
+
+    def _plausibility(self, key):
+        """
+        Returns plausibility of a DSVector key (uncached)
+        """
+        if self.is_dense:
+            keys = self._frame.keys
+            vector = self._dsvector.vector
+            return float(vector[(keys & key) != 0].sum()) / self.normalizing_constant
+
         plausibility = 0
-        for overlapping in non_zero_overlaps:
-            mass = self.get_mass(overlapping)
-            plausibility += mass
+        for index, mass in self.dsvector.items():
+            if index & key:
+                plausibility += mass
         return plausibility / self.normalizing_constant
 
     def uncertainty(self, proposition):
@@ -224,9 +417,96 @@ class BOE:
 
         [belief, plausibility]
         """
-        proposition = [x.lower() for x in proposition]
         return [self.belief(proposition), self.plausibility(proposition)]
 
+    def _cached_query(self, kind, key, compute):
+        """
+        Returns compute(key) through the per-BOE LRU cache
+
+        The cache is dropped whenever the DSVector changes (its version
+        is bumped by every write, including set_mass, set_masses,
+        set_mass_theta and update) or is replaced by a switch of storage.
+        """
+        dsvector = self._dsvector
+        if self._query_dsvector is not dsvector or (
+            self._query_version != dsvector.version
+        ):
+            self._query_cache.clear()
+            self._query_dsvector = dsvector
+            self._query_version = dsvector.version
+
+        cache_key = (kind, key)
+        if cache_key in self._query_cache:
+            self._query_cache.move_to_end(cache_key)
+            return self._query_cache[cache_key]
+        value = compute(key)
+        self._query_cache[cache_key] = value
+        if len(self._query_cache) > self.QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+        return value
+
+    def _get_query_keys(self, propositions):
+        """
+        Returns the DSVector keys of propositions as an array
+        """
+        return np.array(
+            [
+                self._get_index_from_dsvector(proposition)
+                for proposition in propositions
+            ],
+            dtype=np.int64,
+        )
+
+    def _get_focal_arrays(self):
+        """
+        Returns the keys and NORMALIZED masses of the DSVector as arrays
+        """
+        normalized = self.get_normalized_dsvector()
+        keys = np.fromiter(normalized.keys(), dtype=np.int64, count=len(normalized))
+        masses = np.fromiter(normalized.values(), dtype=float, count=len(normalized))
+        return keys, masses
+
+    def belief_many(self, propositions):
+        """
+        Returns the beliefs of a list of propositions
+
+        One pass over the focal elements for all propositions (one
+        transform of the dense vector when the BOE is dense).
+        """
+        keys = self._get_query_keys(propositions)
+        if self.is_dense:
+            return self.get_vector("implicability")[keys].tolist()
+        focal, masses = self._get_focal_arrays()
+        subsets = (focal[np.newaxis, :] & ~keys[:, np.newaxis]) == 0
+        return (subsets @ masses).tolist()
+
+    def plausibility_many(self, propositions):
+        """
+        Returns the plausibilities of a list of propositions
+
+        One pass over the focal elements for all propositions (one
+        transform of the dense vector when the BOE is dense).
+        """
+        keys = self._get_query_keys(propositions)
+        if self.is_dense:
+            return self.get_vector("plausibility")[keys].tolist()
+        focal, masses = self._get_focal_arrays()
+        overlapping = (focal[np.newaxis, :] & keys[:, np.newaxis]) != 0
+        return (overlapping @ masses).tolist()
+
+    def uncertainty_many(self, propositions):
+        """
+        Returns the uncertainty intervals [belief, plausibility]
+        of a list of propositions
+        """
+        propositions = list(propositions)
+        return [
+            list(interval)
+            for interval in zip(
+                self.belief_many(propositions), self.plausibility_many(propositions)
+            )
+        ]
+
     def get_uncertainties(self):
         """
         Returns uncertainty intervals for all items in core
@@ -237,6 +517,18 @@ class BOE:
             uncertainties.update({str(proposition): uncertainty})
         return uncertainties
 
+    def get_vector(self, kind="mass"):
+        """
+        Returns a dense NORMALIZED vector of length 2^n indexed by
+        DSVector keys, for every proposition at once.
+
+        kind: "mass", "belief", "plausibility", "commonality" or "implicability"
+
+        Note: belief() includes the mass of the empty set, so it matches
+        the "implicability" vector; "belief" leaves it out.
+        """
+        return transforms.convert(self._get_dense_normalized(), "mass", kind)
+
     def conditional_mass(self, proposition_b, proposition_a):
         """
         Returns conditional mass (b given a)
@@ -246,8 +538,6 @@ class BOE:
         Works on normalized masses
 
         """
-        proposition_a = [x.lower() for x in proposition_a]
-        proposition_b = [x.lower() for x in proposition_b]
         mass_b = self.get_mass(proposition_b)
         pl_a_minus_b = 0.0
         if not mass_b == 0:
@@ -259,89 +549,136 @@ class BOE:
             return mass_b_given_a
         return 0.0
 
+    @instrumented("update")
     def update(self, new_frame, alpha):
         """
         CUE Algorithm
         Mass-based conditional update
 
         alpha: amount of weight on existing knowledge
-        """
-
-        for prop_idx_b, _mass_b in new_frame.get_normalized_dsvector().items():
-
-            # conditional in new_frame on prop_idx_a
-            total = 0
-            for prop_idx_a, mass_a in new_frame.get_normalized_dsvector().items():
 
-                prop_a = new_frame.get_prop_from_dsvector(prop_idx_a)
-                prop_b = new_frame.get_prop_from_dsvector(prop_idx_b)
+        The evidence's normalized masses and plausibilities are computed
+        once and subset tests use DSVector keys (see unsure.cue), so
+        the cost is O(|F|^2) in the number of focal elements of new_frame.
+        """
+        new_frame = _as_boe(new_frame)
+        normalized = new_frame.get_normalized_dsvector()
+        keys = np.fromiter(normalized.keys(), dtype=np.int64, count=len(normalized))
+        evidence = np.array([new_frame.dsvector[key] for key in keys.tolist()])
 
-                mass_b_given_a = 0.0
-                if set(prop_a).issubset(set(prop_b)):
-                    mass_b_given_a = new_frame.conditional_mass(prop_b, prop_a)
+        if new_frame.is_dense:
+            plausibility = new_frame.get_vector("plausibility")[keys]
+        else:
+            overlapping = (keys[:, np.newaxis] & keys[np.newaxis, :]) != 0
+            plausibility = overlapping @ evidence / new_frame.normalizing_constant
 
-                beta = mass_a
-                mult = mass_b_given_a * beta
-                total += mult
+        conditioned = cue.conditioned_masses(
+            keys, evidence[np.newaxis, :], plausibility[np.newaxis, :]
+        )[0]
 
-            prop_b = self.get_prop_from_dsvector(prop_idx_b)
-            current_mass = self.get_normalized_mass(prop_b)
+        for key, total in zip(keys.tolist(), conditioned.tolist()):
+            current_mass = self.dsvector[key] / self.normalizing_constant
             term1 = 0.0
             if not current_mass == 0:
                 term1 = alpha * current_mass
             term2 = (1 - alpha) * total
-            self.set_mass(prop_b, term1 + term2)
+            self.dsvector = (key, term1 + term2)
 
-    def update_stream(self, list_boes, alpha):
+    def update_stream(self, list_boes, alpha, every=1, callback=None):
         """
         CUE update for a list of boes
+
+        Prints the uncertainties before the first and after every
+        `every` updates, or, if a callback is given, calls
+        callback(idx, self) instead of printing.
         """
-        print(f"Unc: {self.get_uncertainties()}")
-        for idx, boe in enumerate(list_boes):
+        if callback is None:
+            print(f"Unc: {self.get_uncertainties()}")
+            for idx, uncertainties in self.update_iter(list_boes, alpha, every):
+                print(f"Unc at [{idx}]: {uncertainties}")
+            return
+
+        for idx, boe in self.update_iter(list_boes, alpha, every, lambda boe: boe):
+            callback(idx, boe)
+
+    def update_iter(self, stream, alpha, every=1, snapshot=None):
+        """
+        CUE update for any iterable (or generator) of boes
+
+        Evidence is consumed one item at a time. A generator that
+        yields (idx, snapshot(self)) after every `every` updates, and
+        after the last one.
+
+        snapshot: function of this BOE, get_uncertainties() by default
+        """
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        if snapshot is None:
+            snapshot = BOE.get_uncertainties
+
+        idx = None
+        last_snapshot = None
+        for idx, boe in enumerate(stream):
             self.update(boe, alpha)
-            print(f"Unc at [{idx}]: {self.get_uncertainties()}")
+            if (idx + 1) % every == 0:
+                last_snapshot = idx
+                yield idx, snapshot(self)
+        if idx is not None and idx != last_snapshot:
+            yield idx, snapshot(self)
 
     # ------------- SPECIALIZED DS HELPERS -------------------------
 
-    def _initialize_power(self):
+    def _check_storage(self):
         """
-        Initializes lookup table called "power".
-        Each index i in this lookup table contains the value 2^i.
-        The lookup table is of size = number of singletons,
-        and represents the position of the singleton masses in massesDSVector
+        Switches between sparse and dense storage when storage="auto"
         """
-        power = []
-        for i in range(len(self.frame)):
-            j = 2**i
-            power.append(j)
-        return power
+        if self._storage != "auto":
+            return
+        size = len(self.frame)
+        count = len(self._dsvector)
+        in_range = self.MIN_DENSE_SINGLETONS <= size <= self.MAX_DENSE_SINGLETONS
+        if self.is_dense:
+            if not in_range or count < self.SPARSE_DENSITY * 2**size:
+                self._dsvector = SparseDSVector(
+                    self._default_mass, self._dsvector.items()
+                )
+        elif in_range and count >= self.DENSE_DENSITY * 2**size:
+            vector = transforms.to_dense(self._dsvector, size, self._dtype)
+            self._dsvector = DenseDSVector(size, vector=vector)
+
+    def _get_dense_normalized(self):
+        """
+        Returns the NORMALIZED masses as a dense vector of length 2^n
+        """
+        if self.is_dense:
+            return self._dsvector.normalized_vector()
+        return transforms.to_dense(
+            self.get_normalized_dsvector(), len(self.frame), self._dtype
+        )
+
+    def _get_dense_fused(self, another_boe, rule):
+        """
+        Returns the fused dense mass vector for a rule in unsure.dense
+        """
+        return dense.RULES[rule](
+            self._get_dense_normalized(), another_boe._get_dense_normalized()
+        )
 
     def _get_index_from_dsvector(self, proposition):
         """
         Returns a DSVector key of a proposition.
         Useful for various operations including setMass, etc.
         Algorithm obtained from Polpitiya paper 2017.
+
+        Lookups are cached on the (shared) frame.
         """
-        proposition = [x.lower() for x in proposition]
-        key = 0
-        for singleton in proposition:
-            try:
-                idx = self.frame.index(singleton)
-                key += self.power[idx]
-            except:
-                raise ValueError(
-                    "One of the singletons in the"
-                    + "proposition is not found in the frame"
-                )
-        return key
+        return self._frame.key(proposition)
 
     def get_prop_from_dsvector(self, index):
         """
         Returns a proposition given a DSVector index
         """
-        indexes = self._find_powers_of_2(index)
-        singletons = [self.frame[i] for i in indexes]
-        return singletons
+        return self._frame.proposition(index)
 
     def _get_subsets_from_dsvector(self, proposition):
         """
@@ -369,8 +706,43 @@ class BOE:
                 overlapping.append(key_proposition)
         return overlapping
 
+    # -------------------- FRAMES -------------------------
+
+    def to_frame(self, frame_map):
+        """
+        Returns the BOE moved to another frame by a FrameMap (see
+        Frame.extension, Frame.refinement, Frame.coarsening), or to a
+        frame holding every singleton of this one (vacuous extension)
+
+        Keys are remapped as arrays; masses sent to the same key add up.
+        """
+        if not isinstance(frame_map, FrameMap):
+            target = Frame(frame_map)
+            if target is self._frame:
+                return self
+            frame_map = self._frame.extension(target)
+        if frame_map.source is not self._frame:
+            raise ValueError("The FrameMap does not start from the frame of the BOE")
+        keys, masses = self.to_arrays()
+        keys, inverse = np.unique(frame_map.keys(keys), return_inverse=True)
+        masses = np.bincount(inverse, weights=masses, minlength=len(keys))
+        return BOE.from_arrays(
+            frame_map.target, keys, masses, dtype=self._dtype, storage=self._storage
+        )
+
+    def align(self, another_boe):
+        """
+        Returns this BOE and another_boe moved to their common frame
+        (see Frame.common), or None if their frames are not compatible
+        """
+        frame = self._frame.common(another_boe.frame)
+        if frame is None:
+            return None
+        return self.to_frame(frame), another_boe.to_frame(frame)
+
     # -------------------- COMBINATION -------------------------
 
+    @_aligned
     def conjunctive_form(self, another_boe, proposition):
         """
         m(self inntersection other_boe)
@@ -379,15 +751,19 @@ class BOE:
             print("Cannot handle non-identical BOEs")
             return None
 
+        key = self._get_index_from_dsvector(proposition)
+        if self.is_dense or another_boe.is_dense:
+            return float(self._get_dense_fused(another_boe, "conjunctive")[key])
+
+        other_dsvector = another_boe.get_normalized_dsvector()
         mass = 0.0
         for index1, mass1 in self.get_normalized_dsvector().items():
-            for index2, mass2 in another_boe.get_normalized_dsvector().items():
-                prop1 = self.get_prop_from_dsvector(index1)
-                prop2 = another_boe.get_prop_from_dsvector(index2)
-                if list(set(prop1) & set(prop2)) == proposition:
+            for index2, mass2 in other_dsvector.items():
+                if index1 & index2 == key:
                     mass += mass1 * mass2
         return mass
 
+    @_aligned
     def disjunctive_form(self, another_boe, proposition):
         """
         m(self union other_boe)
@@ -396,15 +772,19 @@ class BOE:
             print("Cannot handle non-identical BOEs")
             return None
 
+        key = self._get_index_from_dsvector(proposition)
+        if self.is_dense or another_boe.is_dense:
+            return float(self._get_dense_fused(another_boe, "disjunctive")[key])
+
+        other_dsvector = another_boe.get_normalized_dsvector()
         mass = 0.0
         for index1, mass1 in self.get_normalized_dsvector().items():
-            for index2, mass2 in another_boe.get_normalized_dsvector().items():
-                prop1 = self.get_prop_from_dsvector(index1)
-                prop2 = another_boe.get_prop_from_dsvector(index2)
-                if list(set(prop1) | set(prop2)) == proposition:
+            for index2, mass2 in other_dsvector.items():
+                if index1 | index2 == key:
                     mass += mass1 * mass2
         return mass
 
+    @_aligned
     def conflict(self, another_boe):
         """
         K (or conflict) for Combination rules
@@ -419,6 +799,7 @@ class BOE:
 
         return conflict
 
+    @_aligned
     def dcr(self, another_boe, proposition):
         """
         Dempster's rule of combination
@@ -430,13 +811,13 @@ class BOE:
         if proposition == []:
             return 0
 
-        if self.conflict(another_boe) == 1:
+        conflict = self.conflict(another_boe)
+        if conflict == 1:
             return None
 
-        return self.conjunctive_form(another_boe, proposition) / (
-            1 - self.conflict(another_boe)
-        )
+        return self.conjunctive_form(another_boe, proposition) / (1 - conflict)
 
+    @_aligned
     def yager(self, another_boe, proposition):
         """
         Yager Combination rule
@@ -448,13 +829,15 @@ class BOE:
         if proposition == []:
             return 0
 
-        if proposition == another_boe.frame:
+        key = self._get_index_from_dsvector(proposition)
+        if key == self._frame.theta:
             return self.conjunctive_form(another_boe, proposition) + self.conflict(
                 another_boe
             )
 
         return self.conjunctive_form(another_boe, proposition)
 
+    @_aligned
     def dubois_prade(self, another_boe, proposition):
         """
         Dubois and Prade
@@ -470,19 +853,22 @@ class BOE:
             print("Cannot handle non-identical BOEs")
             return None
 
+        key = self._get_index_from_dsvector(proposition)
+        if self.is_dense or another_boe.is_dense:
+            return float(self._get_dense_fused(another_boe, "dubois_prade")[key])
+
         term1 = self.conjunctive_form(another_boe, proposition)
 
+        other_dsvector = another_boe.get_normalized_dsvector()
         term2 = 0.0
         for index1, mass1 in self.get_normalized_dsvector().items():
-            for index2, mass2 in another_boe.get_normalized_dsvector().items():
-                prop1 = self.get_prop_from_dsvector(index1)
-                prop2 = another_boe.get_prop_from_dsvector(index2)
-                if list(set(prop1) | set(prop2)) == proposition:
-                    if list(set(prop1) & set(prop2)) == []:
-                        term2 += mass1 * mass2
+            for index2, mass2 in other_dsvector.items():
+                if index1 | index2 == key and index1 & index2 == 0:
+                    term2 += mass1 * mass2
 
         return term1 + term2
 
+    @_aligned
     def pcr5(self, another_boe, proposition):
         """
         Partial Conflict Redistribution (PCR5)
@@ -501,6 +887,10 @@ class BOE:
             print("Cannot handle non-identical BOEs")
             return None
 
+        if self.is_dense or another_boe.is_dense:
+            key = self._get_index_from_dsvector(proposition)
+            return float(self._get_dense_fused(another_boe, "pcr5")[key])
+
         term1 = self.conjunctive_form(another_boe, proposition)
 
         term2 = 0.0
@@ -543,77 +933,169 @@ class BOE:
 
         return ratio1 + ratio2
 
-    def pcr5_multisource(self, list_boes):
+    def discount(self, reliability):
         """
-        Returns a fused BOE by repeatedly calling pcr5()
+        Returns the BOE discounted by the reliability of its source
+        (Shafer's discounting): masses are scaled by reliability and
+        the rest is moved to the frame. reliability=0 gives ignorance.
+        """
+        if not 0 <= reliability <= 1:
+            raise ValueError("reliability must be between 0 and 1")
+        dsvector = {
+            key: reliability * mass
+            for key, mass in self.get_normalized_dsvector().items()
+        }
+        theta = self._frame.theta
+        dsvector[theta] = dsvector.get(theta, 0) + (1 - reliability)
+        return self._new(dsvector)
 
-        Wickramaratne reports that PCR5 is NOT
-        - associative
-        - idempotent
-        - cannot handle non-exhaustive FoDs.
+    @instrumented("combine")
+    @_aligned
+    def combine(self, another_boe, rule="dcr"):
         """
-        powers = list(self._powerset(self.frame))
+        Returns the fused BOE for a combination rule in a single pass
+        over pairs of focal elements (see unsure.combination).
 
-        boe1 = copy.copy(self)
-        # Doing PCR in pairs
-        for _idx, boe2 in enumerate(list_boes):
-            new_boe = BOE(self.frame)
-            for proposition in powers:
-                new_boe.set_mass(proposition, boe1.pcr5(boe2, proposition))
-            boe1 = new_boe
-        return boe1
+        rule: one of "conjunctive", "disjunctive", "dcr", "yager",
+        "dubois_prade", "pcr5"
 
-    def yager_multisource(self, list_boes):
-        """
-        Returns a fused BOE by repeatedly calling yager()
+        BOEs on compatible frames are combined on their common frame
+        (see align). Returns None if the frames are not compatible or,
+        for "dcr", if the BOEs are in total conflict.
 
+        If either BOE is stored densely, the rule runs vectorized on
+        dense vectors (see unsure.dense).
         """
-        powers = list(self._powerset(self.frame))
+        if self.frame != another_boe.frame:
+            print("Cannot handle non-identical BOEs")
+            return None
+
+        if rule not in combination.RULES:
+            raise ValueError(f"Unknown combination rule: {rule}")
+
+        if self.is_dense or another_boe.is_dense:
+            vector = self._get_dense_fused(another_boe, rule)
+            if np.isnan(vector).any():
+                return None
+            return self._new(vector)
 
-        boe1 = copy.copy(self)
-        # Doing YAGER in pairs
-        for _idx, boe2 in enumerate(list_boes):
-            new_boe = BOE(self.frame)
-            for proposition in powers:
-                new_boe.set_mass(proposition, boe1.yager(boe2, proposition))
-            boe1 = new_boe
+        theta = self._frame.theta
+        dsvector = combination.RULES[rule](
+            self.get_normalized_dsvector(), another_boe.get_normalized_dsvector(), theta
+        )
+        if dsvector is None:
+            return None
+        return self._new(dsvector)
+
+    @instrumented("combine_multisource")
+    def combine_multisource(
+        self, list_boes, rule="dcr", domain="mass", budget=None, method="summarize"
+    ):
+        """
+        Returns a fused BOE by repeatedly calling combine()
+
+        domain: "mass" fuses pair by pair. "commonality" (for the
+        "conjunctive", "dcr" and "disjunctive" rules) multiplies all
+        sources in commonality space and goes back to masses once
+        (see unsure.fusion.CommonalityFusion).
+        budget: when given ("mass" domain), the fused BOE is approximated
+        with method after each step so it keeps at most budget focal
+        elements (see unsure.approximation)
+        """
+        # pylint: disable=too-many-arguments
+        if domain == "commonality":
+            # pylint: disable=import-outside-toplevel
+            from unsure.fusion import CommonalityFusion
+
+            fusion = CommonalityFusion(self.frame, rule, dtype=self._dtype)
+            fusion.add_many([self] + list(list_boes))
+            return fusion.to_boe()
+        if domain != "mass":
+            raise ValueError(f"Unknown fusion domain: {domain}")
+
+        if budget is not None:
+            # pylint: disable=import-outside-toplevel
+            from unsure.approximation import approximate
+
+        boe1 = self
+        for boe2 in list_boes:
+            boe1 = boe1.combine(boe2, rule)
+            if boe1 is None:
+                return None
+            if budget is not None:
+                boe1 = approximate(boe1, budget, method)
         return boe1
 
-    def dcr_multisource(self, list_boes):
+    def conjunctive_multisource(self, list_boes, budget=None):
         """
-        Returns a fused BOE by repeatedly calling dcr()
+        Returns a fused BOE using the unnormalized conjunctive rule
+        """
+        return self.combine_multisource(list_boes, "conjunctive", budget=budget)
 
+    def disjunctive_multisource(self, list_boes, budget=None):
+        """
+        Returns a fused BOE using the disjunctive rule
         """
-        powers = list(self._powerset(self.frame))
+        return self.combine_multisource(list_boes, "disjunctive", budget=budget)
 
-        boe1 = copy.copy(self)
-        # Doing DCR in pairs
-        for _idx, boe2 in enumerate(list_boes):
-            new_boe = BOE(self.frame)
-            for proposition in powers:
-                new_boe.set_mass(proposition, boe1.dcr(boe2, proposition))
-            boe1 = new_boe
-        return boe1
+    def pcr5_multisource(self, list_boes, budget=None):
+        """
+        Returns a fused BOE by repeatedly applying PCR5
 
-    def dubois_prade_multisource(self, list_boes):
+        Wickramaratne reports that PCR5 is NOT
+        - associative
+        - idempotent
+        - cannot handle non-exhaustive FoDs.
+
+        See pcr6_multisource() for an order-independent n-ary version.
         """
-        Returns a fused BOE by repeatedly calling dubois_prade()
+        return self.combine_multisource(list_boes, "pcr5", budget=budget)
 
+    @instrumented("pcr6_multisource")
+    def pcr6_multisource(self, list_boes):
         """
-        powers = list(self._powerset(self.frame))
+        Returns a fused BOE using the n-ary PCR6 rule over
+        this BOE and all BOEs in list_boes at once, on their common
+        frame (see align)
+        """
+        list_boes = [_as_boe(boe) for boe in list_boes]
+        frame = self._frame
+        for boe in list_boes:
+            frame = frame.common(boe.frame)
+            if frame is None:
+                print("Cannot handle non-identical BOEs")
+                return None
 
-        boe1 = copy.copy(self)
-        # Doing Dubois in pairs
-        for _idx, boe2 in enumerate(list_boes):
-            new_boe = BOE(self.frame)
-            for proposition in powers:
-                new_boe.set_mass(proposition, boe1.dubois_prade(boe2, proposition))
-            boe1 = new_boe
-        return boe1
+        boes = [boe.to_frame(frame) for boe in [self, *list_boes]]
+        dsvectors = [boe.get_normalized_dsvector() for boe in boes]
+        return BOE.from_dsvector(
+            frame,
+            combination.pcr6(dsvectors, frame.theta),
+            dtype=self._dtype,
+            storage=self._storage,
+        )
 
+    def yager_multisource(self, list_boes, budget=None):
+        """
+        Returns a fused BOE using Yager's rule
 
+        """
+        return self.combine_multisource(list_boes, "yager", budget=budget)
 
+    def dcr_multisource(self, list_boes, budget=None):
+        """
+        Returns a fused BOE using Dempster's rule
 
+        Returns None if the sources are in total conflict.
+        """
+        return self.combine_multisource(list_boes, "dcr", budget=budget)
+
+    def dubois_prade_multisource(self, list_boes, budget=None):
+        """
+        Returns a fused BOE using Dubois and Prade's rule
+
+        """
+        return self.combine_multisource(list_boes, "dubois_prade", budget=budget)
 
     # ------------- GENERIC HELPERS -------------------------
 
@@ -0,0 +1,398 @@
+"""
+unsure command line
+
+    unsure fuse evidence.jsonl --rule pcr5 -o fused.jsonl
+    cat evidence.jsonl | unsure fuse --alpha 0.5 --grouped
+
+Evidence records are read as a stream:
+
+- jsonl: one {"entity": ..., "frame": [...], "keys": [...],
+  "masses": [...]} object per line (see unsure.serialization.to_json)
+- binary: a little-endian uint32 length, the UTF-8 entity id, then a
+  unsure.serialization.to_bytes record
+
+Results use the same formats. An entity whose evidence is in total
+conflict ("dcr") is written with "total_conflict": true (jsonl) or as
+an empty BOE (binary).
+
+Entities are sharded over a pool of worker processes, each folding the
+evidence of its entities in input order, so every rule and the CUE
+update give the same result as a sequential fold. Queues are bounded,
+so the evidence itself is never buffered, but each worker keeps one
+fused BOE per entity it has seen until the end of the input: memory
+grows with the number of entities. With --grouped (the records of an
+entity are contiguous), each entity is written out and dropped as soon
+as the next one starts, so memory is constant.
+
+If writing the output fails (e.g. a closed pipe) or a worker dies, the
+pool is stopped and the command exits with an error.
+"""
+
+import json
+import multiprocessing
+import os
+import queue
+import struct
+import threading
+import zlib
+
+import click
+
+from unsure import combination, serialization
+from unsure.approximation import approximate
+from unsure.boe import BOE
+
+_LENGTH = struct.Struct("<I")
+_BATCH = 256
+_MISSING = object()
+# Seconds between checks for a failed pool while waiting on a queue
+_POLL = 0.1
+
+
+class _Fuser:
+    """
+    Folds the evidence of a set of entities, in arrival order
+    """
+
+    def __init__(self, rule, alpha, budget):
+        self._rule = rule
+        self._alpha = alpha
+        self._budget = budget
+        self._states = {}
+
+    def add(self, entity, boe):
+        """
+        Fuses one evidence BOE into the state of an entity
+        """
+        state = self._states.get(entity, _MISSING)
+        if state is not _MISSING and state is not None and state.frame != boe.frame:
+            raise ValueError(f"Evidence for {entity} is on different frames")
+        if self._alpha is not None:
+            if state is _MISSING:
+                state = BOE(boe.frame)
+                state.set_mass_theta(1.0)
+            state.update(boe, self._alpha)
+        elif state is _MISSING:
+            state = boe
+        elif state is not None:
+            state = state.combine(boe, self._rule)
+        if state is not None and self._budget is not None:
+            state = approximate(state, self._budget)
+        self._states[entity] = state
+
+    def pop(self, entity):
+        """
+        Returns and forgets the state of an entity
+        """
+        return self._states.pop(entity, None)
+
+    def pop_all(self):
+        """
+        Returns and forgets the states of every entity
+        """
+        states = list(self._states.items())
+        self._states.clear()
+        return states
+
+
+def _format(entity, boe, output_format, uncertainties):
+    """
+    Returns an output record for a fused BOE (None: total conflict)
+    """
+    if output_format == "binary":
+        if boe is None:
+            boe = BOE([])
+        name = entity.encode("utf-8")
+        return _LENGTH.pack(len(name)) + name + serialization.to_bytes(boe)
+    record = {"entity": entity}
+    if boe is None:
+        record["total_conflict"] = True
+    else:
+        record.update(serialization.to_json(boe))
+        if uncertainties:
+            record["uncertainties"] = boe.get_uncertainties()
+    return json.dumps(record) + "\n"
+
+
+def _work(inbox, outbox, options):
+    """
+    Worker process: folds batches of (action, entity, record) messages
+    until None and sends formatted results to outbox
+    """
+    fuser = _Fuser(options["rule"], options["alpha"], options["budget"])
+    error = None
+    while True:
+        batch = inbox.get()
+        if batch is None:
+            break
+        if error is not None:
+            continue
+        try:
+            results = []
+            for action, entity, record in batch:
+                if action == "add":
+                    fuser.add(entity, _parse(record, options["input_format"]))
+                else:
+                    results.append((entity, fuser.pop(entity)))
+            if results:
+                outbox.put(
+                    [
+                        _format(
+                            entity,
+                            boe,
+                            options["output_format"],
+                            options["uncertainties"],
+                        )
+                        for entity, boe in results
+                    ]
+                )
+        except Exception as exception:  # pylint: disable=broad-except
+            error = f"{type(exception).__name__}: {exception}"
+    if error is None:
+        outbox.put(
+            [
+                _format(entity, boe, options["output_format"], options["uncertainties"])
+                for entity, boe in fuser.pop_all()
+            ]
+        )
+    outbox.put(("done", error))
+
+
+def _parse(record, input_format):
+    """
+    Returns the evidence BOE of a raw record
+    """
+    if input_format == "binary":
+        return serialization.from_bytes(record)
+    return serialization.from_json(record)
+
+
+def _read_records(stream, input_format):
+    """
+    Yields (entity, raw record) from an input stream; the record is
+    parsed into a BOE by the workers
+    """
+    if input_format == "binary":
+        while True:
+            prefix = stream.read(_LENGTH.size)
+            if not prefix:
+                return
+            (length,) = _LENGTH.unpack(prefix)
+            entity = stream.read(length).decode("utf-8")
+            record = serialization.read_record(stream)
+            if record is None:
+                raise click.ClickException(f"Truncated record for {entity}")
+            yield entity, record
+    else:
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                entity = str(record.pop("entity"))
+            except (ValueError, KeyError) as error:
+                raise click.ClickException(f"Line {number}: {error}") from error
+            yield entity, record
+
+
+def _shard(entity, workers):
+    """
+    Returns the worker of an entity (stable across processes)
+    """
+    return zlib.crc32(entity.encode("utf-8")) % workers
+
+
+def _run_inline(records, output, options, grouped):
+    """
+    Fuses in the current process
+    """
+    fuser = _Fuser(options["rule"], options["alpha"], options["budget"])
+    current = _MISSING
+
+    def write(entity, boe):
+        output.write(
+            _format(entity, boe, options["output_format"], options["uncertainties"])
+        )
+
+    for entity, record in records:
+        if grouped and current is not _MISSING and entity != current:
+            write(current, fuser.pop(current))
+        current = entity
+        try:
+            fuser.add(entity, _parse(record, options["input_format"]))
+        except ValueError as error:
+            raise click.ClickException(str(error)) from error
+    for entity, boe in fuser.pop_all():
+        write(entity, boe)
+
+
+def _run_pool(records, output, options, grouped, workers):
+    """
+    Fuses over worker processes, one shard of entities per worker
+    """
+    context = multiprocessing.get_context()
+    outbox = context.Queue(maxsize=4 * workers)
+    inboxes = [context.Queue(maxsize=4) for _ in range(workers)]
+    processes = [
+        context.Process(target=_work, args=(inbox, outbox, options), daemon=True)
+        for inbox in inboxes
+    ]
+    for process in processes:
+        process.start()
+
+    errors = []
+    failed = threading.Event()
+
+    def check_workers():
+        # a worker killed before reporting (e.g. out of memory)
+        for process in processes:
+            if process.exitcode not in (None, 0) and not failed.is_set():
+                errors.append(f"Worker exited with code {process.exitcode}")
+                failed.set()
+
+    def write_results():
+        done = 0
+        try:
+            while done < workers and not failed.is_set():
+                try:
+                    message = outbox.get(timeout=_POLL)
+                except queue.Empty:
+                    check_workers()
+                    continue
+                if isinstance(message, tuple):
+                    done += 1
+                    if message[1] is not None:
+                        errors.append(message[1])
+                    continue
+                for line in message:
+                    output.write(line)
+        except Exception as error:  # pylint: disable=broad-except
+            # e.g. a broken pipe or a full disk: stop the pool
+            errors.append(f"{type(error).__name__}: {error}")
+            failed.set()
+
+    def put(shard, message):
+        while not failed.is_set():
+            try:
+                inboxes[shard].put(message, timeout=_POLL)
+                return
+            except queue.Full:
+                check_workers()
+        raise click.ClickException("; ".join(errors))
+
+    writer = threading.Thread(target=write_results, daemon=True)
+    writer.start()
+
+    batches = [[] for _ in range(workers)]
+
+    def send(shard, message):
+        batches[shard].append(message)
+        if len(batches[shard]) >= _BATCH:
+            put(shard, batches[shard])
+            batches[shard] = []
+
+    completed = False
+    try:
+        current = _MISSING
+        for entity, record in records:
+            if grouped and current is not _MISSING and entity != current:
+                send(_shard(current, workers), ("end", current, None))
+            current = entity
+            send(_shard(entity, workers), ("add", entity, record))
+        for shard in range(workers):
+            if batches[shard]:
+                put(shard, batches[shard])
+            put(shard, None)
+        writer.join()
+        completed = not failed.is_set()
+    finally:
+        failed.set()
+        writer.join()
+        for process, inbox in zip(processes, inboxes):
+            if not completed:
+                # messages left for a terminated worker are dropped
+                inbox.cancel_join_thread()
+                process.terminate()
+            process.join()
+    if errors:
+        raise click.ClickException("; ".join(errors))
+
+
+@click.group()
+def main():
+    """
+    UNSURE: Dempster-Shafer evidence fusion
+    """
+
+
+@main.command()
+@click.argument("inputs", nargs=-1, type=click.Path(allow_dash=True))
+@click.option(
+    "--rule",
+    type=click.Choice(sorted(combination.RULES)),
+    default="dcr",
+    show_default=True,
+    help="Combination rule.",
+)
+@click.option("--alpha", type=float, help="Use the CUE update with this alpha.")
+@click.option("--budget", type=int, help="Most focal elements per fused BOE.")
+@click.option("--input-format", type=click.Choice(["jsonl", "binary"]), default="jsonl")
+@click.option(
+    "--output-format", type=click.Choice(["jsonl", "binary"]), default="jsonl"
+)
+@click.option("-o", "--output", type=click.Path(allow_dash=True), default="-")
+@click.option(
+    "--workers",
+    type=int,
+    default=os.cpu_count(),
+    help="Worker processes (0: fuse in this process).",
+)
+@click.option(
+    "--grouped",
+    is_flag=True,
+    help="Records of an entity are contiguous: write each entity once it ends.",
+)
+@click.option(
+    "--uncertainties", is_flag=True, help="Add uncertainty intervals (jsonl)."
+)
+def fuse(
+    inputs,
+    rule,
+    alpha,
+    budget,
+    input_format,
+    output_format,
+    output,
+    workers,
+    grouped,
+    uncertainties,
+):
+    """
+    Fuses evidence records per entity from INPUTS (default: stdin)
+    """
+    # pylint: disable=too-many-arguments
+    options = {
+        "rule": rule,
+        "alpha": alpha,
+        "budget": budget,
+        "input_format": input_format,
+        "output_format": output_format,
+        "uncertainties": uncertainties,
+    }
+    binary = "b" if input_format == "binary" else ""
+
+    def records():
+        for path in inputs or ["-"]:
+            with click.open_file(path, "r" + binary) as stream:
+                yield from _read_records(stream, input_format)
+
+    mode = "wb" if output_format == "binary" else "w"
+    with click.open_file(output, mode) as stream:
+        if workers and workers > 1:
+            _run_pool(records(), stream, options, grouped, workers)
+        else:
+            _run_inline(records(), stream, options, grouped)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,163 @@
+"""
+Whole-distribution combination rules
+
+Each rule makes a single pass over the pairs of focal elements of two
+NORMALIZED DSVectors and returns the complete fused DSVector.
+Propositions are DSVector keys (bitmasks over the frame), so
+intersection and union are just bitwise AND and OR.
+
+All pairwise rules share the signature rule(dsvector1, dsvector2, theta)
+where theta is the DSVector key of the whole frame.
+"""
+
+from itertools import product
+
+
+def conjunctive(dsvector1, dsvector2, theta):
+    """
+    Unnormalized conjunctive rule
+    m(A) = sum of m1(B) * m2(C) over B & C == A
+
+    The conflict is left on key 0 (the empty set).
+    """
+    # pylint: disable=unused-argument
+    fused = {}
+    for key1, mass1 in dsvector1.items():
+        if mass1 == 0:
+            continue
+        for key2, mass2 in dsvector2.items():
+            if mass2 == 0:
+                continue
+            key = key1 & key2
+            fused[key] = fused.get(key, 0.0) + mass1 * mass2
+    return fused
+
+
+def disjunctive(dsvector1, dsvector2, theta):
+    """
+    Disjunctive rule
+    m(A) = sum of m1(B) * m2(C) over B | C == A
+    """
+    # pylint: disable=unused-argument
+    fused = {}
+    for key1, mass1 in dsvector1.items():
+        if mass1 == 0:
+            continue
+        for key2, mass2 in dsvector2.items():
+            if mass2 == 0:
+                continue
+            key = key1 | key2
+            fused[key] = fused.get(key, 0.0) + mass1 * mass2
+    return fused
+
+
+def dcr(dsvector1, dsvector2, theta):
+    """
+    Dempster's rule of combination
+
+    Returns None when the sources are in total conflict.
+    """
+    fused = conjunctive(dsvector1, dsvector2, theta)
+    conflict = fused.pop(0, 0.0)
+    if conflict == 1:
+        return None
+    return {key: mass / (1 - conflict) for key, mass in fused.items()}
+
+
+def yager(dsvector1, dsvector2, theta):
+    """
+    Yager's rule: the conflict is moved to the whole frame
+    """
+    fused = conjunctive(dsvector1, dsvector2, theta)
+    conflict = fused.pop(0, 0.0)
+    if conflict:
+        fused[theta] = fused.get(theta, 0.0) + conflict
+    return fused
+
+
+def dubois_prade(dsvector1, dsvector2, theta):
+    """
+    Dubois and Prade's rule: each partial conflict m1(B) * m2(C)
+    is moved to the union of B and C
+    """
+    # pylint: disable=unused-argument
+    fused = {}
+    for key1, mass1 in dsvector1.items():
+        if mass1 == 0:
+            continue
+        for key2, mass2 in dsvector2.items():
+            if mass2 == 0:
+                continue
+            key = (key1 & key2) or (key1 | key2)
+            fused[key] = fused.get(key, 0.0) + mass1 * mass2
+    fused.pop(0, None)
+    return fused
+
+
+def pcr5(dsvector1, dsvector2, theta):
+    """
+    Proportional Conflict Redistribution (PCR5)
+    Smarandache and Dezert
+
+    Only conflicting pairs of focal elements are visited: each partial
+    conflict m1(X) * m2(Y) (X & Y == 0) goes back to X and Y in
+    proportion to m1(X) and m2(Y).
+    """
+    # pylint: disable=unused-argument
+    fused = {}
+    for key1, mass1 in dsvector1.items():
+        if mass1 == 0:
+            continue
+        for key2, mass2 in dsvector2.items():
+            if mass2 == 0:
+                continue
+            key = key1 & key2
+            if key:
+                fused[key] = fused.get(key, 0.0) + mass1 * mass2
+            else:
+                denominator = mass1 + mass2
+                fused[key1] = fused.get(key1, 0.0) + mass1**2 * mass2 / denominator
+                fused[key2] = fused.get(key2, 0.0) + mass2**2 * mass1 / denominator
+    return fused
+
+
+def pcr6(dsvectors, theta):
+    """
+    n-ary PCR6 (Martin and Osswald)
+
+    For every tuple of focal elements (one per source) with an empty
+    intersection, the conflicting mass m1(X1)...ms(Xs) is given back to
+    each Xi in proportion to mi(Xi). With two sources this is PCR5, but
+    unlike repeated PCR5 it does not depend on the order of the sources.
+
+    Cost is the product of the numbers of focal elements.
+    """
+    focal_elements = [
+        [(key, mass) for key, mass in dsvector.items() if mass != 0]
+        for dsvector in dsvectors
+    ]
+    fused = {}
+    for focal_tuple in product(*focal_elements):
+        key = theta
+        mass = 1.0
+        total = 0.0
+        for key_i, mass_i in focal_tuple:
+            key &= key_i
+            mass *= mass_i
+            total += mass_i
+        if key:
+            fused[key] = fused.get(key, 0.0) + mass
+        else:
+            for key_i, mass_i in focal_tuple:
+                fused[key_i] = fused.get(key_i, 0.0) + mass * mass_i / total
+    return fused
+
+
+RULES = {
+    "conjunctive": conjunctive,
+    "disjunctive": disjunctive,
+    "dcr": dcr,
+    "yager": yager,
+    "dubois_prade": dubois_prade,
+    "pcr5": pcr5,
+}
@@ -0,0 +1,381 @@
+"""
+Compact Bodies of Evidence
+
+CompactBOE is a low-overhead BOE for very large populations of BOEs
+with few focal elements: it has no per-instance __dict__, shares its
+interned Frame by reference and keeps its focal elements in two small
+parallel arrays (DSVector keys and UNNORMALIZED masses).
+
+It has the query and combination methods of BOE. Operations that need
+a full BOE (e.g. update, to_frame) convert through to_boe()/from_boe().
+"""
+
+from array import array
+
+from unsure import combination, transforms
+from unsure.boe import BOE
+from unsure.frame import Frame
+
+
+class CompactBOE:
+    """
+    A BOE stored as parallel key/mass arrays, with __slots__
+    """
+
+    __slots__ = ("_frame", "_keys", "_masses")
+
+    def __init__(self, singletons, keys=(), masses=()):
+        """
+        Constructor
+
+        keys, masses: DSVector keys and UNNORMALIZED masses
+        """
+        self._frame = Frame(singletons)
+        self._keys = array("q", keys)
+        self._masses = array("d", masses)
+        if len(self._keys) != len(self._masses):
+            raise ValueError("keys and masses must have the same length")
+
+    @classmethod
+    def from_dsvector(cls, singletons, dsvector):
+        """
+        Returns a CompactBOE from a DSVector (dict of key: mass)
+        """
+        return cls(singletons, dsvector.keys(), dsvector.values())
+
+    @classmethod
+    def from_boe(cls, boe):
+        """
+        Returns a CompactBOE with the masses of a BOE
+        """
+        keys, masses = boe.to_arrays()
+        return cls(boe.frame, keys.tolist(), masses.tolist())
+
+    def to_boe(self):
+        """
+        Returns a BOE with the same masses
+        """
+        return BOE.from_arrays(self._frame, self._keys, self._masses)
+
+    def to_frame(self, frame_map):
+        """
+        Returns the CompactBOE moved to another frame (see BOE.to_frame)
+        """
+        return CompactBOE.from_boe(self.to_boe().to_frame(frame_map))
+
+    def _new(self, dsvector):
+        """
+        Returns a new CompactBOE on the same frame
+        """
+        return CompactBOE.from_dsvector(self._frame, dsvector)
+
+    def __repr__(self):
+        return f"CompactBOE({list(self._frame)}, {self.dsvector})"
+
+    # -------------------------------------
+    # DS-Theoretic Properties
+
+    @property
+    def frame(self):
+        """
+        Get singletons or FoD or frame
+        """
+        return self._frame
+
+    @property
+    def power(self):
+        """
+        Get power:
+        Lookup table containing keys of singletons in the masses_dsvector
+        """
+        return self._frame.power
+
+    @property
+    def dsvector(self):
+        """
+        Get the DSVector (a new UNNORMALIZED dict of key: mass)
+        """
+        return dict(zip(self._keys, self._masses))
+
+    @dsvector.setter
+    def dsvector(self, value):
+        """
+        Set the mass of a key: compact_boe.dsvector = (key, mass)
+        """
+        key, mass = value
+        for position, existing in enumerate(self._keys):
+            if existing == key:
+                self._masses[position] = mass
+                return
+        self._keys.append(key)
+        self._masses.append(mass)
+
+    @property
+    def normalizing_constant(self):
+        """
+        Returns the sum of masses in the DS-Vector
+        """
+        return sum(self._masses)
+
+    # -------------------------------------
+    # Masses
+
+    def set_mass(self, proposition, mass):
+        """
+        Sets the UNNORMALIZED mass of a proposition
+        """
+        self.dsvector = (self._frame.key(proposition), mass)
+
+    def set_mass_theta(self, mass):
+        """
+        Sets mass for the frame
+        """
+        self.dsvector = (self._frame.theta, mass)
+
+    def get_mass(self, proposition):
+        """
+        Get UNNORMALIZED mass for a proposition or a singleton
+        """
+        key = self._frame.key(proposition)
+        for existing, mass in zip(self._keys, self._masses):
+            if existing == key:
+                return mass
+        return 0
+
+    def get_normalized_mass(self, proposition):
+        """
+        Get normalized mass for a proposition
+        """
+        return self.get_mass(proposition) / self.normalizing_constant
+
+    def get_normalized_dsvector(self):
+        """
+        Returns a dsvector with all the masses normalized
+        """
+        total = self.normalizing_constant
+        if total == 0:
+            return self.dsvector
+        return {key: mass / total for key, mass in zip(self._keys, self._masses)}
+
+    def get_masses(self):
+        """
+        Returns a dict containing proposition and the masses for each
+        """
+        return {
+            str(self._frame.proposition(key)): mass
+            for key, mass in zip(self._keys, self._masses)
+        }
+
+    def get_core(self):
+        """
+        Returns the core (As a list of propositions)
+        """
+        return [self._frame.proposition(key) for key in self._keys]
+
+    def get_vector(self, kind="mass"):
+        """
+        Returns a dense NORMALIZED vector of length 2^n indexed by
+        DSVector keys (see BOE.get_vector)
+        """
+        vector = transforms.to_dense(self.get_normalized_dsvector(), len(self._frame))
+        return transforms.convert(vector, "mass", kind)
+
+    # -------------------------------------
+    # Queries
+
+    def belief(self, proposition):
+        """
+        Returns belief of a proposition
+        """
+        key = self._frame.key(proposition)
+        belief = 0
+        for index, mass in zip(self._keys, self._masses):
+            if index & ~key == 0:
+                belief += mass
+        return belief / self.normalizing_constant
+
+    def plausibility(self, proposition):
+        """
+        Returns plausibility of a proposition
+        """
+        key = self._frame.key(proposition)
+        plausibility = 0
+        for index, mass in zip(self._keys, self._masses):
+            if index & key:
+                plausibility += mass
+        return plausibility / self.normalizing_constant
+
+    def uncertainty(self, proposition):
+        """
+        Returns the uncertainty interval
+
+        [belief, plausibility]
+        """
+        return [self.belief(proposition), self.plausibility(proposition)]
+
+    def get_uncertainties(self):
+        """
+        Returns uncertainty intervals for all items in core
+        """
+        return {
+            str(proposition): self.uncertainty(proposition)
+            for proposition in self.get_core()
+        }
+
+    def update(self, new_frame, alpha):
+        """
+        CUE Algorithm (see BOE.update), in place; new_frame may be a BOE
+        or a CompactBOE
+        """
+        if isinstance(new_frame, CompactBOE):
+            new_frame = new_frame.to_boe()
+        boe = self.to_boe()
+        boe.update(new_frame, alpha)
+        keys, masses = boe.to_arrays()
+        self._keys = array("q", keys.tolist())
+        self._masses = array("d", masses.tolist())
+
+    # -------------------------------------
+    # Combination
+
+    def combine(self, another_boe, rule="dcr"):
+        """
+        Returns the fused CompactBOE for a combination rule (see
+        BOE.combine); another_boe may be a BOE or a CompactBOE
+
+        BOEs on compatible frames are combined on their common frame
+        (see BOE.align). Returns None if the frames are not compatible
+        or, for "dcr", if the BOEs are in total conflict.
+        """
+        if self._frame is not another_boe.frame:
+            frame = self._frame.common(another_boe.frame)
+            if frame is None:
+                print("Cannot handle non-identical BOEs")
+                return None
+            return self.to_frame(frame).combine(another_boe.to_frame(frame), rule)
+        if rule not in combination.RULES:
+            raise ValueError(f"Unknown combination rule: {rule}")
+        dsvector = combination.RULES[rule](
+            self.get_normalized_dsvector(),
+            another_boe.get_normalized_dsvector(),
+            self._frame.theta,
+        )
+        if dsvector is None:
+            return None
+        return self._new(dsvector)
+
+    def combine_multisource(self, list_boes, rule="dcr"):
+        """
+        Returns a fused CompactBOE by repeatedly calling combine()
+        """
+        boe1 = self
+        for boe2 in list_boes:
+            boe1 = boe1.combine(boe2, rule)
+            if boe1 is None:
+                return None
+        return boe1
+
+    def _combined_mass(self, another_boe, proposition, rule):
+        """
+        Returns the fused mass of a proposition for a rule
+        """
+        fused = self.combine(another_boe, rule)
+        if fused is None:
+            return None
+        return fused.get_mass(proposition)
+
+    def conjunctive_form(self, another_boe, proposition):
+        """
+        m(self intersection other_boe)
+        """
+        return self._combined_mass(another_boe, proposition, "conjunctive")
+
+    def disjunctive_form(self, another_boe, proposition):
+        """
+        m(self union other_boe)
+        """
+        return self._combined_mass(another_boe, proposition, "disjunctive")
+
+    def conflict(self, another_boe):
+        """
+        K (or conflict) for Combination rules
+        """
+        return self.conjunctive_form(another_boe, [])
+
+    def dcr(self, another_boe, proposition):
+        """
+        Dempster's rule of combination
+        """
+        return self._combined_mass(another_boe, proposition, "dcr")
+
+    def yager(self, another_boe, proposition):
+        """
+        Yager's rule of combination
+        """
+        return self._combined_mass(another_boe, proposition, "yager")
+
+    def dubois_prade(self, another_boe, proposition):
+        """
+        Dubois and Prade's rule of combination
+        """
+        return self._combined_mass(another_boe, proposition, "dubois_prade")
+
+    def pcr5(self, another_boe, proposition):
+        """
+        PCR5 rule of combination
+        """
+        return self._combined_mass(another_boe, proposition, "pcr5")
+
+    def conjunctive_multisource(self, list_boes):
+        """
+        Returns a fused CompactBOE using the unnormalized conjunctive rule
+        """
+        return self.combine_multisource(list_boes, "conjunctive")
+
+    def disjunctive_multisource(self, list_boes):
+        """
+        Returns a fused CompactBOE using the disjunctive rule
+        """
+        return self.combine_multisource(list_boes, "disjunctive")
+
+    def pcr5_multisource(self, list_boes):
+        """
+        Returns a fused CompactBOE by repeatedly applying PCR5
+        """
+        return self.combine_multisource(list_boes, "pcr5")
+
+    def pcr6_multisource(self, list_boes):
+        """
+        Returns a fused CompactBOE using the n-ary PCR6 rule, on the
+        common frame of the BOEs
+        """
+        frame = self._frame
+        for boe in list_boes:
+            frame = frame.common(boe.frame)
+            if frame is None:
+                print("Cannot handle non-identical BOEs")
+                return None
+        dsvectors = [
+            boe.to_frame(frame).get_normalized_dsvector() for boe in [self, *list_boes]
+        ]
+        return CompactBOE.from_dsvector(frame, combination.pcr6(dsvectors, frame.theta))
+
+    def yager_multisource(self, list_boes):
+        """
+        Returns a fused CompactBOE using Yager's rule
+        """
+        return self.combine_multisource(list_boes, "yager")
+
+    def dcr_multisource(self, list_boes):
+        """
+        Returns a fused CompactBOE using Dempster's rule
+
+        Returns None if the sources are in total conflict.
+        """
+        return self.combine_multisource(list_boes, "dcr")
+
+    def dubois_prade_multisource(self, list_boes):
+        """
+        Returns a fused CompactBOE using Dubois and Prade's rule
+        """
+        return self.combine_multisource(list_boes, "dubois_prade")
@@ -0,0 +1,89 @@
+"""
+Vectorized CUE (Conditional Update Equation) kernels
+
+The mass-based CUE update of BOE.update:
+
+m'(B) = alpha * m(B) + (1 - alpha) * sum over focal A subset of B of
+        m_E(A) * m_E(B | A)
+
+with m_E(B | A) = m_E(B) / (m_E(B) + Pl_E(A)) (see BOE.conditional_mass).
+
+The evidence's normalized masses and plausibilities are computed once,
+subset tests are bitmask arithmetic on DSVector keys, and every kernel
+works on stacked rows so many BOEs are updated at once.
+"""
+
+import numpy as np
+
+from unsure import transforms
+
+
+def conditioned_masses(keys, evidence, plausibility):
+    """
+    Returns sum over focal A subset of B of m_E(A) * m_E(B | A)
+    for every key B, shape (R, K)
+
+    keys: DSVector keys holding every focal element of the evidence, shape (K,)
+    evidence: UNNORMALIZED evidence masses on keys, shape (R, K)
+    plausibility: NORMALIZED evidence plausibility of keys, shape (R, K)
+    """
+    keys = np.asarray(keys, dtype=np.int64)
+    normalized = evidence / evidence.sum(axis=1, keepdims=True)
+
+    # pairs (B, A) with A subset of B
+    columns, subset_columns = np.nonzero(
+        (keys[np.newaxis, :] & ~keys[:, np.newaxis]) == 0
+    )
+    mass_b = evidence[:, columns]
+    mass_a = normalized[:, subset_columns]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = np.where(
+            (mass_b != 0) & (mass_a != 0),
+            mass_a * mass_b / (mass_b + plausibility[:, subset_columns]),
+            0,
+        )
+    conditioned = np.zeros(evidence.shape, dtype=ratios.dtype)
+    np.add.at(conditioned, (slice(None), columns), ratios)
+    return conditioned
+
+
+def apply_update(masses, keys, conditioned, alpha, applies=None):
+    """
+    Writes the CUE update into stacked UNNORMALIZED masses (N, 2^n), in place
+
+    Like BOE.update, keys are updated one after the other and each row
+    is renormalized by its running total.
+
+    applies: (N, K) mask of the keys to update in each row (all by default)
+    """
+    totals = masses.sum(axis=1)
+    for column, key in enumerate(keys):
+        current = masses[:, key] / totals
+        updated = alpha * current + (1 - alpha) * conditioned[:, column]
+        if applies is not None:
+            updated = np.where(applies[:, column], updated, masses[:, key])
+        totals += updated - masses[:, key]
+        masses[:, key] = updated
+
+
+def cue_update(masses, evidence, alpha, order=None):
+    """
+    CUE update of stacked UNNORMALIZED masses (N, 2^n), in place
+
+    evidence: UNNORMALIZED evidence masses, shape (2^n,) or (N, 2^n)
+    order: evidence keys in the order they are applied (BOE.update uses
+    the insertion order of the evidence). When None, each row is updated
+    on the keys where its evidence has mass, in increasing key order.
+    """
+    evidence = np.array(evidence, ndmin=2)
+    if order is None:
+        order = np.flatnonzero(evidence.any(axis=0))
+        applies = evidence[:, order] != 0
+    else:
+        order = np.asarray(order, dtype=np.int64)
+        applies = None
+
+    plausibility = transforms.mass_to_plausibility(evidence)
+    plausibility /= evidence.sum(axis=1, keepdims=True)
+    conditioned = conditioned_masses(order, evidence[:, order], plausibility[:, order])
+    apply_update(masses, order, conditioned, alpha, applies)
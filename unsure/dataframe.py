@@ -0,0 +1,201 @@
+"""
+pandas accessors
+
+Importing this module registers a "unsure" accessor on DataFrames and
+Series. Evidence in long format, one row per (entity, source,
+proposition, mass), is pivoted into dense mass matrices indexed by
+DSVector keys and fused per entity as stacked NumPy arrays (see
+unsure.dense), without building BOE objects:
+
+    import unsure.dataframe  # registers the accessor
+
+    fused = df.unsure.fuse(["a", "b", "c"], rule="pcr5")
+    summary = df.unsure.summarize(["a", "b", "c"], rule="pcr5")
+
+Propositions are lists (or tuples, sets) of singletons, or strings of
+comma-separated singletons ("a" or "a,b").
+"""
+
+import numpy as np
+import pandas as pd
+
+from unsure import decision, dense, transforms
+from unsure.frame import Frame
+
+# Rules for which the vacuous BOE is neutral, so groups with fewer
+# sources can be padded with it
+RULES = ("conjunctive", "dcr", "yager", "dubois_prade", "pcr5")
+
+
+def _as_proposition(value):
+    """
+    Returns a proposition (list of singletons) from a cell
+    """
+    if isinstance(value, str):
+        return [
+            singleton.strip() for singleton in value.split(",") if singleton.strip()
+        ]
+    return list(value)
+
+
+def _label(frame, key):
+    """
+    Returns the comma-separated label of a DSVector key
+    """
+    return ",".join(frame.proposition(key))
+
+
+def to_keys(propositions, singletons):
+    """
+    Returns the DSVector keys of propositions as an array
+    """
+    frame = Frame(singletons)
+    return np.array(
+        [frame.key(_as_proposition(value)) for value in propositions], dtype=np.int64
+    )
+
+
+@pd.api.extensions.register_series_accessor("unsure")
+class UnsureSeriesAccessor:
+    """
+    series.unsure: DSVector keys of a Series of propositions
+    """
+
+    def __init__(self, series):
+        self._series = series
+
+    def keys(self, singletons):
+        """
+        Returns the DSVector keys of the propositions, as a Series
+        """
+        return pd.Series(
+            to_keys(self._series, singletons),
+            index=self._series.index,
+            name=self._series.name,
+        )
+
+
+@pd.api.extensions.register_dataframe_accessor("unsure")
+class UnsureDataFrameAccessor:
+    """
+    df.unsure: grouped evidence fusion of a long-format DataFrame
+    """
+
+    def __init__(self, df):
+        self._df = df
+
+    def masses(
+        self,
+        singletons,
+        by="entity",
+        source="source",
+        proposition="proposition",
+        mass="mass",
+    ):
+        """
+        Returns the UNNORMALIZED masses as a DataFrame indexed by
+        (by, source), with one column per DSVector key (0 .. 2^n - 1)
+
+        Masses of repeated (by, source, proposition) rows are added.
+        """
+        # pylint: disable=too-many-arguments
+        frame = Frame(singletons)
+        long = pd.DataFrame(
+            {
+                by: self._df[by].to_numpy(),
+                source: self._df[source].to_numpy(),
+                "key": to_keys(self._df[proposition], frame),
+                mass: self._df[mass].to_numpy(dtype=float),
+            }
+        )
+        matrix = long.pivot_table(
+            index=[by, source],
+            columns="key",
+            values=mass,
+            aggfunc="sum",
+            fill_value=0.0,
+            sort=False,
+        )
+        return matrix.reindex(columns=range(2 ** len(frame)), fill_value=0.0)
+
+    def fuse(
+        self,
+        singletons,
+        rule="dcr",
+        by="entity",
+        source="source",
+        proposition="proposition",
+        mass="mass",
+    ):
+        """
+        Returns the NORMALIZED fused masses of each group as a DataFrame
+        indexed by the by column, with one column per DSVector key
+
+        Sources are combined in order of appearance. rule: "conjunctive",
+        "dcr", "yager", "dubois_prade" or "pcr5". Groups in total
+        conflict under "dcr" get a row of NaN.
+        """
+        # pylint: disable=too-many-arguments
+        if rule not in RULES:
+            raise ValueError(f"Rule {rule} cannot be fused by the DataFrame accessor")
+        matrix = self.masses(singletons, by, source, proposition, mass)
+        values = matrix.to_numpy(dtype=float)
+        values /= values.sum(axis=1, keepdims=True)
+
+        groups, uniques = pd.factorize(matrix.index.get_level_values(0))
+        positions = pd.Series(groups).groupby(groups).cumcount().to_numpy()
+
+        # step k fuses the k-th source of the groups that have one
+        fused = np.empty((len(uniques), values.shape[1]))
+        first = positions == 0
+        fused[groups[first]] = values[first]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for position in range(1, positions.max() + 1):
+                rows = positions == position
+                targets = groups[rows]
+                fused[targets] = dense.RULES[rule](fused[targets], values[rows])
+        return pd.DataFrame(
+            fused, index=pd.Index(uniques, name=by), columns=matrix.columns
+        )
+
+    def summarize(
+        self,
+        singletons,
+        rule="dcr",
+        propositions=None,
+        by="entity",
+        **columns,
+    ):
+        """
+        Returns belief, plausibility and pignistic probability of
+        propositions (default: the singletons) for every fused group,
+        as a DataFrame indexed by (by, proposition)
+
+        columns: names of the source, proposition and mass columns
+        (see fuse)
+        """
+        frame = Frame(singletons)
+        fused = self.fuse(frame, rule, by=by, **columns)
+        masses = fused.to_numpy()
+        if propositions is None:
+            propositions = [[singleton] for singleton in frame]
+        keys = to_keys(propositions, frame)
+
+        belief = transforms.convert(masses, "mass", "implicability")[:, keys]
+        plausibility = transforms.convert(masses, "mass", "plausibility")[:, keys]
+
+        contains = (np.array(frame.power)[:, np.newaxis] & keys) != 0
+        pignistic = decision.pignistic(masses) @ contains
+
+        index = pd.MultiIndex.from_product(
+            [fused.index, [_label(frame, key) for key in keys]],
+            names=[by, "proposition"],
+        )
+        return pd.DataFrame(
+            {
+                "belief": belief.ravel(),
+                "plausibility": plausibility.ravel(),
+                "pignistic": pignistic.ravel(),
+            },
+            index=index,
+        )
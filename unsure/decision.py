@@ -0,0 +1,157 @@
+"""
+Probability transforms and decisions over the singletons of a frame
+
+The transforms map evidence to one value per singleton in a single
+pass over the focal elements:
+
+- pignistic: BetP(x) = sum of m(A) / |A| over A containing x,
+  over 1 - m(empty)
+- plausibility_transform: Pl({x}) normalized to sum to 1
+- singleton_intervals: [Bel({x}), Pl({x})] for every singleton (Bel
+  includes m(empty), as BOE.belief does)
+
+Evidence is a BOE or CompactBOE, a BOEBatch, a list of BOEs on one
+frame or a dense (..., 2^n) mass array. Results have shape (n,) for a
+single BOE and (N, n) for N BOEs, with columns in frame order, and
+the decision helpers (argmax, top_k, interval_dominance) return
+singleton indices (frame[index] is the singleton) or masks.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from unsure import dense
+from unsure.batch import BOEBatch
+
+
+@lru_cache(maxsize=None)
+def _dense_membership(size):
+    """
+    Returns the (2^size, size) matrix of "singleton i is in key"
+    """
+    return _membership(dense.keys(size), size)
+
+
+def _membership(keys, size):
+    """
+    Returns the (len(keys), size) matrix of "singleton i is in key"
+    """
+    return ((keys[:, np.newaxis] >> np.arange(size)) & 1).astype(float)
+
+
+def _focal(evidence):
+    """
+    Returns the DSVector keys (F,), NORMALIZED masses (..., F) and
+    membership matrix (F, n) of evidence
+    """
+    if isinstance(evidence, (list, tuple)):
+        evidence = BOEBatch.from_boes(evidence)
+    if isinstance(evidence, BOEBatch):
+        size = len(evidence.frame)
+        return (
+            dense.keys(size),
+            evidence.get_normalized_masses(),
+            _dense_membership(size),
+        )
+    if isinstance(evidence, np.ndarray):
+        size = evidence.shape[-1].bit_length() - 1
+        if evidence.shape[-1] != 2**size:
+            raise ValueError("Vector length must be a power of 2")
+        totals = evidence.sum(axis=-1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            masses = np.where(totals != 0, evidence / totals, evidence)
+        return dense.keys(size), masses, _dense_membership(size)
+    normalized = evidence.get_normalized_dsvector()
+    keys = np.fromiter(normalized.keys(), dtype=np.int64, count=len(normalized))
+    masses = np.fromiter(normalized.values(), dtype=float, count=len(normalized))
+    return keys, masses, _membership(keys, len(evidence.frame))
+
+
+def pignistic(evidence):
+    """
+    Returns the pignistic probabilities BetP of the singletons
+
+    Evidence in total conflict (m(empty) = 1) gives NaN.
+    """
+    keys, masses, membership = _focal(evidence)
+    cardinalities = membership.sum(axis=1)
+    cardinalities[keys == 0] = np.inf
+    conflict = masses[..., keys == 0].sum(axis=-1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (masses / cardinalities) @ membership / (1 - conflict)
+
+
+def plausibility_transform(evidence):
+    """
+    Returns the plausibilities of the singletons, normalized to sum to 1
+    (Voorbraak's Bayesian approximation)
+    """
+    _, masses, membership = _focal(evidence)
+    plausibilities = masses @ membership
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return plausibilities / plausibilities.sum(axis=-1, keepdims=True)
+
+
+def singleton_intervals(evidence):
+    """
+    Returns the beliefs and plausibilities of the singletons, as two
+    arrays (same values as BOE.uncertainty([singleton]))
+    """
+    keys, masses, membership = _focal(evidence)
+    # Bel({x}) sums m(empty) and m({x})
+    subsets = membership * (membership.sum(axis=1, keepdims=True) == 1)
+    subsets[keys == 0] = 1
+    return masses @ subsets, masses @ membership
+
+
+def _belief(evidence):
+    return singleton_intervals(evidence)[0]
+
+
+def _plausibility(evidence):
+    return singleton_intervals(evidence)[1]
+
+
+CRITERIA = {
+    "pignistic": pignistic,
+    "plausibility": plausibility_transform,
+    "belief": _belief,
+    "upper": _plausibility,
+}
+
+
+def scores(evidence, criterion="pignistic"):
+    """
+    Returns the score of every singleton for a decision criterion:
+    "pignistic", "plausibility" (plausibility transform), "belief"
+    (pessimistic) or "upper" (plausibility, optimistic)
+    """
+    if criterion not in CRITERIA:
+        raise ValueError(f"Unknown decision criterion: {criterion}")
+    return CRITERIA[criterion](evidence)
+
+
+def argmax(evidence, criterion="pignistic"):
+    """
+    Returns the index of the best singleton (the first one on ties)
+    """
+    return np.argmax(scores(evidence, criterion), axis=-1)
+
+
+def top_k(evidence, k, criterion="pignistic"):
+    """
+    Returns the indices of the k best singletons, best first (by index
+    on ties)
+    """
+    values = scores(evidence, criterion)
+    return np.argsort(-values, axis=-1, kind="stable")[..., :k]
+
+
+def interval_dominance(evidence):
+    """
+    Returns the mask of the singletons not dominated by interval
+    dominance: x is dominated when Bel({y}) > Pl({x}) for some y
+    """
+    beliefs, plausibilities = singleton_intervals(evidence)
+    return plausibilities >= beliefs.max(axis=-1, keepdims=True)
@@ -0,0 +1,171 @@
+"""
+Vectorized combination rules on dense DSVectors
+
+A dense DSVector is a NumPy vector of length 2^n indexed by DSVector
+keys (see unsure.dsvector.DenseDSVector for the BOE storage).
+
+The combination rules mirror unsure.combination, but take dense
+NORMALIZED mass vectors (or stacks of them, shape (..., 2^n)) and run
+as array operations:
+- conjunctive: pointwise product of commonalities
+- disjunctive: pointwise product of implicabilities
+- dubois_prade: adds a rank-wise subset convolution for the disjoint
+  (conflicting) pairs, O(n^2 * 2^n)
+- pcr5: vectorized over the pairs of focal elements
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from unsure import transforms
+
+
+@lru_cache(maxsize=None)
+def keys(size):
+    """
+    Returns the vector of all DSVector keys 0 .. 2^size - 1
+    """
+    return np.arange(2**size)
+
+
+@lru_cache(maxsize=None)
+def cardinalities(size):
+    """
+    Returns the number of singletons in each DSVector key
+    """
+    counts = np.zeros(2**size, dtype=np.int64)
+    for i in range(size):
+        counts[2**i : 2 ** (i + 1)] = counts[: 2**i] + 1
+    return counts
+
+
+def _clean(vector):
+    """
+    Zeroes the round-off left by the transforms, in place
+    """
+    vector[np.abs(vector) <= transforms.TOLERANCE] = 0
+    return vector
+
+
+def conjunctive(mass1, mass2, theta=None):
+    """
+    Unnormalized conjunctive rule (conflict on key 0)
+    """
+    # pylint: disable=unused-argument
+    commonality = transforms.mass_to_commonality(mass1)
+    commonality *= transforms.mass_to_commonality(mass2)
+    return _clean(transforms.commonality_to_mass(commonality))
+
+
+def disjunctive(mass1, mass2, theta=None):
+    """
+    Disjunctive rule
+    """
+    # pylint: disable=unused-argument
+    implicability = transforms.mass_to_implicability(mass1)
+    implicability *= transforms.mass_to_implicability(mass2)
+    return _clean(transforms.implicability_to_mass(implicability))
+
+
+def dcr(mass1, mass2, theta=None):
+    """
+    Dempster's rule of combination
+
+    Vectors in total conflict come out as NaN.
+    """
+    fused = conjunctive(mass1, mass2)
+    conflict = fused[..., :1].copy()
+    fused[..., 0] = 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fused /= 1 - conflict
+    fused[np.broadcast_to(conflict == 1, fused.shape)] = np.nan
+    return fused
+
+
+def yager(mass1, mass2, theta=None):
+    """
+    Yager's rule: the conflict is moved to the whole frame
+    """
+    # pylint: disable=unused-argument
+    fused = conjunctive(mass1, mass2)
+    fused[..., -1] += fused[..., 0]
+    fused[..., 0] = 0
+    return fused
+
+
+def disjoint_union(mass1, mass2):
+    """
+    m(A) = sum of m1(B) * m2(C) over B & C == 0 and B | C == A
+
+    Computed as a subset convolution ranked by cardinality.
+    """
+    mass1, mass2 = np.broadcast_arrays(mass1, mass2)
+    size = mass1.shape[-1].bit_length() - 1
+    cardinality = cardinalities(size)
+    ranked1 = np.stack([np.where(cardinality == k, mass1, 0) for k in range(size + 1)])
+    ranked2 = np.stack([np.where(cardinality == k, mass2, 0) for k in range(size + 1)])
+    ranked1 = transforms.mass_to_implicability(ranked1)
+    ranked2 = transforms.mass_to_implicability(ranked2)
+
+    fused = np.zeros(mass1.shape, dtype=ranked1.dtype)
+    for rank in range(size + 1):
+        convolution = sum(ranked1[k] * ranked2[rank - k] for k in range(rank + 1))
+        convolution = transforms.implicability_to_mass(convolution)
+        fused += np.where(cardinality == rank, convolution, 0)
+    return _clean(fused)
+
+
+def dubois_prade(mass1, mass2, theta=None):
+    """
+    Dubois and Prade's rule: each partial conflict m1(B) * m2(C)
+    is moved to the union of B and C
+    """
+    # pylint: disable=unused-argument
+    fused = conjunctive(mass1, mass2)
+    fused += disjoint_union(mass1, mass2)
+    fused[..., 0] = 0
+    return fused
+
+
+def pcr5(mass1, mass2, theta=None):
+    """
+    Proportional Conflict Redistribution (PCR5)
+
+    Vectorized over the pairs of keys that have mass in any of the vectors.
+    """
+    # pylint: disable=unused-argument
+    mass1, mass2 = np.broadcast_arrays(mass1, mass2)
+    shape = mass1.shape
+    mass1 = mass1.reshape(-1, shape[-1])
+    mass2 = mass2.reshape(-1, shape[-1])
+    keys1 = np.flatnonzero(mass1.any(axis=0))
+    keys2 = np.flatnonzero(mass2.any(axis=0))
+
+    focal1 = mass1[:, keys1, np.newaxis]
+    focal2 = mass2[:, np.newaxis, keys2]
+    products = focal1 * focal2
+    intersections = np.bitwise_and.outer(keys1, keys2)
+    conflicting = intersections == 0
+    denominator = focal1 + focal2
+    redistribute = conflicting & (denominator != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio1 = np.where(redistribute, focal1 * products / denominator, 0)
+        ratio2 = np.where(redistribute, focal2 * products / denominator, 0)
+
+    fused = np.zeros(mass1.shape, dtype=products.dtype)
+    targets = intersections[~conflicting]
+    np.add.at(fused, (slice(None), targets), products[:, ~conflicting])
+    fused[:, keys1] += ratio1.sum(axis=2)
+    fused[:, keys2] += ratio2.sum(axis=1)
+    return fused.reshape(shape)
+
+
+RULES = {
+    "conjunctive": conjunctive,
+    "disjunctive": disjunctive,
+    "dcr": dcr,
+    "yager": yager,
+    "dubois_prade": dubois_prade,
+    "pcr5": pcr5,
+}
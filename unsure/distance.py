@@ -0,0 +1,231 @@
+"""
+Distances and similarities between Bodies of Evidence
+
+- jousselme: Jousselme's distance, sqrt(0.5 (m1 - m2)^T D (m1 - m2))
+  with the Jaccard matrix D(A, B) = |A & B| / |A | B|
+- conflict: the conjunctive conflict K = sum of m1(A) m2(B) over
+  disjoint A and B (not a metric: K(m, m) is usually not 0)
+- pignistic: the pignistic probability distance, max over events A of
+  |BetP1(A) - BetP2(A)| (half the L1 distance of the BetP vectors, see
+  unsure.decision.pignistic)
+
+distance_matrix() computes all the pairwise distances of a pool of
+BOEs on one frame with matrix products over their stacked masses,
+restricted to the union of their focal elements. The Jaccard and
+disjointness matrices of the whole power set are cached per frame
+size, up to MAX_CACHED_MATRIX_SIZE singletons.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from unsure import decision, dense
+from unsure.batch import BOEBatch
+
+# Bound on the number of cached power-set matrices (one per frame size)
+MATRIX_CACHE_SIZE = 8
+# Largest frame whose power-set matrices (2^n x 2^n) are used and cached;
+# beyond it, matrices are built on the focal elements only
+MAX_CACHED_MATRIX_SIZE = 10
+
+
+def _popcount(keys, size):
+    """
+    Returns the number of singletons in each DSVector key
+    """
+    counts = np.zeros(keys.shape, dtype=np.int64)
+    for bit in range(size):
+        counts += (keys >> bit) & 1
+    return counts
+
+
+def _jaccard(keys, size):
+    """
+    Returns the Jaccard matrix between DSVector keys (1 for the
+    empty set with itself)
+    """
+    intersections = _popcount(keys[:, np.newaxis] & keys, size)
+    unions = _popcount(keys[:, np.newaxis] | keys, size)
+    return np.where(unions == 0, 1.0, intersections / np.maximum(unions, 1))
+
+
+@lru_cache(maxsize=MATRIX_CACHE_SIZE)
+def jaccard_matrix(size):
+    """
+    Returns the (2^size, 2^size) read-only Jaccard matrix of the
+    power set of a frame of size singletons
+    """
+    matrix = _jaccard(dense.keys(size), size)
+    matrix.setflags(write=False)
+    return matrix
+
+
+def _disjoint(keys, size):
+    """
+    Returns the matrix of disjoint pairs of DSVector keys (1 or 0)
+    """
+    # pylint: disable=unused-argument
+    return ((keys[:, np.newaxis] & keys) == 0).astype(float)
+
+
+@lru_cache(maxsize=MATRIX_CACHE_SIZE)
+def disjoint_matrix(size):
+    """
+    Returns the (2^size, 2^size) read-only matrix of disjoint pairs
+    of keys of the power set of a frame of size singletons
+    """
+    matrix = _disjoint(dense.keys(size), size)
+    matrix.setflags(write=False)
+    return matrix
+
+
+def _stack(list_boes):
+    """
+    Returns the DSVector keys (F,), NORMALIZED masses (N, F) and frame
+    size of a pool of BOEs (a list of BOEs, a BOEBatch or a dense
+    (N, 2^n) mass array), keys being the union of the focal elements
+    """
+    if isinstance(list_boes, (np.ndarray, BOEBatch)):
+        if isinstance(list_boes, BOEBatch):
+            size = len(list_boes.frame)
+            masses = list_boes.get_normalized_masses()
+        else:
+            size = list_boes.shape[-1].bit_length() - 1
+            if list_boes.shape[-1] != 2**size:
+                raise ValueError("Vector length must be a power of 2")
+            totals = list_boes.sum(axis=-1, keepdims=True)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                masses = np.where(totals != 0, list_boes / totals, list_boes)
+        keys = np.flatnonzero(masses.any(axis=0))
+        if len(keys) == 2**size:
+            return dense.keys(size), masses, size
+        return keys, masses[:, keys], size
+
+    frame = list_boes[0].frame
+    dsvectors = []
+    for boe in list_boes:
+        if boe.frame != frame:
+            raise ValueError("All BOEs must share the same frame")
+        dsvectors.append(boe.get_normalized_dsvector())
+    size = len(frame)
+    keys = np.array(sorted(set().union(*dsvectors)), dtype=np.int64)
+    if len(keys) == 2**size:
+        keys = dense.keys(size)
+    columns = {key: column for column, key in enumerate(keys.tolist())}
+    masses = np.zeros((len(dsvectors), len(keys)))
+    for row, dsvector in enumerate(dsvectors):
+        for key, mass in dsvector.items():
+            masses[row, columns[key]] = mass
+    return keys, masses, size
+
+
+def _matrix(keys, size, full, partial):
+    """
+    Returns a cached power-set matrix when keys is the whole power set
+    of a small frame, or the matrix restricted to keys
+    """
+    if len(keys) == 2**size and size <= MAX_CACHED_MATRIX_SIZE:
+        return full(size)
+    return partial(keys, size)
+
+
+def _jousselme(keys, masses, size):
+    """
+    Pairwise Jousselme distances, from the Gram matrix m_i^T D m_j
+    """
+    jaccard = _matrix(keys, size, jaccard_matrix, _jaccard)
+    gram = masses @ jaccard @ masses.T
+    norms = np.diag(gram)
+    squared = 0.5 * (norms[:, np.newaxis] + norms[np.newaxis, :] - 2 * gram)
+    return np.sqrt(np.clip(squared, 0, None))
+
+
+def _conflict(keys, masses, size):
+    """
+    Pairwise conjunctive conflicts
+    """
+    disjoint = _matrix(keys, size, disjoint_matrix, _disjoint)
+    return masses @ disjoint @ masses.T
+
+
+def _pignistic(keys, masses, size):
+    """
+    Pairwise pignistic probability distances
+    """
+    if len(keys) == 2**size:
+        vectors = masses
+    else:
+        vectors = np.zeros((len(masses), 2**size))
+        vectors[:, keys] = masses
+    probabilities = decision.pignistic(vectors)
+    return 0.5 * np.abs(
+        probabilities[:, np.newaxis, :] - probabilities[np.newaxis, :, :]
+    ).sum(axis=-1)
+
+
+METRICS = {
+    "jousselme": _jousselme,
+    "conflict": _conflict,
+    "pignistic": _pignistic,
+}
+
+
+def distance_matrix(list_boes, metric="jousselme"):
+    """
+    Returns the (N, N) matrix of pairwise distances of N BOEs on one
+    frame (a list of BOEs, a BOEBatch or a dense (N, 2^n) mass array)
+
+    metric: "jousselme", "conflict" or "pignistic"
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown distance: {metric}")
+    return METRICS[metric](*_stack(list_boes))
+
+
+def similarity_matrix(list_boes, metric="jousselme"):
+    """
+    Returns the (N, N) matrix of pairwise similarities (1 - distance)
+    """
+    return 1 - distance_matrix(list_boes, metric)
+
+
+def credibility(list_boes, metric="jousselme"):
+    """
+    Returns the credibility of each BOE: its total similarity to the
+    other BOEs, normalized to sum to 1 (Deng's weighting of sources)
+    """
+    similarities = similarity_matrix(list_boes, metric)
+    support = similarities.sum(axis=1) - np.diag(similarities)
+    total = support.sum()
+    if total == 0:
+        return np.full(len(support), 1 / len(support))
+    return support / total
+
+
+def distance(boe1, boe2, metric="jousselme"):
+    """
+    Returns the distance between two BOEs on the same frame
+    """
+    return float(distance_matrix([boe1, boe2], metric)[0, 1])
+
+
+def jousselme(boe1, boe2):
+    """
+    Returns Jousselme's distance between two BOEs
+    """
+    return distance(boe1, boe2, "jousselme")
+
+
+def conflict(boe1, boe2):
+    """
+    Returns the conjunctive conflict between two BOEs
+    """
+    return distance(boe1, boe2, "conflict")
+
+
+def pignistic(boe1, boe2):
+    """
+    Returns the pignistic probability distance between two BOEs
+    """
+    return distance(boe1, boe2, "pignistic")
@@ -0,0 +1,246 @@
+"""
+DSVector storage
+
+A DSVector maps DSVector keys to UNNORMALIZED masses. Both storages
+keep the normalizing constant up to date as masses are written (O(1)
+per write) and cache the normalized view until the next write, so
+repeated normalized reads cost O(1) per entry instead of re-summing.
+
+- SparseDSVector: defaultdict keyed by int, for few focal elements
+- DenseDSVector: NumPy vector of length 2^n, for many focal elements
+
+Both expose total(), normalized() and a version counter that is bumped
+whenever a mass changes.
+"""
+
+from collections import defaultdict
+from collections.abc import MutableMapping
+from types import MappingProxyType
+
+import numpy as np
+
+
+class SparseDSVector(defaultdict):
+    """
+    A defaultdict DSVector that maintains its total incrementally
+
+    Reading a missing key still inserts it with mass 0, as the plain
+    defaultdict did.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Constructor (same arguments as defaultdict)
+        """
+        super().__init__(*args, **kwargs)
+        self._total = sum(dict.values(self))
+        self._normalized = None
+        self.version = 0
+
+    def __setitem__(self, key, mass):
+        old_mass = dict.get(self, key, 0)
+        dict.__setitem__(self, key, mass)
+        if mass == old_mass:
+            # total unchanged, but a new (zero) key is not in the view yet
+            if self._normalized is not None and key not in self._normalized:
+                self._normalized = None
+            return
+        self._total += mass - old_mass
+        self._changed()
+
+    def __delitem__(self, key):
+        old_mass = dict.pop(self, key)
+        self._total -= old_mass
+        self._changed()
+
+    def _changed(self):
+        """
+        Invalidates the normalized view after a write
+        """
+        self._normalized = None
+        self.version += 1
+
+    def _normalize(self, mass):
+        """
+        Returns a mass divided by the normalizing constant (if non-zero)
+        """
+        return mass / self._total if self._total != 0 else mass
+
+    def update(self, *args, **kwargs):
+        for key, mass in dict(*args, **kwargs).items():
+            self[key] = mass
+
+    def setdefault(self, key, default=0):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *default):
+        if key not in self:
+            return dict.pop(self, key, *default)
+        mass = self[key]
+        del self[key]
+        return mass
+
+    def popitem(self):
+        key, mass = dict.popitem(self)
+        self._total -= mass
+        self._changed()
+        return key, mass
+
+    def clear(self):
+        dict.clear(self)
+        self._total = 0
+        self._changed()
+
+    def copy(self):
+        return SparseDSVector(self.default_factory, self)
+
+    def __copy__(self):
+        return self.copy()
+
+    def total(self):
+        """
+        Returns the sum of the masses
+        """
+        return self._total
+
+    def normalized(self):
+        """
+        Returns a read-only view of the NORMALIZED masses
+        (rebuilt only after a write)
+        """
+        if self._normalized is None:
+            # resync the running total to avoid accumulating round-off
+            self._total = sum(dict.values(self))
+            self._normalized = {
+                key: self._normalize(mass) for key, mass in dict.items(self)
+            }
+        return MappingProxyType(self._normalized)
+
+
+class DenseDSVector(MutableMapping):
+    """
+    A DSVector backed by a dense NumPy vector of length 2^n
+
+    Reading a missing key returns 0 (like the sparse defaultdict) and
+    iteration only visits keys with non-zero mass.
+
+    Write masses through the mapping; after writing to .vector
+    directly, call refresh().
+
+    With shared=True, the vector may also be written by others (e.g. a
+    memory-mapped row written by BOEStore.put): the count, total and
+    normalized view are then recomputed on every read, and the version
+    changes on every read so that BOE caches are never reused.
+    """
+
+    def __init__(self, size, dtype=np.float64, vector=None, shared=False):
+        """
+        Constructor
+        """
+        if vector is None:
+            vector = np.zeros(2**size, dtype=dtype)
+        self.vector = vector
+        self.shared = shared
+        self._version = 0
+        self.refresh()
+
+    @property
+    def version(self):
+        """
+        Get the version counter (bumped whenever a mass changes)
+        """
+        if self.shared:
+            self._version += 1
+        return self._version
+
+    def refresh(self):
+        """
+        Recomputes the count and total of the vector and drops the
+        normalized view
+        """
+        self._count = int(np.count_nonzero(self.vector))
+        self._total = float(self.vector.sum())
+        self._normalized = None
+        self._normalized_dsvector = None
+        self._version += 1
+
+    def __getitem__(self, key):
+        return float(self.vector[key])
+
+    def __setitem__(self, key, mass):
+        old_mass = self.vector[key]
+        self.vector[key] = mass
+        new_mass = self.vector[key]
+        if new_mass == old_mass:
+            return
+        self._count += int(new_mass != 0) - int(old_mass != 0)
+        self._total += float(new_mass) - float(old_mass)
+        self._normalized = None
+        self._normalized_dsvector = None
+        self._version += 1
+
+    def __delitem__(self, key):
+        self[key] = 0
+
+    def __contains__(self, key):
+        return 0 <= key < len(self.vector) and self.vector[key] != 0
+
+    def __iter__(self):
+        return (int(key) for key in np.flatnonzero(self.vector))
+
+    def __len__(self):
+        if self.shared:
+            return int(np.count_nonzero(self.vector))
+        return self._count
+
+    def __repr__(self):
+        return f"DenseDSVector({dict(self.items())})"
+
+    def items(self):
+        keys = np.flatnonzero(self.vector)
+        return zip(keys.tolist(), self.vector[keys].tolist())
+
+    def values(self):
+        return self.vector[np.flatnonzero(self.vector)].tolist()
+
+    def copy(self):
+        """
+        Returns a copy that does not share the vector
+        """
+        return DenseDSVector(0, vector=self.vector.copy())
+
+    def total(self):
+        """
+        Returns the sum of the masses
+        """
+        if self.shared:
+            return float(self.vector.sum())
+        return self._total
+
+    def normalized_vector(self):
+        """
+        Returns a read-only dense vector of the NORMALIZED masses
+        (rebuilt only after a write)
+        """
+        if self._normalized is None or self.shared:
+            self._total = float(self.vector.sum())
+            if self._total != 0:
+                normalized = self.vector / self.vector.dtype.type(self._total)
+            else:
+                normalized = self.vector.copy()
+            normalized.flags.writeable = False
+            self._normalized = normalized
+        return self._normalized
+
+    def normalized(self):
+        """
+        Returns a read-only view of the NORMALIZED non-zero masses
+        (rebuilt only after a write)
+        """
+        if self._normalized_dsvector is None or self.shared:
+            vector = self.normalized_vector()
+            keys = np.flatnonzero(vector)
+            self._normalized_dsvector = dict(zip(keys.tolist(), vector[keys].tolist()))
+        return MappingProxyType(self._normalized_dsvector)
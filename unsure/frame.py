@@ -0,0 +1,364 @@
+# pylint: disable=no-member
+"""
+Frame of Discernment
+
+A Frame is immutable and interned: building a Frame twice from the same
+(lowercased) singletons returns the same object, so every BOE on that
+frame shares its lookup tables and two frames are equal exactly when
+they are the same object.
+
+A Frame still behaves like the list of singletons it replaces
+(len, indexing, iteration, index, comparison with a list).
+
+BOEs move between frames through FrameMaps, cached per pair of frames:
+a DSVector key goes to the union of the images of its singletons, so a
+whole DSVector is remapped with a few bit operations per singleton.
+- reordering: the same singletons in another order
+- extension: the vacuous (minimal commitment) extension to a frame
+  with more singletons, every non-empty focal element A going to A
+  plus the new singletons
+- refinement / coarsening: to a finer frame splitting each singleton
+  into several, and back (outer reduction)
+"""
+
+from functools import lru_cache
+from threading import Lock
+from weakref import WeakValueDictionary
+
+import numpy as np
+
+from unsure import dense
+
+# Bound on the number of cached FrameMaps
+MAX_CACHED_MAPS = 256
+
+
+class Frame:
+    """
+    An immutable, interned Frame of Discernment (list of singletons)
+    """
+
+    __slots__ = (
+        "_singletons",
+        "_positions",
+        "_bits",
+        "_power",
+        "_theta",
+        "_keys",
+        "_propositions",
+        "__weakref__",
+    )
+
+    # Bound on the number of cached proposition <-> key lookups
+    MAX_CACHED_PROPOSITIONS = 2**16
+
+    _interned = WeakValueDictionary()  # type: WeakValueDictionary[tuple, Frame]
+    _lock = Lock()
+
+    def __new__(cls, singletons):
+        if isinstance(singletons, Frame):
+            return singletons
+        singletons = tuple(x.lower() for x in singletons)
+        with cls._lock:
+            frame = cls._interned.get(singletons)
+            if frame is None:
+                frame = super().__new__(cls)
+                frame._initialize(singletons)
+                cls._interned[singletons] = frame
+        return frame
+
+    def _initialize(self, singletons):
+        """
+        Builds the lookup tables (only called once per interned frame)
+        """
+        power = tuple(2**i for i in range(len(singletons)))
+        set_attribute = object.__setattr__
+        set_attribute(self, "_singletons", singletons)
+        set_attribute(
+            self, "_positions", {singleton: i for i, singleton in enumerate(singletons)}
+        )
+        set_attribute(self, "_bits", dict(zip(singletons, power)))
+        set_attribute(self, "_power", power)
+        set_attribute(self, "_theta", 2 ** len(singletons) - 1)
+        set_attribute(self, "_keys", {})
+        set_attribute(self, "_propositions", {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Frame is immutable")
+
+    def __reduce__(self):
+        # unpickling goes through __new__ and so is interned again
+        return (Frame, (self._singletons,))
+
+    # -------------------------------------
+    # Sequence of singletons
+
+    def __len__(self):
+        return len(self._singletons)
+
+    def __getitem__(self, index):
+        return self._singletons[index]
+
+    def __iter__(self):
+        return iter(self._singletons)
+
+    def __contains__(self, singleton):
+        return singleton in self._bits
+
+    def __eq__(self, other):
+        if isinstance(other, Frame):
+            return self is other
+        if isinstance(other, (list, tuple)):
+            return self._singletons == tuple(other)
+        return NotImplemented
+
+    __hash__ = object.__hash__
+
+    def __repr__(self):
+        return f"Frame({list(self._singletons)})"
+
+    def index(self, singleton):
+        """
+        Returns the position of a singleton
+        """
+        try:
+            return self._positions[singleton]
+        except KeyError as error:
+            raise ValueError(f"{singleton!r} is not in the frame") from error
+
+    @property
+    def singletons(self):
+        """
+        Get the tuple of lowercased singletons
+        """
+        return self._singletons
+
+    # -------------------------------------
+    # DSVector keys
+
+    @property
+    def power(self):
+        """
+        Get power:
+        Lookup table containing keys of singletons in the masses_dsvector
+        """
+        return list(self._power)
+
+    @property
+    def theta(self):
+        """
+        Get the DSVector key of the whole frame
+        """
+        return self._theta
+
+    @property
+    def keys(self):
+        """
+        Get the vector of all DSVector keys 0 .. 2^n - 1
+        """
+        return dense.keys(len(self))
+
+    @property
+    def cardinalities(self):
+        """
+        Get the popcount of every DSVector key
+        """
+        return dense.cardinalities(len(self))
+
+    def compatible(self, other):
+        """
+        True if BOEs on the two frames can be combined (see common)
+        """
+        return self.common(other) is not None
+
+    def key(self, proposition):
+        """
+        Returns the DSVector key of a proposition (list of singletons)
+        """
+        proposition = tuple(proposition)
+        key = self._keys.get(proposition)
+        if key is None:
+            key = 0
+            for singleton in proposition:
+                try:
+                    key |= self._bits[singleton.lower()]
+                except KeyError as error:
+                    raise ValueError(
+                        "One of the singletons in the"
+                        + "proposition is not found in the frame"
+                    ) from error
+            if len(self._keys) >= self.MAX_CACHED_PROPOSITIONS:
+                self._keys.clear()
+            self._keys[proposition] = key
+        return key
+
+    def proposition(self, key):
+        """
+        Returns the proposition (list of singletons) of a DSVector key
+        """
+        proposition = self._propositions.get(key)
+        if proposition is None:
+            proposition = tuple(
+                singleton
+                for singleton, bit in zip(self._singletons, self._power)
+                if key & bit
+            )
+            if len(self._propositions) >= self.MAX_CACHED_PROPOSITIONS:
+                self._propositions.clear()
+            self._propositions[key] = proposition
+        return list(proposition)
+
+    def powerset(self):
+        """
+        Returns every proposition of the frame, ordered by DSVector key
+        """
+        return [self.proposition(key) for key in range(self._theta + 1)]
+
+    # -------------------------------------
+    # Maps between frames
+
+    def common(self, other):
+        """
+        Returns the frame on which BOEs of both frames are combined: this
+        frame if other has the same or fewer singletons, other if it has
+        more, or None if neither frame holds all singletons of the other
+        """
+        other = Frame(other)
+        if self is other:
+            return self
+        singletons, others = set(self._singletons), set(other.singletons)
+        if others <= singletons:
+            return self
+        if singletons <= others:
+            return other
+        return None
+
+    def reordering(self, other):
+        """
+        Returns the FrameMap to a frame with the same singletons
+        """
+        other = Frame(other)
+        if set(self._singletons) != set(other.singletons):
+            raise ValueError("The frames do not have the same singletons")
+        return _frame_map(self, other, None)
+
+    def extension(self, larger):
+        """
+        Returns the FrameMap of the vacuous extension to a frame holding
+        every singleton of this frame (a reordering if it holds no other)
+        """
+        larger = Frame(larger)
+        if not set(self._singletons) <= set(larger.singletons):
+            raise ValueError("The frame does not hold every singleton")
+        return _frame_map(self, larger, None)
+
+    def refinement(self, finer, mapping):
+        """
+        Returns the FrameMap to a finer frame
+
+        mapping: dict of singleton of this frame: singletons of finer it
+        is split into (the splits must partition finer)
+        """
+        finer = Frame(finer)
+        return _frame_map(self, finer, _partition(self, finer, mapping))
+
+    def coarsening(self, coarser, mapping):
+        """
+        Returns the FrameMap to a coarser frame (outer reduction: a key
+        goes to the smallest coarse proposition containing it)
+
+        mapping: dict of singleton of coarser: singletons of this frame it
+        is split into (see refinement)
+        """
+        coarser = Frame(coarser)
+        partition = _partition(coarser, self, mapping)
+        images = [0] * len(self)
+        for bit, split in zip(coarser.power, partition):
+            for index in range(len(self)):
+                if split & 2**index:
+                    images[index] = bit
+        return _frame_map(self, coarser, tuple(images))
+
+
+def _partition(coarse, fine, mapping):
+    """
+    Returns the fine key of the split of each coarse singleton, checking
+    that the splits partition the fine frame
+    """
+    mapping = {singleton.lower(): split for singleton, split in mapping.items()}
+    if set(mapping) != set(coarse.singletons):
+        raise ValueError("The mapping must split every singleton of the frame")
+    splits = tuple(fine.key(mapping[singleton]) for singleton in coarse)
+    union = 0
+    for split in splits:
+        if split == 0 or split & union:
+            raise ValueError("The splits must be non-empty and disjoint")
+        union |= split
+    if union != fine.theta:
+        raise ValueError("The splits must cover the finer frame")
+    return splits
+
+
+@lru_cache(maxsize=MAX_CACHED_MAPS)
+def _frame_map(source, target, images):
+    """
+    Returns the (cached) FrameMap of images from source to target
+
+    images: None (every singleton to itself, with the other singletons
+    of target as extra) or a tuple of target keys of the singletons of
+    source
+    """
+    if images is None:
+        images = tuple(target.key([singleton]) for singleton in source)
+        union = 0
+        for image in images:
+            union |= image
+        return FrameMap(source, target, images, target.theta & ~union)
+    return FrameMap(source, target, images)
+
+
+class FrameMap:
+    """
+    A map of DSVector keys from a source frame to a target frame: a key
+    goes to the union of the images of its singletons, plus extra for
+    the non-empty keys
+    """
+
+    __slots__ = ("source", "target", "images", "extra", "_images")
+
+    def __init__(self, source, target, images, extra=0):
+        """
+        Constructor
+
+        images: target key of each singleton of source
+        """
+        self.source = source
+        self.target = target
+        self.images = tuple(images)
+        self.extra = extra
+        self._images = np.array(self.images, dtype=np.int64)
+
+    def __repr__(self):
+        return f"FrameMap({list(self.source)} -> {list(self.target)})"
+
+    def key(self, key):
+        """
+        Returns the target key of a source key
+        """
+        if key == 0:
+            return 0
+        mapped = self.extra
+        for index, image in enumerate(self.images):
+            if key >> index & 1:
+                mapped |= image
+        return mapped
+
+    def keys(self, keys):
+        """
+        Returns the target keys of an array of source keys
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        mapped = np.where(keys != 0, self.extra, 0)
+        for index, image in enumerate(self._images):
+            mapped |= np.where(keys >> index & 1, image, 0)
+        return mapped
@@ -0,0 +1,410 @@
+"""
+Stateful fusion
+
+CommonalityFusion keeps the running result of a conjunctive (or
+Dempster) fusion as a commonality vector, where combining one more
+source is a pointwise product, O(2^n). Disjunctive fusion works the
+same way on implicabilities. Masses are only rebuilt (one Mobius
+transform) when a query needs them.
+
+WindowedFusion adds removal of expired sources (sliding windows), and
+DecayFusion fades old evidence for rules that cannot remove it.
+"""
+
+from collections import deque
+import time
+
+import numpy as np
+
+from unsure import combination, transforms
+from unsure.boe import BOE
+from unsure.frame import Frame
+
+# rule: (representation, Dempster normalization)
+DOMAINS = {
+    "conjunctive": ("commonality", False),
+    "dcr": ("commonality", True),
+    "disjunctive": ("implicability", False),
+}
+
+
+class CommonalityFusion:
+    """
+    Running n-source fusion held in commonality (or implicability) space
+    """
+
+    def __init__(self, singletons, rule="dcr", log=False, dtype="float64"):
+        """
+        Constructor
+
+        rule: "conjunctive", "dcr" or "disjunctive"
+        log: keep the log of the state (sums instead of products),
+        which avoids underflow when fusing many sources
+        """
+        if rule not in DOMAINS:
+            raise ValueError(f"Rule {rule} cannot be fused in commonality space")
+        self._frame = Frame(singletons)
+        self._rule = rule
+        self._representation, self._normalize = DOMAINS[rule]
+        self._log = log
+        self._dtype = np.dtype(dtype)
+        self.clear()
+
+    def clear(self):
+        """
+        Resets to the neutral element (no source fused yet)
+        """
+        # the vacuous BOE (conjunctive) and m(empty) = 1 (disjunctive)
+        # are both 1 everywhere
+        fill = 0.0 if self._log else 1.0
+        self._state = np.full(2 ** len(self._frame), fill, dtype=self._dtype)
+        self._count = 0
+        self._mass = None
+
+    # -------------------------------------
+    # Properties
+
+    @property
+    def frame(self):
+        """
+        Get the frame
+        """
+        return self._frame
+
+    @property
+    def rule(self):
+        """
+        Get the combination rule
+        """
+        return self._rule
+
+    @property
+    def count(self):
+        """
+        Get the number of sources fused so far
+        """
+        return self._count
+
+    @property
+    def state(self):
+        """
+        Get the running commonality (implicability for "disjunctive")
+        vector, or its log
+        """
+        return self._state
+
+    # -------------------------------------
+    # Fusion
+
+    def _transform(self, list_boes):
+        """
+        Returns the stacked commonalities (or implicabilities) of BOEs,
+        or their logs
+        """
+        masses = np.zeros((len(list_boes), len(self._state)), dtype=self._dtype)
+        for row, boe in enumerate(list_boes):
+            if self._frame != boe.frame:
+                raise ValueError("Cannot handle non-identical BOEs")
+            for key, mass in boe.get_normalized_dsvector().items():
+                masses[row, key] = mass
+        vectors = transforms.convert(masses, "mass", self._representation)
+        if self._log:
+            with np.errstate(divide="ignore"):
+                return np.log(np.maximum(vectors, 0))
+        return vectors
+
+    def add(self, boe):
+        """
+        Fuses one more source, O(2^n)
+        """
+        self.add_many([boe])
+
+    def add_many(self, list_boes):
+        """
+        Fuses several sources at once
+        """
+        if not list_boes:
+            return
+        vectors = self._transform(list_boes)
+        if self._log:
+            self._state += vectors.sum(axis=0)
+        else:
+            self._state *= vectors.prod(axis=0)
+        self._count += len(list_boes)
+        self._mass = None
+
+    # -------------------------------------
+    # Queries
+
+    def get_vector(self):
+        """
+        Returns the fused dense mass vector, or None if the sources are
+        in total conflict under Dempster's rule
+
+        The Mobius transform runs once per batch of additions.
+        """
+        if self._mass is None:
+            state = self._state
+            with np.errstate(invalid="ignore"):
+                if self._log and self._normalize:
+                    # Dempster's rule does not change if q is rescaled, and
+                    # q(empty) only feeds m(empty), which is dropped
+                    state = np.exp(state - np.max(state[1:]))
+                    state[0] = 0
+                elif self._log:
+                    state = np.exp(state)
+            mass = transforms.convert(state, self._representation, "mass")
+            if self._normalize:
+                mass[0] = 0
+                total = mass.sum()
+                if not total > 0:
+                    return None
+                mass /= total
+            scale = np.abs(mass).max()
+            mass[np.abs(mass) <= transforms.TOLERANCE * scale] = 0
+            self._mass = mass
+        return self._mass
+
+    def to_boe(self):
+        """
+        Returns the fused BOE, or None if the sources are in total
+        conflict under Dempster's rule
+        """
+        mass = self.get_vector()
+        if mass is None:
+            return None
+        return BOE.from_vector(self._frame, mass, dtype=self._dtype)
+
+    def uncertainty(self, proposition):
+        """
+        Returns the uncertainty interval [belief, plausibility]
+        of the fused BOE
+        """
+        return self.to_boe().uncertainty(proposition)
+
+
+class WindowedFusion(CommonalityFusion):
+    """
+    Fusion over a sliding window of the most recent sources
+
+    The state is a log-commonality (log-implicability for "disjunctive")
+    vector plus, for every key, the count of sources whose commonality
+    is zero there. Both are sums over the sources, so a source leaving
+    the window is removed by subtraction, O(2^n), without fusing the
+    rest of the window again.
+    """
+
+    def __init__(
+        self, singletons, rule="dcr", size=None, duration=None, dtype="float64"
+    ):
+        """
+        Constructor
+
+        rule: "conjunctive", "dcr" or "disjunctive"
+        size: most sources in the window (the oldest expires first)
+        duration: time a source stays in the window, on the clock of
+        the timestamps given to add (default: time.monotonic())
+        """
+        if size is not None and size < 1:
+            raise ValueError("size must be at least 1")
+        self._size = size
+        self._duration = duration
+        super().__init__(singletons, rule, log=True, dtype=dtype)
+
+    def clear(self):
+        """
+        Resets to the neutral element and empties the window
+        """
+        super().clear()
+        self._log_sum = np.zeros_like(self._state)
+        self._zeros = np.zeros(len(self._state), dtype=np.int64)
+        self._window = deque()
+
+    @property
+    def window(self):
+        """
+        Get the sources in the window, oldest first
+        """
+        return [boe for _, boe, _ in self._window]
+
+    def _apply(self, vectors, sign):
+        """
+        Adds (sign=1) or removes (sign=-1) log-commonalities
+        """
+        zero = np.isneginf(vectors)
+        self._log_sum += sign * np.where(zero, 0, vectors).sum(axis=0)
+        self._zeros += sign * zero.sum(axis=0)
+        self._state = np.where(self._zeros > 0, -np.inf, self._log_sum)
+        self._count += sign * len(vectors)
+        self._mass = None
+
+    def add_many(self, list_boes, timestamp=None):
+        """
+        Fuses several sources received at the same time, then expires
+        the sources that fell out of the window
+        """
+        if not list_boes:
+            return
+        if timestamp is None:
+            timestamp = time.monotonic()
+        vectors = self._transform(list_boes)
+        self._apply(vectors, 1)
+        self._window.extend(zip([timestamp] * len(list_boes), list_boes, vectors))
+
+        if self._size is not None:
+            while len(self._window) > self._size:
+                self.expire()
+        if self._duration is not None:
+            self.expire_before(timestamp - self._duration)
+
+    def add(self, boe, timestamp=None):
+        """
+        Fuses one more source, O(2^n) plus one transform
+        """
+        self.add_many([boe], timestamp)
+
+    def expire(self, boe=None):
+        """
+        Removes a source from the fusion, O(2^n), and returns it
+
+        boe: source to remove (default: the oldest in the window)
+        """
+        if not self._window:
+            raise ValueError("The window is empty")
+        if boe is None:
+            entry = self._window.popleft()
+        else:
+            for entry in self._window:
+                if entry[1] is boe:
+                    break
+            else:
+                raise ValueError("BOE is not in the window")
+            self._window.remove(entry)
+        self._apply(entry[2][np.newaxis], -1)
+        return entry[1]
+
+    def expire_before(self, timestamp):
+        """
+        Removes the sources added before a timestamp and returns how
+        many were removed
+        """
+        count = 0
+        while self._window and self._window[0][0] < timestamp:
+            self.expire()
+            count += 1
+        return count
+
+    def rebuild(self):
+        """
+        Recomputes the state from the sources in the window, dropping
+        the round-off accumulated by repeated add/expire
+        """
+        window = self._window
+        self.clear()
+        if window:
+            self._apply(np.array([vector for _, _, vector in window]), 1)
+        self._window = window
+
+
+class DecayFusion:
+    """
+    Running fusion where older evidence fades towards ignorance
+
+    Before a new source is combined, the running BOE is discounted
+    (BOE.discount), so the weight of a source decays geometrically with
+    the number of sources (or the time) since it arrived. Works with
+    every rule of BOE.combine, including those that cannot remove
+    evidence exactly (yager, dubois_prade, pcr5).
+    """
+
+    def __init__(self, singletons, rule="pcr5", decay=0.1, half_life=None):
+        """
+        Constructor
+
+        decay: fraction of belief lost by the running BOE per new source
+        half_life: when given, time after which evidence keeps half of
+        its weight, on the clock of the timestamps given to add
+        (default: time.monotonic()); decay is then not used
+        """
+        if rule not in combination.RULES:
+            raise ValueError(f"Unknown combination rule: {rule}")
+        if not 0 <= decay <= 1:
+            raise ValueError("decay must be between 0 and 1")
+        self._frame = Frame(singletons)
+        self._rule = rule
+        self._decay = decay
+        self._half_life = half_life
+        self.clear()
+
+    def clear(self):
+        """
+        Forgets every source
+        """
+        self._boe = None
+        self._timestamp = None
+        self._count = 0
+
+    @property
+    def frame(self):
+        """
+        Get the frame
+        """
+        return self._frame
+
+    @property
+    def rule(self):
+        """
+        Get the combination rule
+        """
+        return self._rule
+
+    @property
+    def count(self):
+        """
+        Get the number of sources fused so far
+        """
+        return self._count
+
+    def _reliability(self, timestamp):
+        """
+        Returns the weight kept by the running BOE at a timestamp
+        """
+        if self._half_life is None:
+            return 1 - self._decay
+        elapsed = max(timestamp - self._timestamp, 0)
+        return 0.5 ** (elapsed / self._half_life)
+
+    def add(self, boe, timestamp=None):
+        """
+        Discounts the running BOE and combines one more source
+        """
+        if self._frame != boe.frame:
+            raise ValueError("Cannot handle non-identical BOEs")
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if self._count == 0:
+            self._boe = boe
+        elif self._boe is not None:
+            discounted = self._boe.discount(self._reliability(timestamp))
+            self._boe = discounted.combine(boe, self._rule)
+        self._timestamp = timestamp
+        self._count += 1
+
+    def to_boe(self, timestamp=None):
+        """
+        Returns the running BOE, or None before any source or after a
+        total conflict ("dcr")
+
+        timestamp: with half_life, also discount the time elapsed since
+        the last source
+        """
+        if self._boe is None or timestamp is None or self._half_life is None:
+            return self._boe
+        return self._boe.discount(self._reliability(timestamp))
+
+    def uncertainty(self, proposition, timestamp=None):
+        """
+        Returns the uncertainty interval [belief, plausibility]
+        of the running BOE
+        """
+        return self.to_boe(timestamp).uncertainty(proposition)
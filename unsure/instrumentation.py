@@ -0,0 +1,270 @@
+"""
+Opt-in instrumentation
+
+BOE.combine, BOE.combine_multisource, BOE.pcr6_multisource and
+BOE.update report to a pluggable sink:
+
+- "<operation>.calls": call counter
+- "<operation>.seconds": latency
+- "<operation>.focal_before" / "<operation>.focal_after": number of
+  focal elements of the operands and of the result
+- "combine.conflict": conflict (mass of the empty set under the
+  conjunctive rule) of every combined pair
+
+Metrics are tagged with the combination rule when there is one.
+
+The default NullSink disables instrumentation: instrumented methods
+then only check one flag before running. To collect metrics:
+
+    with instrumentation.recording() as sink:
+        boe1.combine(boe2, "pcr5")
+    sink.counter("combine.calls", rule="pcr5")
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+import functools
+import inspect
+from threading import Lock
+import time
+
+import numpy as np
+
+# Most (key1, key2) pairs tested at once by the sparse conflict
+_CONFLICT_CHUNK = 2**16
+
+
+class NullSink:
+    """
+    A sink that drops everything (instrumentation disabled)
+    """
+
+    def increment(self, name, tags, value=1):
+        """
+        Adds value to a counter
+        """
+
+    def timing(self, name, tags, seconds):
+        """
+        Records a latency
+        """
+
+    def observe(self, name, tags, value):
+        """
+        Records a sample of a distribution
+        """
+
+
+class InMemorySink(NullSink):
+    """
+    A sink keeping every metric in memory (for tests and debugging)
+    """
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self._lock = Lock()
+        self.clear()
+
+    def clear(self):
+        """
+        Drops every metric
+        """
+        self._counters = defaultdict(int)
+        self._samples = defaultdict(list)
+
+    @staticmethod
+    def _key(name, tags):
+        return name, tuple(sorted(tags.items()))
+
+    def increment(self, name, tags, value=1):
+        with self._lock:
+            self._counters[self._key(name, tags)] += value
+
+    def timing(self, name, tags, seconds):
+        self.observe(name, tags, seconds)
+
+    def observe(self, name, tags, value):
+        with self._lock:
+            self._samples[self._key(name, tags)].append(value)
+
+    @staticmethod
+    def _matches(key, name, tags):
+        return key[0] == name and set(tags.items()) <= set(key[1])
+
+    def counter(self, name, **tags):
+        """
+        Returns a counter, summed over the tags not given
+        """
+        with self._lock:
+            return sum(
+                value
+                for key, value in self._counters.items()
+                if self._matches(key, name, tags)
+            )
+
+    def values(self, name, **tags):
+        """
+        Returns the recorded samples (or latencies) of a metric,
+        over the tags not given
+        """
+        with self._lock:
+            return [
+                value
+                for key, samples in self._samples.items()
+                if self._matches(key, name, tags)
+                for value in samples
+            ]
+
+    def histogram(self, name, bins=10, value_range=None, **tags):
+        """
+        Returns (counts, bin edges) of the samples of a metric,
+        e.g. histogram("combine.conflict", value_range=(0, 1))
+        """
+        return np.histogram(self.values(name, **tags), bins=bins, range=value_range)
+
+    def names(self):
+        """
+        Returns the names of the recorded metrics
+        """
+        with self._lock:
+            return sorted({key[0] for key in [*self._counters, *self._samples]})
+
+
+_SINK = NullSink()
+_ENABLED = False
+
+
+def get_sink():
+    """
+    Returns the current sink
+    """
+    return _SINK
+
+
+def set_sink(sink):
+    """
+    Installs a sink (None or a NullSink disables instrumentation)
+    and returns the previous one
+    """
+    global _SINK, _ENABLED  # pylint: disable=global-statement
+    previous = _SINK
+    _SINK = NullSink() if sink is None else sink
+    _ENABLED = type(_SINK) is not NullSink  # pylint: disable=unidiomatic-typecheck
+    return previous
+
+
+def is_enabled():
+    """
+    True if metrics are being recorded
+    """
+    return _ENABLED
+
+
+@contextmanager
+def recording(sink=None):
+    """
+    Installs a sink (a new InMemorySink by default) for the duration
+    of a with block and yields it
+    """
+    sink = InMemorySink() if sink is None else sink
+    previous = set_sink(sink)
+    try:
+        yield sink
+    finally:
+        set_sink(previous)
+
+
+def _focal_count(boe):
+    """
+    Returns the number of focal elements of a BOE
+    """
+    return sum(1 for mass in boe.get_normalized_dsvector().values() if mass)
+
+
+def _focal_arrays(boe):
+    """
+    Returns the DSVector keys and NORMALIZED masses of a BOE as arrays
+    """
+    dsvector = boe.get_normalized_dsvector()
+    count = len(dsvector)
+    keys = np.fromiter(dsvector.keys(), dtype=np.int64, count=count)
+    masses = np.fromiter(dsvector.values(), dtype=np.float64, count=count)
+    return keys, masses
+
+
+def _conflict(boe1, boe2):
+    """
+    Returns the mass of the empty set when combining two BOEs
+    conjunctively
+
+    K = sum over A of m1(A) * b2(complement of A): O(n 2^n) when a BOE
+    is dense, or chunks of the pairs of focal elements otherwise.
+    """
+    # a CompactBOE operand is always sparse
+    if getattr(boe1, "is_dense", False) or getattr(boe2, "is_dense", False):
+        # the complement of key A is key 2^n - 1 - A
+        implicability = boe2.get_vector("implicability")[::-1]
+        return float(boe1.get_vector() @ implicability)
+    keys1, masses1 = _focal_arrays(boe1)
+    keys2, masses2 = _focal_arrays(boe2)
+    step = max(1, _CONFLICT_CHUNK // max(len(keys2), 1))
+    conflict = 0.0
+    for start in range(0, len(keys1), step):
+        disjoint = (keys1[start : start + step, np.newaxis] & keys2) == 0
+        conflict += masses1[start : start + step] @ disjoint @ masses2
+    return float(conflict)
+
+
+def _record(operation, method, signature, args, kwargs):
+    """
+    Calls an instrumented method and reports its metrics
+    """
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    arguments = bound.arguments
+    tags = {"rule": arguments["rule"]} if "rule" in arguments else {}
+    boe = args[0]
+    operands = [boe]
+    if "another_boe" in arguments:
+        operands.append(arguments["another_boe"])
+    if "list_boes" in arguments:
+        operands.extend(arguments["list_boes"])
+    if "new_frame" in arguments:
+        operands.append(arguments["new_frame"])
+
+    sink = _SINK
+    for operand in operands:
+        sink.observe(f"{operation}.focal_before", tags, _focal_count(operand))
+    start = time.perf_counter()
+    result = method(*args, **kwargs)
+    sink.timing(f"{operation}.seconds", tags, time.perf_counter() - start)
+    sink.increment(f"{operation}.calls", tags)
+
+    fused = boe if result is None and operation == "update" else result
+    if fused is not None:
+        sink.observe(f"{operation}.focal_after", tags, _focal_count(fused))
+    if operation == "combine" and boe.frame == operands[1].frame:
+        sink.observe("combine.conflict", tags, _conflict(boe, operands[1]))
+    return result
+
+
+def instrumented(operation):
+    """
+    Decorator reporting the metrics of a BOE method under an operation
+    name when instrumentation is enabled
+    """
+
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return method(*args, **kwargs)
+            return _record(operation, method, signature, args, kwargs)
+
+        return wrapper
+
+    return decorator
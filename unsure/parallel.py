@@ -0,0 +1,71 @@
+"""
+Parallel multisource fusion
+
+For associative rules, fusing many BOEs can be split into chunks that
+are folded independently and then fused again, level by level, as a
+balanced tree over a concurrent.futures process pool.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import warnings
+
+# Rules for which the order of pairwise combination does not matter
+ASSOCIATIVE_RULES = ("conjunctive", "disjunctive", "dcr")
+
+
+def _fold(list_boes, rule, budget=None):
+    """
+    Folds a chunk of BOEs left to right (runs in a worker)
+    """
+    if any(boe is None for boe in list_boes):
+        return None
+    return list_boes[0].combine_multisource(list_boes[1:], rule, budget=budget)
+
+
+def parallel_multisource(
+    list_boes, rule="dcr", workers=None, chunk_size=2, executor=None, budget=None
+):  # pylint: disable=too-many-arguments
+    """
+    Returns a fused BOE by tree reduction over a process pool
+
+    rule: "conjunctive", "disjunctive" or "dcr". Other rules (yager,
+    dubois_prade, pcr5) are not associative: they are folded
+    sequentially with a warning.
+    workers: number of processes (default: one per CPU)
+    chunk_size: number of BOEs folded per task at each level (>= 2)
+    executor: an existing concurrent.futures executor to reuse
+    budget: most focal elements kept after each combination (see
+    unsure.approximation.summarize); the result then depends on the
+    shape of the tree
+
+    The result equals the sequential fold up to floating point
+    round-off. Returns None if the BOEs are in total conflict ("dcr").
+    """
+    list_boes = list(list_boes)
+    if rule not in ASSOCIATIVE_RULES:
+        warnings.warn(
+            f"Rule {rule} is not associative, fusing sequentially instead",
+            stacklevel=2,
+        )
+        return _fold(list_boes, rule, budget)
+    if chunk_size < 2:
+        raise ValueError("chunk_size must be at least 2")
+    if len(list_boes) <= chunk_size:
+        return _fold(list_boes, rule, budget)
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        level = list_boes
+        while len(level) > 1:
+            chunks = [
+                level[start : start + chunk_size]
+                for start in range(0, len(level), chunk_size)
+            ]
+            level = list(executor.map(_fold, chunks, repeat(rule), repeat(budget)))
+    finally:
+        if own_executor:
+            executor.shutdown()
+    return level[0]
@@ -0,0 +1,195 @@
+"""
+Bulk (de)serialization of BOEs
+
+Masses are written by DSVector key, so loading never parses
+propositions (unlike BOE.get_masses/set_masses):
+
+- JSON: {"frame": [...], "dtype": ..., "keys": [...], "masses": [...]}
+  with to_json/from_json for one BOE, dump_jsonl/load_jsonl for streams
+- bytes: one compact struct record per BOE (to_bytes/from_bytes,
+  iter_bytes over concatenated records, read_bytes from a file)
+- NumPy: many BOEs on one frame in a .npz of offsets, keys and masses
+  (save/load)
+
+Every format round-trips the UNNORMALIZED masses exactly.
+"""
+
+import json
+import struct
+
+import numpy as np
+
+from unsure.boe import BOE
+
+# magic, format version, dtype character, singletons length, number of keys
+_HEADER = struct.Struct("<4sBcHI")
+_MAGIC = b"UNSB"
+_VERSION = 1
+
+
+def to_json(boe):
+    """
+    Returns a JSON-serializable dict of a BOE
+    """
+    keys, masses = boe.to_arrays()
+    return {
+        "frame": list(boe.frame),
+        "dtype": boe.dtype.name,
+        "keys": keys.tolist(),
+        "masses": masses.tolist(),
+    }
+
+
+def from_json(data):
+    """
+    Returns a BOE from the output of to_json (dict or JSON string)
+    """
+    if isinstance(data, (str, bytes)):
+        data = json.loads(data)
+    return BOE.from_arrays(
+        data["frame"], data["keys"], data["masses"], dtype=data.get("dtype", "float64")
+    )
+
+
+def dump_jsonl(boes, fp):
+    """
+    Writes BOEs to a text file, one JSON object per line
+    """
+    for boe in boes:
+        fp.write(json.dumps(to_json(boe)))
+        fp.write("\n")
+
+
+def load_jsonl(fp):
+    """
+    Yields the BOEs of a file written by dump_jsonl
+    """
+    for line in fp:
+        if line.strip():
+            yield from_json(line)
+
+
+def to_bytes(boe):
+    """
+    Returns a compact binary record of a BOE
+    """
+    keys, masses = boe.to_arrays()
+    singletons = "\0".join(boe.frame).encode("utf-8")
+    header = _HEADER.pack(
+        _MAGIC, _VERSION, boe.dtype.char.encode(), len(singletons), len(keys)
+    )
+    return b"".join(
+        [
+            header,
+            singletons,
+            keys.astype("<i8").tobytes(),
+            masses.astype("<f8").tobytes(),
+        ]
+    )
+
+
+def _read_record(buffer, offset):
+    """
+    Returns the BOE of the record at offset and the offset of the next
+    """
+    magic, version, dtype, length, count = _HEADER.unpack_from(buffer, offset)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Not a BOE record")
+    offset += _HEADER.size
+    singletons = bytes(buffer[offset : offset + length]).decode("utf-8")
+    offset += length
+    keys = np.frombuffer(buffer, dtype="<i8", count=count, offset=offset)
+    offset += keys.nbytes
+    masses = np.frombuffer(buffer, dtype="<f8", count=count, offset=offset)
+    offset += masses.nbytes
+    frame = singletons.split("\0") if singletons else []
+    boe = BOE.from_arrays(frame, keys, masses, dtype=np.dtype(dtype.decode()))
+    return boe, offset
+
+
+def from_bytes(buffer):
+    """
+    Returns a BOE from the output of to_bytes
+    """
+    return _read_record(buffer, 0)[0]
+
+
+def iter_bytes(buffer):
+    """
+    Yields the BOEs of concatenated to_bytes records
+    """
+    offset = 0
+    while offset < len(buffer):
+        boe, offset = _read_record(buffer, offset)
+        yield boe
+
+
+def read_bytes(fp):
+    """
+    Reads one to_bytes record from a binary file and returns its BOE,
+    or None at the end of the file
+    """
+    record = read_record(fp)
+    if record is None:
+        return None
+    return from_bytes(record)
+
+
+def read_record(fp):
+    """
+    Reads one to_bytes record from a binary file, without decoding it,
+    or None at the end of the file
+    """
+    header = fp.read(_HEADER.size)
+    if not header:
+        return None
+    if len(header) < _HEADER.size:
+        raise ValueError("Truncated BOE record")
+    _, _, _, length, count = _HEADER.unpack(header)
+    size = length + 16 * count
+    body = fp.read(size)
+    if len(body) < size:
+        raise ValueError("Truncated BOE record")
+    return header + body
+
+
+def save(file, boes):
+    """
+    Writes BOEs sharing one frame to a .npz file
+
+    The keys and masses of all BOEs are concatenated; the keys of the
+    i-th BOE are keys[offsets[i]:offsets[i + 1]].
+    """
+    boes = list(boes)
+    if not boes:
+        raise ValueError("Nothing to save")
+    frame = boes[0].frame
+    if any(boe.frame != frame for boe in boes):
+        raise ValueError("Cannot handle non-identical BOEs")
+    arrays = [boe.to_arrays() for boe in boes]
+    offsets = np.zeros(len(boes) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(keys) for keys, _ in arrays])
+    np.savez(
+        file,
+        singletons=np.array(list(frame)),
+        dtype=np.array(boes[0].dtype.name),
+        offsets=offsets,
+        keys=np.concatenate([keys for keys, _ in arrays]),
+        masses=np.concatenate([masses.astype(np.float64) for _, masses in arrays]),
+    )
+
+
+def load(file):
+    """
+    Returns the list of BOEs of a file written by save
+    """
+    with np.load(file, allow_pickle=False) as data:
+        singletons = data["singletons"].tolist()
+        dtype = str(data["dtype"])
+        offsets = data["offsets"]
+        keys = data["keys"]
+        masses = data["masses"]
+    return [
+        BOE.from_arrays(singletons, keys[start:end], masses[start:end], dtype=dtype)
+        for start, end in zip(offsets[:-1], offsets[1:])
+    ]
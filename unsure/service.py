@@ -0,0 +1,247 @@
+"""
+Asynchronous evidence ingestion
+
+FusionService consumes evidence BOEs from asyncio producers and keeps
+one fused BOE per entity. Each entity has a bounded queue drained by
+its own worker task: the worker takes whatever evidence is waiting (up
+to max_batch), and fuses it in an executor so the event loop is never
+blocked. When fusion falls behind, full queues make producers wait
+(backpressure) instead of buffering without bound.
+"""
+
+import asyncio
+import copy
+
+from unsure import combination
+from unsure.boe import BOE
+from unsure.frame import Frame
+
+
+def _fuse(state, list_boes, rule, alpha):
+    """
+    Fuses a micro-batch of evidence into an entity's BOE (runs in the
+    executor) and returns the new BOE
+
+    state: current BOE of the entity, or None before any evidence. It is
+    never modified, since snapshot() may be copying it concurrently.
+    Evidence BOEs are never kept either: their producer may reuse them.
+    """
+    if alpha is not None:
+        state = copy.deepcopy(state)
+        for boe in list_boes:
+            state.update(boe, alpha)
+        return state
+    if state is None:
+        state, list_boes = copy.deepcopy(list_boes[0]), list_boes[1:]
+    if not list_boes:
+        return state
+    return state.combine_multisource(list_boes, rule)
+
+
+class FusionService:
+    """
+    Per-entity fusion of asynchronous evidence streams
+
+    Use as an async context manager:
+
+        async with FusionService(["a", "b"], rule="dcr") as service:
+            await service.submit("sensor-1", boe)
+            interval = await service.uncertainty("sensor-1", ["a"])
+    """
+
+    def __init__(
+        self,
+        singletons,
+        rule="dcr",
+        alpha=None,
+        max_queue=64,
+        max_batch=32,
+        executor=None,
+    ):
+        """
+        Constructor
+
+        rule: combination rule (see BOE.combine)
+        alpha: when given, evidence is folded with the CUE update
+        (BOE.update) into a BOE starting from ignorance, and rule is
+        not used
+        max_queue: bound of each entity's queue (backpressure)
+        max_batch: most evidence BOEs fused per executor call
+        executor: concurrent.futures executor (default: the loop's)
+        """
+        # pylint: disable=too-many-arguments
+        if alpha is None and rule not in combination.RULES:
+            raise ValueError(f"Unknown combination rule: {rule}")
+        if max_queue < 1 or max_batch < 1:
+            raise ValueError("max_queue and max_batch must be at least 1")
+        self._frame = Frame(singletons)
+        self._rule = rule
+        self._alpha = alpha
+        self._max_queue = max_queue
+        self._max_batch = max_batch
+        self._executor = executor
+        self._queues = {}
+        self._workers = {}
+        self._states = {}
+        self._errors = {}
+        self._closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    # -------------------------------------
+    # Properties
+
+    @property
+    def frame(self):
+        """
+        Get the frame
+        """
+        return self._frame
+
+    @property
+    def entities(self):
+        """
+        Get the entities that received evidence so far
+        """
+        return list(self._queues)
+
+    def pending(self, entity):
+        """
+        Returns the number of evidence BOEs waiting for an entity
+        """
+        queue = self._queues.get(entity)
+        return 0 if queue is None else queue.qsize()
+
+    # -------------------------------------
+    # Ingestion
+
+    def _get_queue(self, entity):
+        """
+        Returns the queue of an entity, starting its worker if needed
+        """
+        queue = self._queues.get(entity)
+        if queue is None:
+            queue = asyncio.Queue(maxsize=self._max_queue)
+            self._queues[entity] = queue
+            if self._alpha is not None:
+                state = BOE(self._frame)
+                state.set_mass_theta(1.0)
+                self._states[entity] = state
+            self._workers[entity] = asyncio.create_task(self._work(entity, queue))
+        return queue
+
+    async def submit(self, entity, boe):
+        """
+        Queues an evidence BOE for an entity, waiting while its queue
+        is full
+        """
+        if self._frame != boe.frame:
+            raise ValueError("Cannot handle non-identical BOEs")
+        if self._closed:
+            raise RuntimeError("FusionService is closed")
+        await self._get_queue(entity).put(boe)
+
+    async def consume(self, source):
+        """
+        Submits every (entity, BOE) pair of a source until it is
+        exhausted
+
+        source: async iterable, or asyncio.Queue ended by None
+        """
+        if isinstance(source, asyncio.Queue):
+            while True:
+                item = await source.get()
+                if item is None:
+                    return
+                await self.submit(*item)
+        else:
+            async for entity, boe in source:
+                await self.submit(entity, boe)
+
+    async def _work(self, entity, queue):
+        """
+        Worker of an entity: drains its queue in micro-batches
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self._max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            state = self._states.get(entity)
+            # a failure or a total conflict ("dcr") is final
+            done = entity in self._errors or (state is None and entity in self._states)
+            try:
+                if not done:
+                    self._states[entity] = await loop.run_in_executor(
+                        self._executor,
+                        _fuse,
+                        state,
+                        batch,
+                        self._rule,
+                        self._alpha,
+                    )
+            except Exception as error:  # pylint: disable=broad-except
+                # reported by the next snapshot of the entity
+                self._errors[entity] = error
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    # -------------------------------------
+    # Snapshots
+
+    async def flush(self, entity=None):
+        """
+        Waits until the queued evidence (of one entity, or of all of
+        them) is fused
+        """
+        entities = list(self._queues) if entity is None else [entity]
+        for name in entities:
+            queue = self._queues.get(name)
+            if queue is not None:
+                await queue.join()
+
+    async def snapshot(self, entity, flush=True):
+        """
+        Returns a copy of the fused BOE of an entity
+
+        Returns None if the entity has no evidence or, for "dcr", if
+        its evidence is in total conflict.
+
+        flush: first wait for the evidence already queued
+        """
+        if flush:
+            await self.flush(entity)
+        if entity in self._errors:
+            raise self._errors[entity]
+        state = self._states.get(entity)
+        if state is None:
+            return None
+        return copy.deepcopy(state)
+
+    async def uncertainty(self, entity, proposition, flush=True):
+        """
+        Returns the uncertainty interval [belief, plausibility] of a
+        proposition for an entity (None if there is no fused BOE)
+        """
+        boe = await self.snapshot(entity, flush)
+        if boe is None:
+            return None
+        return boe.uncertainty(proposition)
+
+    async def close(self):
+        """
+        Fuses the queued evidence and stops the workers
+
+        Snapshots remain available after closing.
+        """
+        self._closed = True
+        await self.flush()
+        for worker in self._workers.values():
+            worker.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers.clear()
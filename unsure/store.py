@@ -0,0 +1,326 @@
+"""
+Memory-mapped BOE store
+
+A BOEStore keeps one BOE per entity id in a directory of .npy files
+opened with memory mapping, so opening a store does not read the
+masses, loading a BOE only touches its row, and the store can be larger
+than RAM.
+
+Layouts:
+
+- "dense": masses of shape (capacity, 2^n). get() returns a BOE backed
+  by the mapped row itself (zero-copy): writes to it go to the file,
+  and it sees later put() and update() of its entity (its totals and
+  queries are recomputed on every read instead of being cached).
+- "sparse": at most max_focal focal elements per BOE, as keys and
+  masses of shape (capacity, max_focal) plus a count per row.
+
+Files: meta.json (frame, layout, dtype), ids.txt (one entity id per
+line, in row order) and the .npy arrays.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from unsure import cue, transforms
+from unsure.batch import BOEBatch
+from unsure.boe import BOE
+from unsure.frame import Frame
+
+_META = "meta.json"
+_IDS = "ids.txt"
+_VERSION = 1
+
+
+class BOEStore:
+    """
+    Persistent BOEs keyed by entity id, in memory-mapped files
+    """
+
+    def __init__(self, path, mode="r+"):
+        """
+        Opens an existing store (see BOEStore.create)
+
+        mode: "r" (read-only) or "r+" (read and write)
+        """
+        if mode not in ("r", "r+"):
+            raise ValueError(f"Unknown mode: {mode}")
+        self._path = Path(path)
+        self._mode = mode
+        meta = json.loads((self._path / _META).read_text(encoding="utf-8"))
+        if meta["version"] != _VERSION:
+            raise ValueError(f"Unknown store version: {meta['version']}")
+        self._frame = Frame(meta["frame"])
+        self._layout = meta["layout"]
+        self._dtype = np.dtype(meta["dtype"])
+        self._max_focal = meta["max_focal"]
+        self._ids = (self._path / _IDS).read_text(encoding="utf-8").splitlines()
+        self._rows = {entity: row for row, entity in enumerate(self._ids)}
+        self._arrays = {}
+        self._open_arrays()
+
+    @classmethod
+    def create(
+        cls,
+        path,
+        singletons,
+        layout="dense",
+        max_focal=None,
+        capacity=1024,
+        dtype="float64",
+    ):
+        """
+        Creates an empty store in a new (or empty) directory and opens it
+
+        layout: "dense" or "sparse"
+        max_focal: most focal elements per BOE, required by "sparse"
+        capacity: initial number of rows (the files grow when full)
+        """
+        # pylint: disable=too-many-arguments
+        if layout not in ("dense", "sparse"):
+            raise ValueError(f"Unknown layout: {layout}")
+        if layout == "sparse" and not max_focal:
+            raise ValueError("The sparse layout needs max_focal")
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        if (path / _META).exists():
+            raise FileExistsError(f"A store already exists in {path}")
+
+        frame = Frame(singletons)
+        meta = {
+            "version": _VERSION,
+            "frame": list(frame),
+            "layout": layout,
+            "dtype": np.dtype(dtype).name,
+            "max_focal": max_focal if layout == "sparse" else None,
+        }
+        for name, (shape, array_dtype) in cls._shapes(
+            len(frame), meta["max_focal"], meta["dtype"], max(capacity, 1)
+        ).items():
+            array = np.lib.format.open_memmap(
+                path / f"{name}.npy", mode="w+", dtype=array_dtype, shape=shape
+            )
+            array.flush()
+            del array
+        (path / _IDS).write_text("", encoding="utf-8")
+        (path / _META).write_text(json.dumps(meta), encoding="utf-8")
+        return cls(path)
+
+    @staticmethod
+    def _shapes(size, max_focal, dtype, capacity):
+        """
+        Returns the shape and dtype of every array of a layout
+        """
+        if max_focal is None:
+            return {"masses": ((capacity, 2**size), dtype)}
+        return {
+            "keys": ((capacity, max_focal), np.int64),
+            "masses": ((capacity, max_focal), dtype),
+            "counts": ((capacity,), np.int64),
+        }
+
+    def _open_arrays(self):
+        """
+        Maps the .npy arrays of the store
+        """
+        names = self._shapes(len(self._frame), self._max_focal, self._dtype, 0)
+        self._arrays = {
+            name: np.load(self._path / f"{name}.npy", mmap_mode=self._mode)
+            for name in names
+        }
+
+    def _grow(self, capacity):
+        """
+        Rewrites the arrays with more rows
+
+        BOEs returned by get() before growing no longer write to the store.
+        """
+        shapes = self._shapes(len(self._frame), self._max_focal, self._dtype, capacity)
+        for name, (shape, dtype) in shapes.items():
+            old = self._arrays.pop(name)
+            temporary = self._path / f"{name}.npy.tmp"
+            new = np.lib.format.open_memmap(
+                temporary, mode="w+", dtype=dtype, shape=shape
+            )
+            new[: len(old)] = old
+            new.flush()
+            del new, old
+            os.replace(temporary, self._path / f"{name}.npy")
+        self._open_arrays()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # -------------------------------------
+    # Properties
+
+    @property
+    def frame(self):
+        """
+        Get the frame
+        """
+        return self._frame
+
+    @property
+    def layout(self):
+        """
+        Get the layout ("dense" or "sparse")
+        """
+        return self._layout
+
+    @property
+    def capacity(self):
+        """
+        Get the number of rows allocated on disk
+        """
+        return len(self._arrays["masses"])
+
+    @property
+    def ids(self):
+        """
+        Get the entity ids, in row order
+        """
+        return list(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, entity):
+        return str(entity) in self._rows
+
+    def __iter__(self):
+        return iter(list(self._ids))
+
+    # -------------------------------------
+    # Access
+
+    def _row(self, entity):
+        """
+        Returns the row of an entity (KeyError if unknown)
+        """
+        return self._rows[str(entity)]
+
+    def _append(self, entity):
+        """
+        Adds a row for a new entity and returns it
+        """
+        if not entity or "\n" in entity or "\r" in entity:
+            raise ValueError("Entity ids must be non-empty single lines")
+        if len(self._ids) == self.capacity:
+            self._grow(2 * self.capacity)
+        with open(self._path / _IDS, "a", encoding="utf-8") as ids:
+            ids.write(entity + "\n")
+        self._rows[entity] = len(self._ids)
+        self._ids.append(entity)
+        return self._rows[entity]
+
+    def get(self, entity):
+        """
+        Returns the BOE of an entity, reading only its row
+
+        With the dense layout, the BOE is a view of the mapped row:
+        setting masses on it updates the store in place.
+        """
+        row = self._row(entity)
+        masses = self._arrays["masses"]
+        if self._layout == "dense":
+            return BOE.from_vector(
+                self._frame, masses[row], dtype=self._dtype, storage="dense", copy=False
+            )
+        count = self._arrays["counts"][row]
+        return BOE.from_arrays(
+            self._frame,
+            self._arrays["keys"][row, :count],
+            masses[row, :count],
+            dtype=self._dtype,
+        )
+
+    __getitem__ = get
+
+    def put(self, entity, boe):
+        """
+        Writes the BOE of an entity in place (adding the entity if new)
+        """
+        if self._frame != boe.frame:
+            raise ValueError("Cannot handle non-identical BOEs")
+        entity = str(entity)
+        keys, values = boe.to_arrays()
+        if self._layout == "sparse" and len(keys) > self._max_focal:
+            raise ValueError(
+                f"BOE has {len(keys)} focal elements, the store holds at most "
+                f"{self._max_focal} (see unsure.approximation)"
+            )
+        row = self._rows.get(entity)
+        if row is None:
+            row = self._append(entity)
+
+        masses = self._arrays["masses"]
+        masses[row] = 0
+        if self._layout == "dense":
+            masses[row, keys] = values
+        else:
+            masses[row, : len(keys)] = values
+            self._arrays["keys"][row] = 0
+            self._arrays["keys"][row, : len(keys)] = keys
+            self._arrays["counts"][row] = len(keys)
+
+    __setitem__ = put
+
+    def update(self, entity, evidence, alpha):
+        """
+        CUE update (see BOE.update) of the BOE of an entity, in place
+        """
+        if self._layout == "sparse":
+            boe = self.get(entity)
+            boe.update(evidence, alpha)
+            self.put(entity, boe)
+            return
+        if self._frame != evidence.frame:
+            raise ValueError("Cannot handle non-identical BOEs")
+        row = self._row(entity)
+        vector = transforms.to_dense(evidence.dsvector, len(self._frame), self._dtype)
+        cue.cue_update(
+            self._arrays["masses"][row : row + 1],
+            vector,
+            alpha,
+            list(evidence.dsvector),
+        )
+
+    def scan(self, batch_size=4096):
+        """
+        Yields (entity ids, BOEBatch) over the whole store, batch_size
+        rows at a time
+        """
+        for start in range(0, len(self._ids), batch_size):
+            end = min(start + batch_size, len(self._ids))
+            if self._layout == "dense":
+                masses = self._arrays["masses"][start:end]
+            else:
+                masses = np.zeros((end - start, 2 ** len(self._frame)), self._dtype)
+                counts = self._arrays["counts"][start:end]
+                filled = np.arange(self._max_focal) < counts[:, np.newaxis]
+                rows = np.nonzero(filled)[0]
+                keys = self._arrays["keys"][start:end][filled]
+                masses[rows, keys] = self._arrays["masses"][start:end][filled]
+            yield self._ids[start:end], BOEBatch(self._frame, masses)
+
+    def flush(self):
+        """
+        Writes pending changes to disk
+        """
+        if self._mode == "r+":
+            for array in self._arrays.values():
+                array.flush()
+
+    def close(self):
+        """
+        Flushes and unmaps the arrays
+        """
+        self.flush()
+        self._arrays = {}
@@ -0,0 +1,180 @@
+"""
+Fast zeta / Mobius transforms over the power set
+
+A dense vector has length 2^n and is indexed by DSVector keys, so
+entry A holds the value for the proposition whose bitmask is A.
+Every transform runs in O(n * 2^n) and works along the last axis,
+so a stack of vectors (shape (..., 2^n)) is transformed at once.
+
+implicability: b(A) = sum of m(B) for B subset of A (includes m(empty))
+belief:        Bel(A) = b(A) - m(empty)
+plausibility:  Pl(A) = sum of m(B) for B & A != 0
+commonality:   q(A) = sum of m(B) for B superset of A
+
+belief_to_mass and plausibility_to_mass assume m(empty) = 0, since
+neither function carries that mass.
+"""
+
+import numpy as np
+
+# Round-off left by a transform and its inverse is below this
+TOLERANCE = 1e-12
+
+
+def to_dense(dsvector, size, dtype=np.float64):
+    """
+    Returns a dense vector of length 2^size from a DSVector
+    """
+    vector = np.zeros(2**size, dtype=dtype)
+    for key, mass in dsvector.items():
+        vector[key] = mass
+    return vector
+
+
+def to_dsvector(vector, tolerance=0.0):
+    """
+    Returns a DSVector (dict of key: mass) holding the
+    entries of a dense vector larger than tolerance in magnitude
+    """
+    keys = np.flatnonzero(np.abs(vector) > tolerance)
+    return {int(key): float(vector[key]) for key in keys}
+
+
+def _size(vector):
+    """
+    Returns n for a vector of length 2^n
+    """
+    length = vector.shape[-1]
+    size = length.bit_length() - 1
+    if length != 2**size:
+        raise ValueError("Vector length must be a power of 2")
+    return size
+
+
+def _float_copy(vector):
+    """
+    Returns a floating point copy of vector (float32 stays float32)
+    """
+    vector = np.asarray(vector)
+    return np.array(vector, dtype=np.result_type(vector, np.float32), copy=True)
+
+
+def _subset_sum(vector, inverse=False):
+    """
+    Sums (or, if inverse, Mobius-inverts) over subsets along the last axis
+    """
+    result = _float_copy(vector)
+    for i in range(_size(result)):
+        view = result.reshape(result.shape[:-1] + (-1, 2, 2**i))
+        if inverse:
+            view[..., 1, :] -= view[..., 0, :]
+        else:
+            view[..., 1, :] += view[..., 0, :]
+    return result
+
+
+def _superset_sum(vector, inverse=False):
+    """
+    Sums (or, if inverse, Mobius-inverts) over supersets along the last axis
+    """
+    result = _float_copy(vector)
+    for i in range(_size(result)):
+        view = result.reshape(result.shape[:-1] + (-1, 2, 2**i))
+        if inverse:
+            view[..., 0, :] -= view[..., 1, :]
+        else:
+            view[..., 0, :] += view[..., 1, :]
+    return result
+
+
+def mass_to_implicability(mass):
+    """
+    b(A) = sum of m(B) for B subset of A
+    """
+    return _subset_sum(mass)
+
+
+def implicability_to_mass(implicability):
+    """
+    Inverse of mass_to_implicability
+    """
+    return _subset_sum(implicability, inverse=True)
+
+
+def mass_to_belief(mass):
+    """
+    Bel(A) = sum of m(B) for non-empty B subset of A
+    """
+    implicability = _subset_sum(mass)
+    return implicability - implicability[..., :1]
+
+
+def belief_to_mass(belief):
+    """
+    Inverse of mass_to_belief (m(empty) is taken as 0)
+    """
+    return _subset_sum(belief, inverse=True)
+
+
+def mass_to_plausibility(mass):
+    """
+    Pl(A) = sum of m(B) for B intersecting A
+    """
+    implicability = _subset_sum(mass)
+    # the complement of key A is at the mirrored position
+    return implicability[..., -1:] - implicability[..., ::-1]
+
+
+def plausibility_to_mass(plausibility):
+    """
+    Inverse of mass_to_plausibility (m(empty) is taken as 0)
+    """
+    plausibility = np.asarray(plausibility)
+    implicability = plausibility[..., -1:] - plausibility[..., ::-1]
+    return _subset_sum(implicability, inverse=True)
+
+
+def mass_to_commonality(mass):
+    """
+    q(A) = sum of m(B) for B superset of A
+    """
+    return _superset_sum(mass)
+
+
+def commonality_to_mass(commonality):
+    """
+    Inverse of mass_to_commonality
+    """
+    return _superset_sum(commonality, inverse=True)
+
+
+FROM_MASS = {
+    "mass": lambda mass: np.array(mass, copy=True),
+    "belief": mass_to_belief,
+    "plausibility": mass_to_plausibility,
+    "commonality": mass_to_commonality,
+    "implicability": mass_to_implicability,
+}
+
+TO_MASS = {
+    "mass": lambda mass: np.array(mass, copy=True),
+    "belief": belief_to_mass,
+    "plausibility": plausibility_to_mass,
+    "commonality": commonality_to_mass,
+    "implicability": implicability_to_mass,
+}
+
+
+def convert(vector, source="mass", target="belief"):
+    """
+    Converts a dense vector between mass, belief, plausibility,
+    commonality and implicability
+    """
+    try:
+        to_mass = TO_MASS[source]
+        from_mass = FROM_MASS[target]
+    except KeyError as error:
+        raise ValueError(f"Unknown representation: {error.args[0]}") from error
+    if source == target:
+        return np.array(vector, copy=True)
+    return from_mass(to_mass(vector))